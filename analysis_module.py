@@ -1,6 +1,30 @@
 import numpy as np
 import logging
 from scipy.optimize import curve_fit
+try:
+    from numba import njit # Optional: compiles the fused per-step reduction below
+except ImportError:
+    njit = None
+
+def _sum_and_max_numpy(data, sum_lo, sum_hi, max_lo, max_hi):
+    """Sum of data[sum_lo:sum_hi] and max of data[max_lo:max_hi], as two NumPy reductions."""
+    return float(np.sum(data[sum_lo:sum_hi])), float(np.max(data[max_lo:max_hi]))
+
+if njit is not None:
+    @njit(cache=True)
+    def _sum_and_max(data, sum_lo, sum_hi, max_lo, max_hi):
+        """Same result as _sum_and_max_numpy, reading each element once."""
+        s = 0.0
+        m = -np.inf
+        for i in range(min(sum_lo, max_lo), max(sum_hi, max_hi)):
+            v = data[i]
+            if sum_lo <= i < sum_hi:
+                s += v
+            if max_lo <= i < max_hi and v > m:
+                m = v
+        return s, m
+else:
+    _sum_and_max = _sum_and_max_numpy
 
 # Basic logging setup
 # logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -71,6 +95,26 @@ class AnalysisModule:
 
         return float(intensity)
 
+    def calculate_intensity_and_max(self, spectrum_data: np.ndarray, max_slice: slice) -> tuple[float, float | None]:
+        """
+        Returns (calculate_intensity(spectrum_data), max of spectrum_data[max_slice]) from a single
+        pass over a 1D spectrum. The max is None if max_slice selects nothing.
+        """
+        max_lo, max_hi, _ = max_slice.indices(spectrum_data.shape[-1])
+        if max_lo >= max_hi:
+            return self.calculate_intensity(spectrum_data), None
+        if spectrum_data.ndim != 1:
+            return self.calculate_intensity(spectrum_data), float(np.max(spectrum_data[..., max_lo:max_hi]))
+        sum_lo, sum_hi = 0, spectrum_data.size
+        if self.roi:
+            sum_lo, sum_hi = self.roi[0], min(self.roi[1], spectrum_data.size)
+            if sum_lo >= sum_hi:
+                logging.error("Invalid ROI after clamping.")
+                return 0.0, float(np.max(spectrum_data[max_lo:max_hi]))
+        intensity, max_in_range = _sum_and_max(spectrum_data, sum_lo, sum_hi, max_lo, max_hi)
+        logging.debug("Calculated intensity %s and max %s in one pass", intensity, max_in_range)
+        return float(intensity), float(max_in_range)
+
     def fit_polarization_data(self, angles_deg: np.ndarray, intensities: np.ndarray, fit_type: str = 'cos2') -> tuple[np.ndarray, dict] | tuple[None, None]:
         """
         Fits the intensity vs. angle data to a model function.
@@ -1,7 +1,69 @@
 import numpy as np
 import os
 import logging
+import re
 from datetime import datetime
+try:
+    import pandas as pd # Optional: its C CSV parser is much faster than np.loadtxt
+except ImportError:
+    pd = None
+
+def load_spectrum_csv(filename: str, dtype=np.float32) -> np.ndarray:
+    """
+    Reads a tab-separated numeric file (e.g. LightField's wavelength/intensity CSV export)
+    into a 2D array, using pandas' C parser when it is installed.
+    float32 by default: ample for 16-bit counts and nm wavelengths, at half the memory traffic.
+    """
+    if pd is not None:
+        return pd.read_csv(filename, sep='\t', header=None, comment='#', dtype=dtype, engine='c', memory_map=True).to_numpy()
+    with open(filename, 'rb') as f:
+        raw = f.read()
+    # Fast path for plain numeric files: one bulk token conversion instead of loadtxt's per-line parsing
+    first_line = raw.split(b'\n', 1)[0]
+    ncols = len(first_line.split())
+    if ncols and b'#' not in raw:
+        try:
+            values = np.array(raw.split(), dtype=dtype)
+            if values.size % ncols == 0:
+                return values.reshape(-1, ncols)
+        except ValueError:
+            pass # Header or other text: let loadtxt parse (and report) it
+    return np.loadtxt(filename, delimiter='\t', dtype=dtype)
+
+# SPE 3.0 (LightField native format): 4100-byte binary header, raw frames, then an XML footer
+_SPE_HEADER_BYTES = 4100
+_SPE_DTYPES = {0: np.float32, 1: np.int32, 2: np.int16, 3: np.uint16, 5: np.float64, 6: np.uint8, 8: np.uint32}
+_SPE_WAVELENGTH_RE = re.compile(rb'<Wavelength[^>]*>([^<]*)</Wavelength>')
+
+def load_spe_frame(filename: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Opens the first frame of a 1D SPE 3.0 file without reading it: returns (wavelengths, intensities),
+    where intensities is a read-only np.memmap, so only the pages a caller indexes are read from disk.
+    Raises ValueError for 2D frames, unknown data types or a missing/mismatched wavelength calibration.
+    """
+    with open(filename, 'rb') as f:
+        header = f.read(_SPE_HEADER_BYTES)
+        if len(header) < _SPE_HEADER_BYTES:
+            raise ValueError(f"{filename} is too short for an SPE header")
+        xdim = int(np.frombuffer(header, np.uint16, 1, 42)[0])
+        ydim = int(np.frombuffer(header, np.uint16, 1, 656)[0])
+        datatype = int(np.frombuffer(header, np.int16, 1, 108)[0])
+        xml_offset = int(np.frombuffer(header, np.uint64, 1, 678)[0])
+        if datatype not in _SPE_DTYPES:
+            raise ValueError(f"Unsupported SPE data type {datatype} in {filename}")
+        if ydim != 1:
+            raise ValueError(f"{filename} holds {ydim}-row frames, expected a 1D spectrum")
+        if not xml_offset:
+            raise ValueError(f"{filename} has no SPE 3.0 XML footer (wavelength calibration)")
+        f.seek(xml_offset)
+        match = _SPE_WAVELENGTH_RE.search(f.read())
+    if match is None:
+        raise ValueError(f"No wavelength calibration in {filename}")
+    wavelengths = np.array(match.group(1).split(b','), dtype=np.float32)
+    if wavelengths.size != xdim:
+        raise ValueError(f"Calibration has {wavelengths.size} points but frames are {xdim} wide in {filename}")
+    intensities = np.memmap(filename, dtype=_SPE_DTYPES[datatype], mode='r', offset=_SPE_HEADER_BYTES, shape=(xdim,))
+    return wavelengths, intensities
 
 def save_scan_data(filename: str, angle_target: float, angle_actual: float, spectrum_data: np.ndarray):
     """
@@ -62,7 +62,7 @@ class AnalysisTab(ctk.CTkFrame):
         self.data_label = ctk.CTkLabel(self.controls_frame, text="Data", font=ctk.CTkFont(weight="bold"))
         self.data_label.pack(padx=10, pady=(10, 5), anchor="nw")
 
-        self.load_button = ctk.CTkButton(self.controls_frame, text="Load Data (.csv)", command=self.load_data)
+        self.load_button = ctk.CTkButton(self.controls_frame, text="Load Data (.csv/.spe)", command=self.load_data)
         self.load_button.pack(padx=10, pady=5, fill="x")
 
         self.clear_button = ctk.CTkButton(self.controls_frame, text="Clear Plot", command=self.clear_plot)
@@ -153,8 +153,8 @@ class AnalysisTab(ctk.CTkFrame):
             return
 
         filepaths = filedialog.askopenfilenames(
-            title="Select CSV Data Files",
-            filetypes=[("CSV files", "*.csv"), ("Text files", "*.txt"), ("All files", "*.*")]
+            title="Select Data Files",
+            filetypes=[("CSV files", "*.csv"), ("SPE files", "*.spe"), ("Text files", "*.txt"), ("All files", "*.*")]
         )
 
         if not filepaths:
@@ -192,6 +192,15 @@ class AnalysisTab(ctk.CTkFrame):
             theta_rad = np.radians(3.0 * theta_deg + 3.0 * theta0_deg) # Changed here
             return y0 + A * (np.sin(2 * theta_rad)**2)
 
+        # Analytic Jacobian of fit_func, columns (d/dy0, d/dA, d/dtheta0); spares curve_fit the finite differences
+        def fit_jac(theta_deg, y0, A, theta0_deg):
+            u = 2 * np.radians(3.0 * np.asarray(theta_deg) + 3.0 * theta0_deg)
+            jac = np.empty((u.size, 3))
+            jac[:, 0] = 1.0
+            jac[:, 1] = np.sin(u)**2
+            jac[:, 2] = A * np.sin(2 * u) * (np.pi / 30.0) # d(sin^2 u)/du = sin 2u; du/dtheta0 = 6 * pi/180
+            return jac
+
         param_names = ['y₀', 'A', 'θ₀']
         entries = [self.y0_entry, self.A_entry, self.theta0_entry]
         fix_vars = [self.fix_y0_var, self.fix_A_var, self.fix_theta0_var]
@@ -228,7 +237,8 @@ class AnalysisTab(ctk.CTkFrame):
             p0,
             bounds,
             fixed_params_mask=fixed_mask,
-            param_names=param_names
+            param_names=param_names,
+            jac=fit_jac
         )
 
         # Display results
@@ -265,7 +275,7 @@ class AnalysisTab(ctk.CTkFrame):
         angles = self.plotting_module.angle_data
         intensities = self.plotting_module.intensity_data
 
-        if not angles or not intensities or len(angles) != len(intensities):
+        if len(angles) == 0 or len(angles) != len(intensities):
             self.update_status("No data available to save.", error=True)
             logging.warning("Save data called but no valid data found in plotting module.")
             return
@@ -323,7 +333,7 @@ if __name__ == "__main__":
             self.intensity_data = 0.5 + 0.5 * np.sin(np.radians(3 * self.angle_data + 30))**2 + np.random.rand(15)*0.1
             self.update_analysis_plot()
             return True, f"Mock loaded {len(filepaths)} files."
-        def fit_intensity_data(self, fit_func, p0, bounds, fixed_params_mask, param_names):
+        def fit_intensity_data(self, fit_func, p0, bounds, fixed_params_mask, param_names, jac=None):
             print(f"Mock Fit: p0={p0}, bounds={bounds}, fixed={fixed_params_mask}")
             if len(self.angle_data) < 3: return None, None, "Mock Fit Error: Not enough data"
             try:
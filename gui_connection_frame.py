@@ -182,6 +182,8 @@ class ConnectionFrame(ctk.CTkFrame):
                     logging.warning(f"KDC disconnect method returned False for {serial_no}")
                     # Treat as disconnected anyway for UI state consistency
                     success = True # Assume it's effectively disconnected
+            elif hasattr(self.kdc_controller, 'connect_direct'):
+                success = self.kdc_controller.connect_direct(serial_no) # Skips device enumeration when possible
             else:
                 success = self.kdc_controller.connect(serial_no)
         except RuntimeError as e:
@@ -441,6 +443,8 @@ class ConnectionFrame(ctk.CTkFrame):
 
         # Always trigger the main app's state update function
         print(f"--- DEBUG (_handle_lf_result): Calling _app.update_manual_controls_state() ---") # Add log
+        if hasattr(self._app, 'invalidate_lf_connected_cache'):
+            self._app.invalidate_lf_connected_cache() # LF state just changed, don't reuse the cached result
         if hasattr(self._app, 'update_manual_controls_state'):
             self._app.update_manual_controls_state()
         else:
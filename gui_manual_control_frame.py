@@ -13,19 +13,29 @@ class ManualControlFrame(ctk.CTkFrame):
     """
     Frame for manual control of the KDC101 stage and LightField acquisition.
     """
+    # LF parameter polling interval (ms): starts fast, backs off while values are stable
+    POLL_INTERVAL_MIN_MS = 500
+    POLL_INTERVAL_MAX_MS = 5000
+    POLL_STABLE_READS = 3 # Unchanged reads required before backing off
+    POLL_MAX_FAILURES = 3 # Consecutive failed polled reads before polling stops (Refresh restarts it)
+
     def __init__(self, master, app_instance): # Changed controllers to app_instance
         super().__init__(master, fg_color="transparent")
         self._app = app_instance # Store app instance
         self.kdc_controller = app_instance.kdc101_controller # Get controller from app instance
         self.lf_controller = app_instance.lightfield_controller # Get controller from app instance
 
+        # --- Adaptive LF parameter polling state ---
+        self._poll_interval_ms = self.POLL_INTERVAL_MIN_MS
+        self._stable_count = 0
+        self._last_lf_params = None # Last snapshot, compared to detect idle state
+        self._lf_poll_job = None
+        self._lf_poll_failures = 0 # Consecutive failed reads; only the first one logs a traceback
+
         self.grid_columnconfigure(1, weight=1) # Allow entry fields to expand
         self.grid_columnconfigure(3, weight=1) # Allow entry fields to expand
 
-        # --- StringVars for LF parameters ---
-        self.lf_current_exposure_var = tk.StringVar(value="N/A")
-        self.lf_current_temp_var = tk.StringVar(value="N/A")
-        self.lf_current_temp_status_var = tk.StringVar(value="N/A")
+        # --- StringVars for editable LF parameters (display labels are set directly) ---
         self.lf_set_exposure_var = tk.StringVar(value="") # Default empty
         self.lf_set_filename_var = tk.StringVar(value="") # Default empty
 
@@ -84,17 +94,17 @@ class ManualControlFrame(ctk.CTkFrame):
 
         self.lf_exp_disp_label = ctk.CTkLabel(self, text="Exposure (ms):")
         self.lf_exp_disp_label.grid(row=8, column=0, padx=10, pady=2, sticky="w")
-        self.lf_exp_disp_value = ctk.CTkLabel(self, textvariable=self.lf_current_exposure_var, anchor="w")
+        self.lf_exp_disp_value = ctk.CTkLabel(self, text="N/A", anchor="w")
         self.lf_exp_disp_value.grid(row=8, column=1, padx=5, pady=2, sticky="ew")
 
         self.lf_temp_disp_label = ctk.CTkLabel(self, text="Sensor Temp (C):")
         self.lf_temp_disp_label.grid(row=9, column=0, padx=10, pady=2, sticky="w")
-        self.lf_temp_disp_value = ctk.CTkLabel(self, textvariable=self.lf_current_temp_var, anchor="w")
+        self.lf_temp_disp_value = ctk.CTkLabel(self, text="N/A", anchor="w")
         self.lf_temp_disp_value.grid(row=9, column=1, padx=5, pady=2, sticky="ew")
 
         self.lf_status_disp_label = ctk.CTkLabel(self, text="Temp Status:")
         self.lf_status_disp_label.grid(row=10, column=0, padx=10, pady=2, sticky="w")
-        self.lf_status_disp_value = ctk.CTkLabel(self, textvariable=self.lf_current_temp_status_var, anchor="w")
+        self.lf_status_disp_value = ctk.CTkLabel(self, text="N/A", anchor="w")
         self.lf_status_disp_value.grid(row=10, column=1, padx=5, pady=2, sticky="ew")
 
         # --- LF Parameter Setting ---
@@ -124,6 +134,7 @@ class ManualControlFrame(ctk.CTkFrame):
         self.update_status("Homing KDC101 stage...")
         if self.kdc_controller and self.kdc_controller.is_connected():
             try:
+                self._wake_position_poll()
                 # Consider running in thread later if blocking
                 self.kdc_controller.home()
                 self.update_status("KDC101 homing initiated.")
@@ -131,10 +142,8 @@ class ManualControlFrame(ctk.CTkFrame):
                 # Consider disabling move buttons during home
             except RuntimeError as e: # Catch specific controller errors
                 self.update_status(f"KDC Home Error: {e}", error=True)
-                logging.error(f"RuntimeError homing stage: {e}")
-            except Exception as e: # Catch unexpected errors
-                self.update_status(f"Unexpected KDC Home Error: {e}", error=True)
-                logging.exception("Unexpected error homing stage:")
+                logging.error("RuntimeError homing stage: %s", e)
+            # Anything else propagates to the app's report_callback_exception hook
         else:
             self.update_status("KDC101 not connected.", error=True)
             logging.warning("Home command ignored: KDC101 not connected.")
@@ -144,9 +153,10 @@ class ManualControlFrame(ctk.CTkFrame):
         try:
             angle_str = self.kdc_move_to_entry.get()
             angle = float(angle_str)
-            logging.info(f"Manual Control: Move To button clicked (Angle: {angle}).")
+            logging.info("Manual Control: Move To button clicked (Angle: %s).", angle)
             self.update_status(f"Moving KDC101 to {angle:.2f}°...")
             if self.kdc_controller and self.kdc_controller.is_connected():
+                self._wake_position_poll()
                 # Consider running in thread later if blocking
                 self.kdc_controller.move_to(angle)
                 self.update_status(f"KDC101 move to {angle:.2f}° initiated.")
@@ -157,13 +167,10 @@ class ManualControlFrame(ctk.CTkFrame):
                 logging.warning("Move To command ignored: KDC101 not connected.")
         except ValueError:
             self.update_status(f"Invalid angle '{angle_str}' for Move To.", error=True)
-            logging.warning(f"Invalid input for Move To: {angle_str}")
-        except RuntimeError as e: # Catch specific controller errors
+            logging.warning("Invalid input for Move To: %s", angle_str)
+        except (RuntimeError, TimeoutError) as e: # Catch specific controller errors (TimeoutError: stuck axis)
             self.update_status(f"KDC Move To Error: {e}", error=True)
-            logging.error(f"RuntimeError moving stage: {e}")
-        except Exception as e: # Catch unexpected errors
-            self.update_status(f"Unexpected KDC Move To Error: {e}", error=True)
-            logging.exception("Unexpected error moving stage:")
+            logging.error("RuntimeError moving stage: %s", e)
 
     def move_relative_stage(self):
         """Callback for the Move Relative button."""
@@ -172,10 +179,11 @@ class ManualControlFrame(ctk.CTkFrame):
         try:
             step = float(step_str)
             print(f"--- DEBUG (move_relative_stage): Parsed step: {step} ---") # Add log
-            logging.info(f"Manual Control: Move Relative button clicked (Step: {step}).")
+            logging.info("Manual Control: Move Relative button clicked (Step: %s).", step)
             self.update_status(f"Moving KDC101 by {step:.2f}°...")
             if self.kdc_controller and self.kdc_controller.is_connected():
                 print(f"--- DEBUG (move_relative_stage): Calling kdc_controller.move_relative({step}) ---") # Add log
+                self._wake_position_poll()
                 # Consider running in thread later if blocking
                 self.kdc_controller.move_relative(step)
                 print(f"--- DEBUG (move_relative_stage): kdc_controller.move_relative call finished ---") # Add log
@@ -187,18 +195,21 @@ class ManualControlFrame(ctk.CTkFrame):
                 logging.warning("Move Relative command ignored: KDC101 not connected.")
         except ValueError:
             self.update_status(f"Invalid step '{step_str}' for Move Relative.", error=True)
-            logging.warning(f"Invalid input for Move Relative: {step_str}")
+            logging.warning("Invalid input for Move Relative: %s", step_str)
         except RuntimeError as e: # Catch specific controller errors
             self.update_status(f"KDC Move Relative Error: {e}", error=True)
-            logging.error(f"RuntimeError moving stage relatively: {e}")
-        except Exception as e: # Catch unexpected errors
-            self.update_status(f"Unexpected KDC Move Relative Error: {e}", error=True)
-            logging.exception("Unexpected error moving stage relatively:")
+            logging.error("RuntimeError moving stage relatively: %s", e)
+
+    def _wake_position_poll(self):
+        """Asks the app to poll the stage position at the active rate while a manual move runs."""
+        if hasattr(self._app, 'force_active_poll'):
+            self._app.force_active_poll()
 
     def acquire_single_spectrum(self):
         """Callback for the Acquire Single Spectrum button - starts worker thread."""
         logging.info("Manual Control: Acquire Single Spectrum clicked.")
         if self.lf_controller and self.lf_controller.is_connected():
+            self._reset_lf_poll_interval() # User action: poll fast again
             self.lf_acquire_button.configure(state="disabled") # Disable button during acquire
             self.update_status("Starting single acquisition...")
             # Run in thread
@@ -220,14 +231,14 @@ class ManualControlFrame(ctk.CTkFrame):
                 spectrum_data = self.lf_controller.get_data()
                 if spectrum_data is not None:
                     success = True
-                    logging.info(f"Acquired spectrum data, shape: {spectrum_data.shape}")
+                    logging.info("Acquired spectrum data, shape: %s", spectrum_data.shape)
                 else:
                     error_msg = "Spectrum acquired but failed to get data."
             else:
                 error_msg = "Spectrum acquisition failed (acquire returned False)."
         except RuntimeError as e:
             error_msg = f"LightField Acquire Error: {e}"
-            logging.error(f"RuntimeError acquiring spectrum: {e}")
+            logging.error("RuntimeError acquiring spectrum: %s", e)
         except Exception as e:
             error_msg = f"Unexpected LightField Acquire Error: {e}"
             logging.exception("Error acquiring spectrum:")
@@ -268,7 +279,7 @@ class ManualControlFrame(ctk.CTkFrame):
             if max_vel <= 0 or accel <= 0:
                 raise ValueError("Velocity and acceleration must be positive.")
 
-            logging.info(f"Manual Control: Set Velocity clicked (MaxVel={max_vel}, Accel={accel}).")
+            logging.info("Manual Control: Set Velocity clicked (MaxVel=%s, Accel=%s).", max_vel, accel)
             self.update_status(f"Setting KDC101 velocity/acceleration...")
 
             if self.kdc_controller and self.kdc_controller.is_connected():
@@ -283,13 +294,10 @@ class ManualControlFrame(ctk.CTkFrame):
 
         except ValueError as e:
             self.update_status(f"Invalid velocity/acceleration value: {e}", error=True)
-            logging.warning(f"Invalid input for Set Velocity: Vel='{max_vel_str}', Accel='{accel_str}'")
+            logging.warning("Invalid input for Set Velocity: Vel='%s', Accel='%s'", max_vel_str, accel_str)
         except RuntimeError as e: # Catch specific controller errors
             self.update_status(f"KDC Set Velocity Error: {e}", error=True)
-            logging.error(f"RuntimeError setting velocity: {e}")
-        except Exception as e: # Catch unexpected errors
-            self.update_status(f"Unexpected KDC Set Velocity Error: {e}", error=True)
-            logging.exception("Unexpected error setting velocity:")
+            logging.error("RuntimeError setting velocity: %s", e)
 
 
     def update_position_display(self, position: float):
@@ -306,13 +314,13 @@ class ManualControlFrame(ctk.CTkFrame):
             except (TypeError, ValueError):
                 # Handle potential formatting errors, though float should be fine
                 display_text = "Error"
-                logging.warning(f"Could not format position value: {position}")
+                logging.warning("Could not format position value: %s", position)
 
         self.kdc_pos_value.configure(text=display_text)
 
     def set_controls_state(self, kdc_connected: bool, lf_connected: bool):
         """Enable or disable manual control widgets based on connection status."""
-        logging.info(f"Setting controls state: kdc_connected={kdc_connected}, lf_connected={lf_connected}")
+        logging.info("Setting controls state: kdc_connected=%s, lf_connected=%s", kdc_connected, lf_connected)
         kdc_state = "normal" if kdc_connected else "disabled"
         lf_state = "normal" if lf_connected else "disabled" # Determine state based on lf_connected
 
@@ -356,20 +364,19 @@ class ManualControlFrame(ctk.CTkFrame):
             self.lf_set_params_button,
             self.lf_acquire_button
         ]
-        logging.debug(f"Applying LF state '{lf_state}' to {len(lf_widgets)} widgets.") # Add log
+        logging.debug("Applying LF state '%s' to %d widgets.", lf_state, len(lf_widgets)) # Add log
         for widget in lf_widgets:
             try: # Add try-except just in case a widget is None unexpectedly
                 widget_name = getattr(widget, '_name', str(widget)) # Try to get a name
                 widget.configure(state=lf_state)
-                logging.debug(f"  - Set state='{lf_state}' for widget: {widget_name}") # Add log
+                logging.debug("  - Set state='%s' for widget: %s", lf_state, widget_name) # Add log
             except Exception as e:
-                logging.error(f"Error configuring state for widget {widget}: {e}")
+                logging.error("Error configuring state for widget %s: %s", widget, e)
 
         # Clear display fields if not connected
         if not lf_connected:
-            self.lf_current_exposure_var.set("N/A")
-            self.lf_current_temp_var.set("N/A")
-            self.lf_current_temp_status_var.set("N/A")
+            self._stop_lf_polling()
+            self._set_lf_display("N/A", "N/A", "N/A")
             self.lf_set_exposure_var.set("") # Clear set fields too
             self.lf_set_filename_var.set("")
         else:
@@ -379,48 +386,141 @@ class ManualControlFrame(ctk.CTkFrame):
 
     # --- LF Parameter Read/Set ---
 
-    def read_lf_parameters_threaded(self):
-        """Reads current LF parameters in a background thread."""
+    def read_lf_parameters_threaded(self, polled: bool = False):
+        """
+        Reads current LF parameters in a background thread.
+
+        Args:
+            polled (bool): True when triggered by the periodic poll. Polled reads
+                        don't post status messages and don't reset the poll interval.
+        """
+        self._cancel_lf_poll_job() # A read is starting; the handler reschedules the poll
         if self.lf_controller and self.lf_controller.is_connected():
-            self.update_status("Reading LightField parameters...")
-            # Disable refresh button while reading
-            self.lf_refresh_params_button.configure(state="disabled")
-            read_thread = threading.Thread(target=self._read_lf_params_worker, daemon=True)
+            if not polled:
+                self._reset_lf_poll_interval() # User action: poll fast again
+                self._lf_poll_failures = 0 # ...and restarts polling stopped by failed reads
+                self.update_status("Reading LightField parameters...")
+                # Disable refresh button while reading
+                self.lf_refresh_params_button.configure(state="disabled")
+            read_thread = threading.Thread(target=self._read_lf_params_worker, args=(polled,), daemon=True)
             read_thread.start()
-        else:
+        elif not polled:
             self.update_status("Cannot read: LightField not connected.", error=True)
 
-    def _read_lf_params_worker(self):
+    def _read_lf_params_worker(self, polled: bool = False):
         """Worker to read LF parameters."""
         params = {'exposure': None, 'temp': None, 'status': None}
         error_msg = None
         try:
-            params['exposure'] = self.lf_controller.get_exposure_time_ms()
-            params['temp'] = self.lf_controller.get_sensor_temperature()
-            params['status'] = self.lf_controller.get_sensor_temperature_status()
+            params = self._read_lf_params_snapshot()
         except Exception as e:
             error_msg = f"Error reading LF params: {e}"
-            logging.exception("Error reading LF parameters in worker:")
+            if not polled or self._lf_poll_failures == 0:
+                logging.exception("Error reading LF parameters in worker:")
+            else: # Repeats of a failure already logged in full
+                logging.debug("Polled LF parameter read failed again: %s", e)
 
-        self._app.after(0, lambda: self._handle_read_lf_params_result(params, error_msg))
+        self._app.after(0, lambda: self._handle_read_lf_params_result(params, error_msg, polled))
 
-    def _handle_read_lf_params_result(self, params: dict, error_msg: str | None):
+    def _handle_read_lf_params_result(self, params: dict, error_msg: str | None, polled: bool = False):
         """Update GUI with read parameters."""
-        self.lf_refresh_params_button.configure(state="normal") # Re-enable button
+        if not polled:
+            self.lf_refresh_params_button.configure(state="normal") # Re-enable button
         if error_msg:
-            self.update_status(error_msg, error=True)
-            self.lf_current_exposure_var.set("Error")
-            self.lf_current_temp_var.set("Error")
-            self.lf_current_temp_status_var.set("Error")
+            self._lf_poll_failures += 1
+            if self._lf_poll_failures >= self.POLL_MAX_FAILURES:
+                logging.warning("LightField parameter polling stopped after %d failed reads; use Refresh to retry.", self._lf_poll_failures)
+                self._cancel_lf_poll_job()
+            else:
+                self._poll_interval_ms = self.POLL_INTERVAL_MAX_MS # Back off until a read succeeds
+                self._schedule_lf_poll()
         else:
-            exp_val = f"{params['exposure']:.3f}" if params['exposure'] is not None else "N/A"
-            temp_val = f"{params['temp']:.2f}" if params['temp'] is not None else "N/A"
-            status_val = params['status'] if params['status'] is not None else "N/A"
-
-            self.lf_current_exposure_var.set(exp_val)
-            self.lf_current_temp_var.set(temp_val)
-            self.lf_current_temp_status_var.set(status_val)
-            self.update_status("LightField parameters updated.")
+            self._lf_poll_failures = 0
+            self._update_lf_poll_interval(params)
+            self._schedule_lf_poll()
+        if error_msg:
+            if not polled:
+                self.update_status(error_msg, error=True)
+            self._set_lf_display("Error", "Error", "Error")
+        else:
+            self._show_lf_params(params)
+            if not polled:
+                self.update_status("LightField parameters updated.")
+
+    def _read_lf_params_snapshot(self) -> dict:
+        """Reads exposure, temperature and temperature status (runs in worker threads)."""
+        snap = self.lf_controller.snapshot()
+        return {
+            'exposure': snap['exposure_ms'],
+            'temp': snap['temp_c'],
+            'status': snap['temp_status'],
+        }
+
+    def _show_lf_params(self, params: dict):
+        """Formats a parameter snapshot and writes it to the display labels."""
+        exp_val = f"{params['exposure']:.3f}" if params['exposure'] is not None else "N/A"
+        temp_val = f"{params['temp']:.2f}" if params['temp'] is not None else "N/A"
+        status_val = params['status'] if params['status'] is not None else "N/A"
+        self._set_lf_display(exp_val, temp_val, status_val)
+
+    def _set_lf_display(self, exposure_text: str, temp_text: str, status_text: str):
+        """Writes the LF parameter display labels, skipping labels whose text is unchanged."""
+        for label, text in ((self.lf_exp_disp_value, exposure_text),
+                            (self.lf_temp_disp_value, temp_text),
+                            (self.lf_status_disp_value, status_text)):
+            if label.cget("text") != text:
+                label.configure(text=text)
+
+    # --- Adaptive LF Parameter Polling ---
+
+    def _update_lf_poll_interval(self, snapshot):
+        """Backs off the poll interval after repeated unchanged reads, resets it on any change."""
+        if snapshot == self._last_lf_params:
+            self._stable_count += 1
+            if self._stable_count >= self.POLL_STABLE_READS:
+                self._poll_interval_ms = min(self.POLL_INTERVAL_MAX_MS, self._poll_interval_ms * 2)
+        else:
+            self._reset_lf_poll_interval()
+        self._last_lf_params = snapshot
+
+    def _reset_lf_poll_interval(self):
+        """Returns polling to the fastest interval (called on changes and user actions)."""
+        self._poll_interval_ms = self.POLL_INTERVAL_MIN_MS
+        self._stable_count = 0
+
+    def _schedule_lf_poll(self):
+        """Schedules the next periodic LF parameter read, if still connected."""
+        self._cancel_lf_poll_job()
+        if getattr(self._app, '_is_closing', False):
+            return
+        if self.lf_controller and self.lf_controller.is_connected():
+            self._lf_poll_job = self._app.after(self._poll_interval_ms, self._poll_lf_parameters)
+
+    def _poll_lf_parameters(self):
+        """Periodic poll callback (runs in main thread)."""
+        self._lf_poll_job = None
+        if getattr(self._app, '_is_closing', False):
+            return
+        scan_logic = getattr(self._app, 'scan_logic', None)
+        if scan_logic is not None and scan_logic.is_running():
+            # Leave the LightField worker to the scan; check again later
+            self._poll_interval_ms = self.POLL_INTERVAL_MAX_MS
+            self._schedule_lf_poll()
+            return
+        self.read_lf_parameters_threaded(polled=True)
+
+    def _cancel_lf_poll_job(self):
+        """Cancels a pending poll, if any."""
+        if self._lf_poll_job is not None:
+            self._app.after_cancel(self._lf_poll_job)
+            self._lf_poll_job = None
+
+    def _stop_lf_polling(self):
+        """Stops polling and forgets the last snapshot (e.g., on disconnect)."""
+        self._cancel_lf_poll_job()
+        self._last_lf_params = None
+        self._lf_poll_failures = 0
+        self._reset_lf_poll_interval()
 
     def set_lf_parameters_threaded(self):
         """Sets LF parameters in a background thread."""
@@ -436,6 +536,7 @@ class ManualControlFrame(ctk.CTkFrame):
                     return
 
                 self.update_status("Setting LightField parameters...")
+                self._reset_lf_poll_interval() # User action: poll fast again
                 self.lf_set_params_button.configure(state="disabled") # Disable button
                 set_thread = threading.Thread(target=self._set_lf_params_worker, args=(exposure_ms, filename), daemon=True)
                 set_thread.start()
@@ -445,9 +546,14 @@ class ManualControlFrame(ctk.CTkFrame):
         else:
             self.update_status("Cannot set: LightField not connected.", error=True)
 
-    def _set_lf_params_worker(self, exposure_ms: float | None, filename: str | None):
-        """Worker to set LF parameters."""
+    def _set_lf_params_worker(self, exposure_ms: float | None, filename: str | None, read_back: bool = True):
+        """
+        Worker to set LF parameters.
+        If read_back is True and anything was set, the updated parameters are read in the
+        same worker so the GUI gets set results and the new display values in one completion.
+        """
         results = {'exposure': None, 'filename': None} # None=not attempted, True=success, False=fail
+        snapshot = None
         error_msg = None
         try:
             if exposure_ms is not None:
@@ -458,9 +564,15 @@ class ManualControlFrame(ctk.CTkFrame):
             error_msg = f"Error setting LF params: {e}"
             logging.exception("Error setting LF parameters in worker:")
 
-        self._app.after(0, lambda: self._handle_set_lf_params_result(results, error_msg))
+        if read_back and error_msg is None and True in results.values():
+            try:
+                snapshot = self._read_lf_params_snapshot()
+            except Exception:
+                logging.exception("Error reading back LF parameters after set:")
+
+        self._app.after(0, lambda: self._handle_set_lf_params_result(results, error_msg, snapshot))
 
-    def _handle_set_lf_params_result(self, results: dict, error_msg: str | None):
+    def _handle_set_lf_params_result(self, results: dict, error_msg: str | None, snapshot: dict | None = None):
         """Update GUI after setting LF parameters."""
         self.lf_set_params_button.configure(state="normal") # Re-enable button
         if error_msg:
@@ -477,8 +589,11 @@ class ManualControlFrame(ctk.CTkFrame):
             self.update_status(final_msg, error=(False in results.values()))
 
             # Refresh displayed parameters if anything was set successfully
-            if True in results.values():
-                self.read_lf_parameters_threaded()
+            if snapshot is not None:
+                self._show_lf_params(snapshot)
+                self._update_lf_poll_interval(snapshot)
+            elif True in results.values():
+                self.read_lf_parameters_threaded() # Read-back failed in worker, retry separately
 
 
     def update_status(self, message: str, error: bool = False):
@@ -491,7 +606,8 @@ class ManualControlFrame(ctk.CTkFrame):
             print(f"Status Update (Frame): {message}" + (" (Error)" if error else ""))
 
 # Example usage (for testing this frame independently)
-if __name__ == "__main__":
+def _selftest():
+    """Builds the frame against mock controllers and runs a standalone event loop."""
     # Mock controllers for testing
     class MockController:
         def __init__(self, name="Mock"): self._connected = True; self.name = name
@@ -499,8 +615,13 @@ if __name__ == "__main__":
         def home(self): print(f"{self.name}: Homing...")
         def move_to(self, pos): print(f"{self.name}: Moving to {pos}...")
         def move_relative(self, step): print(f"{self.name}: Moving by {step}...")
-        def acquire(self, exp, acc): print(f"{self.name}: Acquiring (exp={exp}, acc={acc})..."); return [1,2,3] # Simulate data
+        def acquire(self): print(f"{self.name}: Acquiring..."); return True
+        def get_data(self): return np.arange(3)
         def get_position(self): import random; return random.uniform(0, 360)
+        def get_exposure_time_ms(self): return 100.0
+        def get_sensor_temperature(self): return -70.0
+        def get_sensor_temperature_status(self): return "Locked"
+        def snapshot(self): return {"exposure_ms": 100.0, "temp_c": -70.0, "temp_status": "Locked"}
 
     app = ctk.CTk()
     app.geometry("400x300")
@@ -510,18 +631,15 @@ if __name__ == "__main__":
     def update_status_bar(message, error=False): print(f"APP STATUS: {message}" + (" [ERROR]" if error else ""))
     app.update_status_bar = update_status_bar
 
-    # Mock main window and scan params frame for exposure/accum access
-    class MockScanParams: exposure_entry = ctk.CTkEntry(app); accumulations_entry = ctk.CTkEntry(app)
-    class MockMainWindow: scan_params_frame = MockScanParams()
-    class MockMaster: main_window = MockMainWindow(); update_status_bar = update_status_bar
-    app.main_window = MockMainWindow() # Attach to app instance for the frame's master.master access
-
+    # The frame reads its controllers from the app instance
     mock_kdc = MockController("KDC101")
     mock_lf = MockController("LightField")
+    app.kdc101_controller = mock_kdc
+    app.lightfield_controller = mock_lf
 
-    frame = ManualControlFrame(app, mock_kdc, mock_lf)
+    frame = ManualControlFrame(app, app_instance=app)
     frame.pack(expand=True, fill="both", padx=10, pady=10)
-    frame.set_controls_state(True) # Enable controls for testing
+    frame.set_controls_state(kdc_connected=True, lf_connected=True) # Enable controls for testing
 
     # Simulate position updates
     def update_pos():
@@ -531,3 +649,7 @@ if __name__ == "__main__":
     # update_pos() # Uncomment to test position updates
 
     app.mainloop()
+
+
+if __name__ == "__main__":
+    _selftest()
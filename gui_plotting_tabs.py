@@ -10,7 +10,7 @@ class PlottingTabs(ctk.CTkTabview):
     """
     # Modify __init__ to accept app_instance
     def __init__(self, master, app_instance):
-        super().__init__(master)
+        super().__init__(master, command=self._on_tab_changed)
         self.app = app_instance # Store app instance
         self.plotting_module = app_instance.plotting_module # Get plotting module from app
 
@@ -24,9 +24,8 @@ class PlottingTabs(ctk.CTkTabview):
         self.live_spectrum_tab = LiveSpectrumTab(self.tab("Live Spectrum"), self.plotting_module)
         self.live_spectrum_tab.pack(expand=True, fill="both")
 
-        # Pass the full app_instance to AnalysisTab
-        self.analysis_tab = AnalysisTab(self.tab("Intensity Analysis"), self.app)
-        self.analysis_tab.pack(expand=True, fill="both")
+        # AnalysisTab (and its Matplotlib canvas) is built on first selection, see _on_tab_changed
+        self.analysis_tab = None
 
         # TODO: Create and pack content for other tabs if added
         # self.advanced_fit_tab = AdvancedFitTab(self.tab("Advanced Fit"), plotting_module)
@@ -35,10 +34,21 @@ class PlottingTabs(ctk.CTkTabview):
         # Set default tab (optional)
         self.set("Live Spectrum")
 
+    def _on_tab_changed(self):
+        """Builds tab contents the first time their tab is selected."""
+        if self.get() == "Intensity Analysis" and self.analysis_tab is None:
+            # Pass the full app_instance to AnalysisTab
+            self.analysis_tab = AnalysisTab(self.tab("Intensity Analysis"), self.app)
+            self.analysis_tab.pack(expand=True, fill="both")
+            # Draw any points collected by a scan before the tab was first shown
+            if len(self.plotting_module.angle_data):
+                self.plotting_module.update_analysis_plot()
+
 # Example usage (for testing this frame independently)
 if __name__ == "__main__":
     # Mock plotting module and tab contents for testing
     class MockPlottingModule:
+        angle_data = []
         def setup_live_plot(self, ax): print("Setting up live plot")
         def setup_analysis_plot(self, ax): print("Setting up analysis plot")
         def update_live_plot(self, data): print(f"Updating live plot with: {data}")
@@ -1,16 +1,18 @@
 # gui_scan_params_frame.py
 import customtkinter as ctk
-import customtkinter as ctk
 import tkinter as tk
 from tkinter import filedialog
+from tkinter import ttk
 import logging # Added for logging
 import os # <-- Import the os module
-import numpy as np # <-- Import numpy for validation
 
 class ScanParamsFrame(ctk.CTkFrame):
     """
     Frame for configuring polarization scan parameters.
     """
+    MAX_SCAN_STEPS = 1000000 # Guard against a mistyped step size producing an enormous angle grid
+    SAVE_DIR_DEBOUNCE_MS = 200 # Delay after the last edit before the save directory is checked
+
     # Accept manual_control_frame reference
     def __init__(self, master, app_instance, manual_control_frame):
         super().__init__(master, fg_color="transparent")
@@ -20,6 +22,10 @@ class ScanParamsFrame(ctk.CTkFrame):
 
         self.grid_columnconfigure(1, weight=1) # Allow entry fields to expand
 
+        # Entries and checkboxes are plain ttk widgets (cheaper to build and reconfigure than CTk wrappers),
+        # styled to match the CustomTkinter theme; labels and buttons stay CTk
+        self._configure_ttk_styles()
+
         # --- Title ---
         self.title_label = ctk.CTkLabel(self, text="Scan Parameters", font=ctk.CTkFont(weight="bold"))
         self.title_label.grid(row=0, column=0, columnspan=3, padx=10, pady=(0, 5), sticky="w")
@@ -27,24 +33,27 @@ class ScanParamsFrame(ctk.CTkFrame):
         # --- Angle Parameters ---
         self.start_angle_label = ctk.CTkLabel(self, text="Start Angle (°):")
         self.start_angle_label.grid(row=1, column=0, padx=10, pady=5, sticky="w")
-        self.start_angle_entry = ctk.CTkEntry(self, placeholder_text="0.0", width=80)
+        self.start_angle_var = tk.StringVar(value="0.0") # Read directly in get_scan_parameters
+        self.start_angle_entry = ttk.Entry(self, textvariable=self.start_angle_var, width=10, style="ScanParams.TEntry")
         self.start_angle_entry.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
 
         self.end_angle_label = ctk.CTkLabel(self, text="End Angle (°):")
         self.end_angle_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
-        self.end_angle_entry = ctk.CTkEntry(self, placeholder_text="360.0", width=80)
+        self.end_angle_var = tk.StringVar(value="360.0")
+        self.end_angle_entry = ttk.Entry(self, textvariable=self.end_angle_var, width=10, style="ScanParams.TEntry")
         self.end_angle_entry.grid(row=2, column=1, padx=5, pady=5, sticky="ew")
 
         self.step_angle_label = ctk.CTkLabel(self, text="Step Size (°):")
         self.step_angle_label.grid(row=3, column=0, padx=10, pady=5, sticky="w")
-        self.step_angle_entry = ctk.CTkEntry(self, placeholder_text="5.0", width=80)
+        self.step_angle_var = tk.StringVar(value="5.0")
+        self.step_angle_entry = ttk.Entry(self, textvariable=self.step_angle_var, width=10, style="ScanParams.TEntry")
         self.step_angle_entry.grid(row=3, column=1, padx=5, pady=5, sticky="ew")
 
         # --- Filename Option ---
         self.add_position_checkbox_var = tk.IntVar(value=0) # Variable for checkbox state
-        self.add_position_checkbox = ctk.CTkCheckBox(
+        self.add_position_checkbox = ttk.Checkbutton(
             self, text="Add position at the end filename",
-            variable=self.add_position_checkbox_var
+            variable=self.add_position_checkbox_var, style="ScanParams.TCheckbutton"
         )
         self.add_position_checkbox.grid(row=4, column=0, columnspan=3, padx=10, pady=5, sticky="w") # Reduced pady
 
@@ -52,50 +61,63 @@ class ScanParamsFrame(ctk.CTkFrame):
         self.save_dir_label = ctk.CTkLabel(self, text="Save Directory:")
         self.save_dir_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
         self.save_dir_var = tk.StringVar(value="") # Variable for directory path
-        self.save_dir_entry = ctk.CTkEntry(self, textvariable=self.save_dir_var, placeholder_text="Directory for .csv files")
+        self._save_dir_valid = False # Result of the last os.path.isdir check on save_dir_var
+        self._save_dir_check_job = None # Pending debounced check, if any
+        self.save_dir_var.trace_add("write", self._on_save_dir_changed)
+        self.save_dir_entry = ttk.Entry(self, textvariable=self.save_dir_var, style="ScanParams.TEntry")
         self.save_dir_entry.grid(row=5, column=1, padx=5, pady=5, sticky="ew")
         self.browse_button = ctk.CTkButton(self, text="Browse...", width=80, command=self.browse_directory)
         self.browse_button.grid(row=5, column=2, padx=5, pady=5, sticky="w")
 
+        # --- HDF5 Output Option (off by default: writes an extra file next to LightField's) ---
+        self.save_hdf5_checkbox_var = tk.IntVar(value=0)
+        self.save_hdf5_checkbox = ttk.Checkbutton(
+            self, text="Also save scan to HDF5 (.h5, needs h5py)",
+            variable=self.save_hdf5_checkbox_var, style="ScanParams.TCheckbutton"
+        )
+        self.save_hdf5_checkbox.grid(row=6, column=0, columnspan=3, padx=10, pady=5, sticky="w")
+
         # --- Plotting Option ---
         self.plot_live_checkbox_var = tk.IntVar(value=1) # Default to plotting enabled
-        self.plot_live_checkbox = ctk.CTkCheckBox(
+        self.plot_live_checkbox = ttk.Checkbutton(
             self, text="Plot Live Spectrum",
-            variable=self.plot_live_checkbox_var
+            variable=self.plot_live_checkbox_var, style="ScanParams.TCheckbutton"
         )
-        self.plot_live_checkbox.grid(row=6, column=0, columnspan=3, padx=10, pady=5, sticky="w") # Row 6
+        self.plot_live_checkbox.grid(row=7, column=0, columnspan=3, padx=10, pady=5, sticky="w") # Row 7
 
         # --- Dynamic Intensity Plotting Option ---
         self.plot_intensity_checkbox_var = tk.IntVar(value=0) # Default to disabled
-        self.plot_intensity_checkbox = ctk.CTkCheckBox(
+        self.plot_intensity_checkbox = ttk.Checkbutton(
             self, text="Dynamically plot max Intensity",
-            variable=self.plot_intensity_checkbox_var,
+            variable=self.plot_intensity_checkbox_var, style="ScanParams.TCheckbutton",
             command=self._toggle_wavelength_entries # Enable/disable entries based on checkbox
         )
-        self.plot_intensity_checkbox.grid(row=7, column=0, columnspan=3, padx=10, pady=5, sticky="w") # New row 7
+        self.plot_intensity_checkbox.grid(row=8, column=0, columnspan=3, padx=10, pady=5, sticky="w") # Row 8
 
         # --- Wavelength Range Frame ---
         self.wavelength_range_frame = ctk.CTkFrame(self, fg_color="transparent")
-        self.wavelength_range_frame.grid(row=8, column=0, columnspan=3, padx=5, pady=0, sticky="ew") # New row 8
+        self.wavelength_range_frame.grid(row=9, column=0, columnspan=3, padx=5, pady=0, sticky="ew") # Row 9
         self.wavelength_range_frame.grid_columnconfigure((1, 3), weight=1) # Allow entries to expand slightly
 
         self.wavelength_min_label = ctk.CTkLabel(self.wavelength_range_frame, text="Range Min (nm):")
         self.wavelength_min_label.grid(row=0, column=0, padx=(5,2), pady=2, sticky="w")
-        self.wavelength_min_entry = ctk.CTkEntry(self.wavelength_range_frame, placeholder_text="e.g. 500", width=70)
+        self.wavelength_min_var = tk.StringVar(value="")
+        self.wavelength_min_entry = ttk.Entry(self.wavelength_range_frame, textvariable=self.wavelength_min_var, width=8, style="ScanParams.TEntry")
         self.wavelength_min_entry.grid(row=0, column=1, padx=(0,5), pady=2, sticky="ew")
 
         self.wavelength_max_label = ctk.CTkLabel(self.wavelength_range_frame, text="Max (nm):")
         self.wavelength_max_label.grid(row=0, column=2, padx=(5,2), pady=2, sticky="w")
-        self.wavelength_max_entry = ctk.CTkEntry(self.wavelength_range_frame, placeholder_text="e.g. 600", width=70)
+        self.wavelength_max_var = tk.StringVar(value="")
+        self.wavelength_max_entry = ttk.Entry(self.wavelength_range_frame, textvariable=self.wavelength_max_var, width=8, style="ScanParams.TEntry")
         self.wavelength_max_entry.grid(row=0, column=3, padx=(0,5), pady=2, sticky="ew")
 
         # --- Scan Control Buttons ---
         self.scan_button = ctk.CTkButton(self, text="Start Scan", command=self.start_scan)
-        self.scan_button.grid(row=9, column=0, columnspan=3, padx=10, pady=(10, 5), sticky="ew") # Adjusted row to 9
+        self.scan_button.grid(row=10, column=0, columnspan=3, padx=10, pady=(10, 5), sticky="ew") # Row 10
 
         # Frame for Pause/Resume/Abort buttons
         self.control_button_frame = ctk.CTkFrame(self, fg_color="transparent")
-        self.control_button_frame.grid(row=10, column=0, columnspan=3, padx=5, pady=0, sticky="ew") # Adjusted row to 10
+        self.control_button_frame.grid(row=11, column=0, columnspan=3, padx=5, pady=0, sticky="ew") # Row 11
         self.control_button_frame.grid_columnconfigure((0, 1, 2), weight=1) # Distribute space
 
         self.pause_button = ctk.CTkButton(self.control_button_frame, text="Pause Scan", command=self.pause_scan, state="disabled", fg_color="orange", hover_color="#FF8C00") # Darker Orange
@@ -107,8 +129,79 @@ class ScanParamsFrame(ctk.CTkFrame):
         self.abort_button = ctk.CTkButton(self.control_button_frame, text="Abort Scan", command=self.abort_scan, state="disabled", fg_color="red", hover_color="darkred")
         self.abort_button.grid(row=0, column=2, padx=5, pady=5, sticky="ew")
 
+        # Parameter widgets toggled together while a scan runs; built once for _set_param_widgets_state
+        self._param_widgets = [
+            self.start_angle_entry, self.end_angle_entry, self.step_angle_entry,
+            self.add_position_checkbox,
+            self.save_dir_entry, self.browse_button,
+            self.save_hdf5_checkbox,
+            self.plot_live_checkbox,
+            self.plot_intensity_checkbox,
+            self.wavelength_min_entry,
+            self.wavelength_max_entry
+        ]
+        self._param_widget_states = {} # widget -> last state applied by this frame
+
         # TODO: Add validation for numeric entries
 
+    def _configure_ttk_styles(self):
+        """Configures the ttk styles used by this frame's entries and checkboxes and keeps them in step with the CTk appearance mode."""
+        style = ttk.Style(self)
+        # Borrow clam's field element (it honours fieldbackground/bordercolor on all platforms) for our entry style only,
+        # instead of switching the whole application to the clam theme
+        try:
+            style.element_create("ScanParams.Entry.field", "from", "clam", "Entry.field")
+        except tk.TclError:
+            pass # Already created (element names are global to the interpreter)
+        style.layout("ScanParams.TEntry", [
+            ("ScanParams.Entry.field", {"sticky": "nswe", "border": "1", "children": [
+                ("Entry.padding", {"sticky": "nswe", "children": [
+                    ("Entry.textarea", {"sticky": "nswe"})]})]})])
+        self._apply_ttk_style_colors(ctk.get_appearance_mode())
+        ctk.AppearanceModeTracker.add(self._apply_ttk_style_colors, self)
+
+    def _resolve_color(self, color, mode_string):
+        """Picks the entry for the given appearance mode out of a CTk (light, dark) colour pair."""
+        if isinstance(color, (list, tuple)):
+            return color[1] if mode_string.lower() == "dark" else color[0]
+        return color
+
+    def _master_bg_color(self):
+        """Returns the first non-transparent fg_color up the master chain (this frame itself is transparent)."""
+        widget = self.master
+        while widget is not None:
+            try:
+                color = widget.cget("fg_color")
+            except (tk.TclError, ValueError):
+                color = None
+            if color is not None and color != "transparent":
+                return color
+            widget = getattr(widget, 'master', None)
+        return ctk.ThemeManager.theme["CTk"]["fg_color"]
+
+    def _apply_ttk_style_colors(self, mode_string):
+        """(Re)applies the CTk theme colours for the given appearance mode; called by the CTk AppearanceModeTracker."""
+        theme = ctk.ThemeManager.theme
+        bg_color = self._resolve_color(self._master_bg_color(), mode_string)
+        entry_bg = self._resolve_color(theme["CTkEntry"]["fg_color"], mode_string)
+        entry_border = self._resolve_color(theme["CTkEntry"]["border_color"], mode_string)
+        text_color = self._resolve_color(theme["CTkEntry"]["text_color"], mode_string)
+        disabled_text = self._resolve_color(theme["CTkEntry"]["placeholder_text_color"], mode_string)
+
+        style = ttk.Style(self)
+        style.configure("ScanParams.TEntry", fieldbackground=entry_bg, foreground=text_color,
+                        bordercolor=entry_border, lightcolor=entry_border, darkcolor=entry_border,
+                        insertcolor=text_color, padding=3)
+        style.map("ScanParams.TEntry", foreground=[("disabled", disabled_text)],
+                  fieldbackground=[("disabled", bg_color)])
+        style.configure("ScanParams.TCheckbutton", background=bg_color, foreground=text_color)
+        style.map("ScanParams.TCheckbutton", background=[("active", bg_color)],
+                  foreground=[("disabled", disabled_text)])
+
+    def destroy(self):
+        ctk.AppearanceModeTracker.remove(self._apply_ttk_style_colors)
+        super().destroy()
+
     def browse_directory(self):
         """Opens a dialog to select the save directory."""
         directory = filedialog.askdirectory()
@@ -116,13 +209,25 @@ class ScanParamsFrame(ctk.CTkFrame):
             self.save_dir_var.set(directory) # Update the StringVar
             logging.info(f"Save directory selected: {directory}")
 
+    def _on_save_dir_changed(self, *args):
+        """Debounces the save directory check so typing does not stat the path on every keystroke."""
+        if self._save_dir_check_job is not None:
+            self.after_cancel(self._save_dir_check_job)
+        self._save_dir_check_job = self.after(self.SAVE_DIR_DEBOUNCE_MS, self._validate_save_dir)
+
+    def _validate_save_dir(self):
+        """Checks the current save directory and caches the result for get_scan_parameters."""
+        self._save_dir_check_job = None
+        save_dir = self.save_dir_var.get()
+        self._save_dir_valid = bool(save_dir) and os.path.isdir(save_dir)
+
     def get_scan_parameters(self):
         """Retrieves and validates scan parameters from the GUI."""
         params = {}
         try:
-            params['start_angle'] = float(self.start_angle_entry.get() or 0.0)
-            params['end_angle'] = float(self.end_angle_entry.get() or 360.0)
-            params['step_angle'] = float(self.step_angle_entry.get() or 5.0)
+            params['start_angle'] = float(self.start_angle_var.get() or 0.0)
+            params['end_angle'] = float(self.end_angle_var.get() or 360.0)
+            params['step_angle'] = float(self.step_angle_var.get() or 5.0)
             if params['step_angle'] == 0: raise ValueError("Step angle cannot be zero")
 
             params['add_position_to_filename'] = bool(self.add_position_checkbox_var.get())
@@ -130,6 +235,17 @@ class ScanParamsFrame(ctk.CTkFrame):
             if params['start_angle'] == params['end_angle']:
                 raise ValueError("Start and End angles cannot be the same")
 
+            # --- Build the angle grid once; ScanLogic iterates over it directly ---
+            from scan_logic import ScanLogic # Deferred: only needed once parameters are validated
+            start, end, step = params['start_angle'], params['end_angle'], params['step_angle']
+            if (end - start) / step < 0:
+                raise ValueError("Step size sign does not match the scan direction")
+            if abs(end - start) / abs(step) > self.MAX_SCAN_STEPS:
+                raise ValueError(f"Scan would exceed {self.MAX_SCAN_STEPS} steps")
+            angles = ScanLogic.angle_grid(start, end, step)
+            params['angles'] = angles
+            params['n_steps'] = angles.size
+
             # --- Get filename from ManualControlFrame ---
             if self.manual_control_frame and hasattr(self.manual_control_frame, 'lf_set_filename_var'):
                 base_filename = self.manual_control_frame.lf_set_filename_var.get()
@@ -145,17 +261,22 @@ class ScanParamsFrame(ctk.CTkFrame):
 
             # --- Get Save Directory ---
             save_dir = self.save_dir_var.get()
+            if self._save_dir_check_job is not None:
+                # Edited within the debounce window; check now instead of using a stale result
+                self.after_cancel(self._save_dir_check_job)
+                self._validate_save_dir()
             if not save_dir:
                 # Default to current directory or raise error if required
                 save_dir = "."
                 logging.warning("Save directory is empty, defaulting to current directory.")
                 # Optionally update status bar: self.update_status("Warning: Save directory empty.", error=True)
-            elif not os.path.isdir(save_dir):
+            elif not self._save_dir_valid:
                 raise ValueError(f"Save directory does not exist: {save_dir}")
             params['save_directory'] = save_dir
             # --- End Get Save Directory ---
 
             # --- Get Plotting Options ---
+            params['save_hdf5'] = bool(self.save_hdf5_checkbox_var.get())
             params['plot_live_spectrum'] = bool(self.plot_live_checkbox_var.get())
             params['plot_dynamic_intensity'] = bool(self.plot_intensity_checkbox_var.get())
             # --- End Get Plotting Options ---
@@ -165,8 +286,8 @@ class ScanParamsFrame(ctk.CTkFrame):
             params['wavelength_max'] = None
             if params['plot_dynamic_intensity']:
                 try:
-                    min_str = self.wavelength_min_entry.get()
-                    max_str = self.wavelength_max_entry.get()
+                    min_str = self.wavelength_min_var.get()
+                    max_str = self.wavelength_max_var.get()
                     if not min_str or not max_str:
                         raise ValueError("Wavelength range entries cannot be empty if dynamic plot is enabled.")
                     wvl_min = float(min_str)
@@ -193,7 +314,7 @@ class ScanParamsFrame(ctk.CTkFrame):
         logging.debug("Start Scan button clicked.") # Log button click
         logging.debug("Calling get_scan_parameters...") # Log before get params
         params = self.get_scan_parameters()
-        logging.debug(f"get_scan_parameters returned: {params}") # Log returned params
+        logging.debug("get_scan_parameters returned: %s", params) # Lazy: params only formatted if DEBUG is enabled
         if params:
             # print(f"Starting scan with parameters: {params}") # Already logged above
             self.update_status("Starting scan...")
@@ -266,35 +387,28 @@ class ScanParamsFrame(ctk.CTkFrame):
         self._set_param_widgets_state("normal")
 
     def _set_param_widgets_state(self, state="normal"):
-        """Enable/disable parameter entry widgets."""
-        widgets = [
-            self.start_angle_entry, self.end_angle_entry, self.step_angle_entry,
-            self.add_position_checkbox,
-            self.save_dir_entry, self.browse_button,
-            self.plot_live_checkbox,
-            self.plot_intensity_checkbox, # Add new checkbox
-            self.wavelength_min_entry, # Add new entry
-            self.wavelength_max_entry # Add new entry
-        ]
-        for widget in widgets:
-            # Don't disable wavelength entries if the checkbox is checked,
-            # unless the overall state is 'disabled' (scan running)
-            if widget in [self.wavelength_min_entry, self.wavelength_max_entry]:
-                if state == "normal" and not self.plot_intensity_checkbox_var.get():
-                    widget.configure(state="disabled") # Disable if checkbox is off and not scanning
-                else:
-                    widget.configure(state=state) # Follow overall state (normal/disabled)
+        """Enable/disable parameter entry widgets, skipping widgets already in the target state."""
+        wavelength_state = state
+        if state == "normal" and not self.plot_intensity_checkbox_var.get():
+            # Keep wavelength entries disabled if the checkbox is off and not scanning
+            wavelength_state = "disabled"
+        for widget in self._param_widgets:
+            if widget is self.wavelength_min_entry or widget is self.wavelength_max_entry:
+                self._apply_widget_state(widget, wavelength_state)
             else:
-                widget.configure(state=state) # Apply state to other widgets
+                self._apply_widget_state(widget, state)
+
+    def _apply_widget_state(self, widget, state):
+        """Configures widget state only if it differs from the last state applied."""
+        if self._param_widget_states.get(widget) != state:
+            widget.configure(state=state)
+            self._param_widget_states[widget] = state
 
     def _toggle_wavelength_entries(self):
         """Enable/disable wavelength entries based on the checkbox state."""
-        if self.plot_intensity_checkbox_var.get():
-            self.wavelength_min_entry.configure(state="normal")
-            self.wavelength_max_entry.configure(state="normal")
-        else:
-            self.wavelength_min_entry.configure(state="disabled")
-            self.wavelength_max_entry.configure(state="disabled")
+        state = "normal" if self.plot_intensity_checkbox_var.get() else "disabled"
+        self._apply_widget_state(self.wavelength_min_entry, state)
+        self._apply_widget_state(self.wavelength_max_entry, state)
 
     # --- New Helper Method for Button States ---
     def _set_button_states(self, scan_running: bool, scan_paused: bool):
@@ -1,11 +1,43 @@
 import customtkinter as ctk
 import tkinter as tk
-from datetime import datetime
+import collections
+import logging
+import queue
+import sys
+import time
+from functools import lru_cache
+
+# Log timestamps have one-second resolution, so the formatted string is reused within a second
+_ts_cache = (0, "") # (epoch second, formatted timestamp); replaced as a whole so any thread reads a matching pair
+
+def _log_timestamp() -> str:
+    """Returns the current local time as 'YYYY-mm-dd HH:MM:SS', formatting at most once per second."""
+    global _ts_cache
+    t = int(time.time())
+    cached_t, cached_text = _ts_cache
+    if t != cached_t:
+        cached_text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))
+        _ts_cache = (t, cached_text)
+    return cached_text
+
+@lru_cache(maxsize=4096)
+def _eta_text(total_seconds: int) -> str:
+    """Returns the 'ETA: mm:ss' label text for a whole number of seconds (memoized; ETAs repeat across ticks)."""
+    return f"ETA: {total_seconds // 60:02d}:{total_seconds % 60:02d}"
+
+# The two possible log line prefixes, interned so every entry shares the same objects
+_LOG_PREFIX_NONE = sys.intern("")
+_LOG_PREFIX_ERROR = sys.intern("ERROR: ")
+_LOG_TS_LEN = len("[YYYY-mm-dd HH:MM:SS] ") # Offset of the prefix within a formatted entry
 
 class StatusLogFrame(ctk.CTkFrame):
     """
     Frame for displaying status messages, progress bar, and a log history.
     """
+    MAX_LOG_LINES = 5000 # Oldest lines are trimmed beyond this
+    LOG_TRIM_SLACK = 500 # Trim this many extra lines, so trimming runs once per ~500 lines, not on every flush
+    UI_DRAIN_INTERVAL_MS = 50 # How often updates posted from any thread are applied to the widgets
+
     def __init__(self, master):
         super().__init__(master) # Use default fg_color from theme
 
@@ -18,6 +50,7 @@ class StatusLogFrame(ctk.CTkFrame):
         # --- Row 0: Status Bar ---
         self.status_label = ctk.CTkLabel(self, text="Status: Idle", anchor="w")
         self.status_label.grid(row=0, column=0, columnspan=3, padx=10, pady=(5, 2), sticky="ew")
+        self._last_status = ("Status: Idle", None) # (text, color) last shown, to skip no-op updates
 
         # --- Row 1: Progress Info ---
         self.progress_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -33,32 +66,120 @@ class StatusLogFrame(ctk.CTkFrame):
         self.progress_bar = ctk.CTkProgressBar(self.progress_frame)
         self.progress_bar.grid(row=0, column=0, sticky="ew")
         self.progress_bar.set(0) # Initial value
+        self._pending_progress = None # Latest (value, current_step, total_steps, eta_sec) not yet drawn
+        # Last rendered values (initial widget state), used to skip no-op configure() calls
+        self._last_progress_val = 0.0
+        self._last_spectra_text = "Spectra: - / -"
+        self._last_eta_text = "ETA: --:--"
 
 
         # --- Row 2: Log Text Area ---
         self.log_textbox = ctk.CTkTextbox(self, state="disabled", wrap="word", height=100) # Start disabled
         self.log_textbox.grid(row=2, column=0, columnspan=3, padx=10, pady=5, sticky="nsew")
+        self.log_textbox.tag_config("error", foreground="red") # Applied to error lines after each batch insert
 
         # --- Log Context Menu ---
         self.log_menu = tk.Menu(self.log_textbox, tearoff=0)
         self.log_menu.add_command(label="Copy", command=self.copy_log_selection)
         self.log_menu.add_command(label="Clear Log", command=self.clear_log)
         self.log_textbox.bind("<Button-3>", self.show_log_menu) # Right-click
+        self._copy_menu_index = 0 # Position of "Copy" in log_menu (indexing skips Tk's label lookup)
+        self._copy_enabled = None # Last state applied to the Copy entry
+
+        # --- Log Batching ---
+        # Entries are buffered and written in one insert per drain instead of one per message
+        self._log_buffer = collections.deque(maxlen=2000)
+        self._log_line_count = 0 # Lines currently held by the textbox
+
+        # --- Thread-safe Update Queue ---
+        # update_status/update_progress/log_message only post (kind, args) here, so they can be called
+        # from worker threads; _drain_ui_queue applies everything on the Tk thread every UI_DRAIN_INTERVAL_MS
+        self._ui_queue = queue.SimpleQueue()
+        self._drain_job = self.after(self.UI_DRAIN_INTERVAL_MS, self._drain_ui_queue)
 
         self.log_message("Application started.")
 
-    def update_status(self, message: str, error: bool = False):
-        """Updates the status label text and color."""
+    def destroy(self):
+        """Stops the update queue drain loop before destroying the frame."""
+        if self._drain_job is not None:
+            self.after_cancel(self._drain_job)
+            self._drain_job = None
+        super().destroy()
+
+    def _drain_ui_queue(self):
+        """
+        Applies all posted updates: only the latest status label, progress and ETA,
+        and all log entries (including logged statuses) in one insert.
+        """
+        try:
+            last_status = None
+            last_eta = None
+            try:
+                while True:
+                    kind, args = self._ui_queue.get_nowait()
+                    if kind == "log":
+                        self._log_buffer.append(args)
+                    elif kind == "progress":
+                        self._pending_progress = args
+                    elif kind == "status":
+                        message, error, log_entry = args
+                        if log_entry is not None:
+                            self._log_buffer.append(log_entry) # Also log status updates
+                        last_status = (message, error)
+                    elif kind == "eta":
+                        last_eta = args
+                    elif kind == "scan": # Transient status + progress, posted together by the scan loop
+                        message, *progress = args
+                        last_status = (message, False)
+                        self._pending_progress = tuple(progress)
+            except queue.Empty:
+                pass
+            if last_status is not None:
+                self._apply_status(*last_status)
+            if self._pending_progress is not None:
+                self._apply_progress()
+            if last_eta is not None:
+                self._set_eta_text(last_eta)
+            if self._log_buffer:
+                self._flush_log()
+        except Exception:
+            logging.exception("Failed to apply queued status/log updates:")
+        finally:
+            # Always re-arm: an exception in one update must not stop all later status and log updates
+            self._drain_job = self.after(self.UI_DRAIN_INTERVAL_MS, self._drain_ui_queue)
+
+    def update_status(self, message: str, error: bool = False, log: bool = True):
+        """
+        Updates the status label text and color. Safe to call from any thread.
+
+        Args:
+            message (str): Status text.
+            error (bool): Show in red and prefix the log entry with ERROR.
+            log (bool): Also add the message to the log history. Pass False for
+                        transient per-step status (e.g., "Step 3/72: Moving to ...").
+        """
+        # The log entry is formatted here so its timestamp is the post time, like log_message()
+        log_entry = self._format_log_entry(message, error) if log else None
+        self._ui_queue.put(("status", (message, error, log_entry)))
+
+    def _apply_status(self, message: str, error: bool):
+        """Shows a posted status on the label (Tk thread only)."""
         # Determine color based on theme (simple example)
         # default_color = ctk.ThemeManager.theme["CTkLabel"]["text_color"] # Get default color
         # status_color = "red" if error else default_color[1] # Use dark mode color index [1]
         status_color = "red" if error else "gray" # Simpler fixed colors
-        self.status_label.configure(text=f"Status: {message}", text_color=status_color)
-        self.log_message(message, is_error=error) # Also log status updates
+        status_text = f"Status: {message}"
+        if (status_text, status_color) != self._last_status:
+            self.status_label.configure(text=status_text, text_color=status_color)
+            self._last_status = (status_text, status_color)
 
     def update_progress(self, value: float, current_step: int | None = None, total_steps: int | None = None, eta_sec: float | None = None):
         """
-        Updates the progress bar and related labels.
+        Updates the progress bar and related labels. Safe to call from any thread.
+
+        Only the newest state posted before the next drain is rendered; _apply_progress then
+        reconfigures the bar and both labels together so Tk repaints them in a single idle pass.
+        Do not call update_idletasks() here.
 
         Args:
             value (float): Progress bar value (0.0 to 1.0).
@@ -66,48 +187,104 @@ class StatusLogFrame(ctk.CTkFrame):
             total_steps (int | None): Total number of steps (optional).
             eta_sec (float | None): Estimated time remaining in seconds (optional).
         """
-        clamped_value = max(0.0, min(1.0, value)) # Ensure value is within range
-        self.progress_bar.set(clamped_value)
+        self._ui_queue.put(("progress", (value, current_step, total_steps, eta_sec)))
+
+    def update_scan_state(self, message: str, value: float, current_step: int | None = None, total_steps: int | None = None, eta_sec: float | None = None):
+        """
+        update_status(message, log=False) and update_progress(...) as a single queued update.
+        Safe to call from any thread; used by the scan loop once per step.
+        """
+        self._ui_queue.put(("scan", (message, value, current_step, total_steps, eta_sec)))
+
+    def _apply_progress(self):
+        """Renders the most recent progress state (called from _drain_ui_queue)."""
+        if self._pending_progress is None:
+            return
+        value, current_step, total_steps, eta_sec = self._pending_progress
+        self._pending_progress = None
 
+        clamped_value = max(0.0, min(1.0, value)) # Ensure value is within range
         if current_step is not None and total_steps is not None:
-            self.spectra_measured_label.configure(text=f"Spectra: {current_step} / {total_steps}")
+            spectra_text = f"Spectra: {current_step} / {total_steps}"
         else:
-            self.spectra_measured_label.configure(text="Spectra: - / -")
-
+            spectra_text = "Spectra: - / -"
         if eta_sec is not None and eta_sec >= 0:
-            minutes = int(eta_sec // 60)
-            seconds = int(eta_sec % 60)
-            self.time_remaining_label.configure(text=f"ETA: {minutes:02d}:{seconds:02d}")
+            eta_text = _eta_text(int(eta_sec))
         else:
-            self.time_remaining_label.configure(text="ETA: --:--")
+            eta_text = "ETA: --:--"
+
+        # Touch only the widgets whose rendered value actually changed
+        if clamped_value != self._last_progress_val:
+            self.progress_bar.set(clamped_value)
+            self._last_progress_val = clamped_value
+        if spectra_text != self._last_spectra_text:
+            self.spectra_measured_label.configure(text=spectra_text)
+            self._last_spectra_text = spectra_text
+        self._set_eta_text(eta_text)
+
+    def update_eta(self, eta_string: str):
+        """Sets the ETA label text directly (e.g., "ETA: 01:23"). Safe to call from any thread."""
+        self._ui_queue.put(("eta", eta_string))
+
+    def _set_eta_text(self, eta_text: str):
+        """Writes the ETA label if its text changed (Tk thread only)."""
+        if eta_text != self._last_eta_text:
+            self.time_remaining_label.configure(text=eta_text)
+            self._last_eta_text = eta_text
 
 
     def log_message(self, message: str, is_error: bool = False):
-        """Adds a timestamped message to the log text area."""
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{now}] {'ERROR: ' if is_error else ''}{message}\n"
+        """Queues a timestamped message for the log text area. Safe to call from any thread."""
+        self._ui_queue.put(("log", self._format_log_entry(message, is_error)))
+
+    @staticmethod
+    def _format_log_entry(message, is_error: bool) -> str:
+        """Builds one log line (message may be any object); callers run this when the message is posted, not when it is drawn."""
+        prefix = _LOG_PREFIX_ERROR if is_error else _LOG_PREFIX_NONE
+        return "".join(("[", _log_timestamp(), "] ", prefix, str(message), "\n"))
+
+    def _flush_log(self):
+        """Writes all buffered log entries to the text area in a single insert, then tags the error lines."""
+        if not self._log_buffer:
+            return
+        # Line ranges of error entries, relative to the first inserted line (entries may span lines)
+        error_ranges = []
+        line = 0
+        for entry in self._log_buffer:
+            n_lines = entry.count("\n")
+            if entry.startswith(_LOG_PREFIX_ERROR, _LOG_TS_LEN):
+                error_ranges.append((line, line + n_lines))
+            line += n_lines
+        batch = "".join(self._log_buffer)
+        self._log_buffer.clear()
+        first_line = self._log_line_count + 1 # Text indices are 1-based; inserts go before the final newline
 
+        # Only follow the tail if the view is already at the bottom; scrolling a view the
+        # user has moved away from forces an extra layout pass and yanks their position
+        follow_tail = self.log_textbox.yview()[1] >= 1.0
         self.log_textbox.configure(state="normal") # Enable writing
-        self.log_textbox.insert(tk.END, log_entry)
-        self.log_textbox.see(tk.END) # Scroll to the bottom
+        self.log_textbox.insert(tk.END, batch)
+        for start, end in error_ranges:
+            self.log_textbox.tag_add("error", f"{first_line + start}.0", f"{first_line + end}.0")
+        self._log_line_count += line
+        if self._log_line_count > self.MAX_LOG_LINES:
+            # Trim the oldest lines so the widget's size (and redraw cost) stays bounded
+            keep = self.MAX_LOG_LINES - self.LOG_TRIM_SLACK
+            excess = self._log_line_count - keep
+            self.log_textbox.delete("1.0", f"{excess + 1}.0")
+            self._log_line_count = keep
+        if follow_tail:
+            self.log_textbox.see(tk.END) # Scroll to the bottom
         self.log_textbox.configure(state="disabled") # Disable writing
 
     def show_log_menu(self, event):
         """Shows the right-click context menu for the log."""
         try:
-            # Select text under cursor if none selected
-            if not self.log_textbox.tag_ranges("sel"):
-                # Find the word under the cursor
-                index = self.log_textbox.index(f"@{event.x},{event.y}")
-                # Basic word selection (might need refinement)
-                # self.log_textbox.tag_add("sel", f"{index} wordstart", f"{index} wordend")
-                pass # Simple copy/clear doesn't strictly need selection pre-population
-
-            # Enable/disable Copy based on selection
-            if self.log_textbox.tag_ranges("sel"):
-                self.log_menu.entryconfigure("Copy", state="normal")
-            else:
-                self.log_menu.entryconfigure("Copy", state="disabled")
+            # Enable/disable Copy based on selection, only when that actually changes
+            enabled = bool(self.log_textbox.tag_ranges("sel"))
+            if enabled != self._copy_enabled:
+                self.log_menu.entryconfigure(self._copy_menu_index, state="normal" if enabled else "disabled")
+                self._copy_enabled = enabled
 
             self.log_menu.tk_popup(event.x_root, event.y_root)
         finally:
@@ -130,9 +307,11 @@ class StatusLogFrame(ctk.CTkFrame):
 
     def clear_log(self):
         """Clears all text from the log text area."""
+        self._log_buffer.clear() # Drop entries not yet written
         self.log_textbox.configure(state="normal")
         self.log_textbox.delete("1.0", tk.END)
         self.log_textbox.configure(state="disabled")
+        self._log_line_count = 0
         self.log_message("Log cleared.")
 
 
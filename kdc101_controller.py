@@ -3,6 +3,9 @@ import os
 import sys
 import logging
 import math # For isnan
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 # --- Pythonnet Setup ---
 try:
@@ -12,7 +15,7 @@ except ImportError:
     logging.error("pythonnet (clr) not found. Please install it: pip install pythonnet")
     PYTHONNET_LOADED = False
 except Exception as e:
-    logging.exception(f"Error importing clr: {e}")
+    logging.exception("Error importing clr: %s", e)
     PYTHONNET_LOADED = False
 
 # --- Kinesis CLI Configuration ---
@@ -22,9 +25,27 @@ DEVICE_MANAGER_DLL = "Thorlabs.MotionControl.DeviceManagerCLI.dll"
 GENERIC_MOTOR_DLL = "Thorlabs.MotionControl.GenericMotorCLI.dll"
 KCUBE_DCSERVO_DLL = "Thorlabs.MotionControl.KCube.DCServoCLI.dll"
 
-# --- Load Kinesis DLLs ---
+# --- Load Kinesis DLLs (lazily) ---
+# Adding the assembly references and importing the .NET types can take seconds, so it is not done on the
+# importing thread. A background thread warms the DLLs up at import; _ensure_kinesis_loaded() (called from
+# _check_prerequisites) waits for that load or performs it if it has not run yet.
 KINESIS_DLL_LOAD_SUCCESS = False
-if PYTHONNET_LOADED:
+DeviceManagerCLI = None
+SimulationManager = None
+DeviceConfiguration = None
+GenericMotorCLI = None
+MotorDirection = None
+KCubeDCServo = None
+Decimal = None
+Action = None
+UInt64 = None
+_kinesis_load_lock = threading.Lock()
+_kinesis_load_attempted = False
+
+def _load_kinesis():
+    """Adds references to the Kinesis DLLs and imports the required .NET types into module globals."""
+    global KINESIS_DLL_LOAD_SUCCESS, DeviceManagerCLI, SimulationManager, DeviceConfiguration
+    global GenericMotorCLI, MotorDirection, KCubeDCServo, Decimal, Action, UInt64
     try:
         # Check if Kinesis path exists
         if not os.path.isdir(KINESIS_PATH):
@@ -39,6 +60,8 @@ if PYTHONNET_LOADED:
         if not os.path.isfile(generic_motor_dll_path): raise FileNotFoundError(f"{GENERIC_MOTOR_DLL} not found at {generic_motor_dll_path}")
         if not os.path.isfile(kcube_dll_path): raise FileNotFoundError(f"{KCUBE_DCSERVO_DLL} not found at {kcube_dll_path}")
 
+        if hasattr(clr, 'setPreload'): # pythonnet 2.x only
+            clr.setPreload(False) # Skip preloading every namespace of the referenced assemblies
         clr.AddReference(dll_path)
         clr.AddReference(generic_motor_dll_path)
         clr.AddReference(kcube_dll_path)
@@ -50,24 +73,54 @@ if PYTHONNET_LOADED:
         from Thorlabs.MotionControl.GenericMotorCLI import GenericMotorCLI, MotorDirection
         from Thorlabs.MotionControl.KCube.DCServoCLI import KCubeDCServo
         from System import Decimal # For .NET decimal type
+        from System import Action, UInt64 # For Kinesis move-completion callbacks (Action<UInt64>)
 
         KINESIS_DLL_LOAD_SUCCESS = True
 
     except FileNotFoundError as e:
-        logging.error(f"Kinesis DLL loading failed: {e}")
-        logging.error(f"Please ensure Kinesis is installed at: {KINESIS_PATH}")
+        logging.error("Kinesis DLL loading failed: %s", e)
+        logging.error("Please ensure Kinesis is installed at: %s", KINESIS_PATH)
     except Exception as e:
-        logging.exception(f"Failed to load Kinesis DLLs or import classes: {e}")
+        logging.exception("Failed to load Kinesis DLLs or import classes: %s", e)
         # Ensure namespaces are None on failure
         DeviceManagerCLI = None
         KCubeDCServo = None
         GenericMotorCLI = None
         Decimal = None
-else:
-    DeviceManagerCLI = None
-    KCubeDCServo = None
-    GenericMotorCLI = None
-    Decimal = None
+
+def _ensure_kinesis_loaded() -> bool:
+    """Loads the Kinesis DLLs on first call (thread-safe) and returns whether they are available."""
+    global _kinesis_load_attempted
+    with _kinesis_load_lock:
+        if not _kinesis_load_attempted:
+            _kinesis_load_attempted = True
+            if PYTHONNET_LOADED:
+                _load_kinesis()
+    return KINESIS_DLL_LOAD_SUCCESS
+
+if PYTHONNET_LOADED:
+    # Warm the DLLs up in the background so they are usually ready by the time Connect is clicked
+    threading.Thread(target=_ensure_kinesis_loaded, name="KinesisPreload", daemon=True).start()
+
+
+def _wait_until(predicate, timeout_ms: int, poll_ms: int = 10) -> bool:
+    """Polls predicate() every poll_ms until it is truthy or timeout_ms elapses. Returns the last result."""
+    deadline = time.monotonic() + timeout_ms / 1000.0
+    while not predicate():
+        if time.monotonic() >= deadline:
+            return bool(predicate())
+        time.sleep(poll_ms / 1000.0)
+    return True
+
+
+# Shared worker pool for move_to_async, so a move can overlap other work (and several stages can move at once)
+_MOVE_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="KDC101Move")
+
+
+@lru_cache(maxsize=1024)
+def _to_decimal(value: float):
+    """Converts a float to a .NET System.Decimal, reusing earlier conversions (scans revisit the same angles)."""
+    return Decimal(value)
 
 
 class KDC101Controller:
@@ -76,28 +129,72 @@ class KDC101Controller:
     """
     # Default timeouts (in milliseconds)
     DEFAULT_POLLING_RATE = 250
-    DEFAULT_TIMEOUT_SETTINGS = 5000
-    DEFAULT_TIMEOUT_MOVE = 60000 # 60 seconds
+    # Used when ADAPTIVE_POLLING is on: fast device status updates while moving, slow ones while idle
+    MOVE_POLLING_RATE = 50
+    IDLE_POLLING_RATE = 500
+    ADAPTIVE_POLLING = False
+    DEFAULT_TIMEOUT_MOVE = 60000 # 60 seconds (homing)
+    # move_to timeout is estimated from the move profile:
+    # max(MIN, 2 * (|delta| / v_max + v_max / accel) + status polling interval + MARGIN)
+    MOVE_TIMEOUT_MIN_MS = 2000
+    MOVE_TIMEOUT_MARGIN_MS = 1000 # Settling / callback dispatch allowance on top of the profile estimate
+    MOVE_TIMEOUT_FALLBACK_MS = 30000 # Used when max velocity or acceleration is unknown
+    SETTINGS_INIT_TIMEOUTS_MS = (2000, 4000) # Successive WaitForSettingsInitialized attempts
+    # Upper bounds for the state polls in connect() (they return as soon as the state is reached)
+    CONNECT_WAIT_MS = 2000
+    POLLING_START_WAIT_MS = 2000
+    ENABLE_WAIT_MS = 3000
+    CONNECTION_CHECK_TTL_S = 0.1 # is_connected() reuses its last CLR query result for this long
+    DEVICE_LIST_TTL_S = 30.0 # How long a scan_devices() result is reused (shared by all instances)
+    _device_cache = None # (time.monotonic(), [serials]) from the last BuildDeviceList
+    WARMUP_READS = 3 # Status reads issued after connect so the first scan step doesn't pay first-call costs
+    MOVE_STATUS_RECHECK_S = 0.5 # wait_for_move re-reads Status at this interval for moves not started by us
 
     def __init__(self):
         self.device: KCubeDCServo = None # Type hint for the device object
         self.serial_no: str = None
         self._is_connected_and_initialized = False
-
-        if not PYTHONNET_LOADED or not KINESIS_DLL_LOAD_SUCCESS:
-            logging.error("KDC101 Controller initialized but pythonnet/Kinesis DLLs failed to load.")
+        self._conn_cache_ts = 0.0 # time.monotonic() of the last real IsConnected/IsSettingsInitialized query
+        # Set by the Kinesis completion callback (Action<UInt64>) of moves issued with _move_complete_callback;
+        # starts set because no move is pending
+        self._move_done = threading.Event()
+        self._move_done.set()
+        self._move_complete_callback = None # .NET delegate, created on connect
+        self._vel_params_cache = {} # (min, acc, max) -> prepared VelocityParameters struct for this device
+        self._polling_rate_ms = None # Rate passed to the last StartPolling, None when not polling
+        # Bound .NET methods resolved once per connection (skips the proxy attribute lookup per move)
+        self._moveto = None
+        self._home = None
+        self._simulating = False # True while connected through the Kinesis SimulationManager
+        self._max_vel = None # Max velocity (deg/s) last read from or written to the device
+        self._accel = None # Acceleration (deg/s^2) last read from or written to the device
+
+        if not PYTHONNET_LOADED:
+            # Kinesis DLLs themselves are loaded lazily; see _ensure_kinesis_loaded()
+            logging.error("KDC101 Controller initialized but pythonnet failed to load.")
             # Optionally raise an exception
             # raise RuntimeError("KDC101 pythonnet/Kinesis DLLs could not be loaded.")
 
     def _check_prerequisites(self):
-        """Checks if pythonnet and Kinesis DLLs/classes are loaded."""
+        """Checks if pythonnet and Kinesis DLLs/classes are loaded (loading the DLLs on first use)."""
+        _ensure_kinesis_loaded()
         if not PYTHONNET_LOADED or not KINESIS_DLL_LOAD_SUCCESS or not DeviceManagerCLI or not KCubeDCServo or not Decimal:
             raise RuntimeError("Kinesis DLLs/Classes not loaded. Cannot perform operation.")
         return True
 
-    def scan_devices(self) -> list[str]:
-        """Scans for connected Kinesis devices and returns a list of KDC101 serial numbers."""
+    def scan_devices(self, use_cache: bool = False) -> list[str]:
+        """
+        Scans for connected Kinesis devices and returns a list of KDC101 serial numbers.
+
+        Args:
+            use_cache (bool): Return the previous result if it is younger than DEVICE_LIST_TTL_S instead of
+                              re-enumerating every Thorlabs USB device (explicit user scans should pass False).
+        """
         self._check_prerequisites()
+        cache = KDC101Controller._device_cache
+        if use_cache and cache is not None and time.monotonic() - cache[0] < self.DEVICE_LIST_TTL_S:
+            logging.debug("Using cached KDC101 device list: %s", cache[1])
+            return list(cache[1])
         serial_numbers_list = []
         try:
             logging.info("Building Kinesis device list...")
@@ -107,32 +204,50 @@ class KDC101Controller:
 
             if serial_numbers is not None and serial_numbers.Count > 0:
                 serial_numbers_list = [str(sn) for sn in serial_numbers]
-                logging.info(f"Found KDC101 devices: {serial_numbers_list}")
+                logging.info("Found KDC101 devices: %s", serial_numbers_list)
             else:
                 logging.info("No KDC101 devices found.")
+            KDC101Controller._device_cache = (time.monotonic(), list(serial_numbers_list))
 
         except Exception as e:
-            logging.exception(f"An error occurred during Kinesis device scan: {e}")
+            logging.exception("An error occurred during Kinesis device scan: %s", e)
             # Fallback or re-raise depending on desired behavior
             # raise RuntimeError("Failed to scan Kinesis devices") from e
         return serial_numbers_list
 
-    def connect(self, serial_no: str) -> bool:
-        """Connects to the KDC101 device with the specified serial number."""
+    def connect(self, serial_no: str, polling_rate_ms: int | None = None, simulate: bool = False) -> bool:
+        """
+        Connects to the KDC101 device with the specified serial number.
+
+        Args:
+            serial_no (str): Device serial number.
+            polling_rate_ms (int | None): Device status polling interval; defaults to DEFAULT_POLLING_RATE
+                                          (IDLE_POLLING_RATE if ADAPTIVE_POLLING is enabled).
+            simulate (bool): Connect to a device created in the Kinesis Simulator instead of USB hardware
+                             (the serial must exist in the simulator configuration). For runs without
+                             Kinesis at all, use mock_hardware.MockKDC101Controller (main_app --mock).
+        """
+        if polling_rate_ms is None:
+            polling_rate_ms = self.IDLE_POLLING_RATE if self.ADAPTIVE_POLLING else self.DEFAULT_POLLING_RATE
         self._check_prerequisites()
         if not isinstance(serial_no, str):
             logging.error("Serial number must be a string.")
             return False
         if self.is_connected():
             if self.serial_no == serial_no:
-                logging.warning(f"Device {serial_no} is already connected.")
+                logging.warning("Device %s is already connected.", serial_no)
                 return True
             else:
-                logging.warning(f"Another device ({self.serial_no}) is connected. Disconnect first.")
+                logging.warning("Another device (%s) is connected. Disconnect first.", self.serial_no)
                 return False
 
         try:
-            logging.info(f"Attempting to connect to KDC101: {serial_no}...")
+            if simulate:
+                logging.info("Initializing Kinesis simulations...")
+                SimulationManager.Instance.InitializeSimulations()
+                self._simulating = True
+                DeviceManagerCLI.BuildDeviceList() # Simulated devices only appear after a rebuild
+            logging.info("Attempting to connect to KDC101: %s...", serial_no)
             # Create the device instance
             self.device = KCubeDCServo.CreateKCubeDCServo(serial_no)
             if self.device is None:
@@ -140,12 +255,14 @@ class KDC101Controller:
 
             # Connect to the device
             self.device.Connect(serial_no)
-            time.sleep(0.25) # Short pause after connect
+            _wait_until(lambda: self.device.IsConnected, self.CONNECT_WAIT_MS) # Instead of a fixed pause
 
-            # Wait for settings to be initialized
-            if not self.device.IsSettingsInitialized():
-                logging.info("Waiting for device settings to initialize...")
-                self.device.WaitForSettingsInitialized(self.DEFAULT_TIMEOUT_SETTINGS)
+            # Wait for settings to be initialized, starting short and backing off
+            for settings_timeout_ms in self.SETTINGS_INIT_TIMEOUTS_MS:
+                if self.device.IsSettingsInitialized():
+                    break
+                logging.info("Waiting for device settings to initialize (%s ms)...", settings_timeout_ms)
+                self.device.WaitForSettingsInitialized(settings_timeout_ms)
 
             if not self.device.IsSettingsInitialized():
                 logging.error("Device settings failed to initialize within timeout.")
@@ -162,35 +279,82 @@ class KDC101Controller:
             if motor_config is None:
                 logging.warning("LoadMotorConfiguration returned None. Using default settings might lead to incorrect behavior.")
             else:
-                logging.info(f"Motor configuration loaded. Device Settings Name: {motor_config.DeviceSettingsName}")
+                logging.info("Motor configuration loaded. Device Settings Name: %s", motor_config.DeviceSettingsName)
 
             # Start polling and enable the device
             logging.info("Starting polling and enabling device...")
-            self.device.StartPolling(self.DEFAULT_POLLING_RATE)
-            time.sleep(0.5) # Allow polling to start
+            self.device.StartPolling(polling_rate_ms)
+            self._polling_rate_ms = polling_rate_ms
+            _wait_until(lambda: self.device.IsSettingsInitialized(), self.POLLING_START_WAIT_MS) # Allow polling to start
             self.device.EnableDevice()
-            time.sleep(1.0) # Allow time for enable command
+            _wait_until(lambda: self.device.IsEnabled, self.ENABLE_WAIT_MS) # Allow time for enable command
 
             # Final check
             if not self.device.IsConnected or not self.device.IsEnabled:
                 raise RuntimeError("Device failed to connect or enable properly after commands.")
 
+            # Warm up the read paths (pythonnet accessor stubs, first device queries) so the first
+            # position read / move of a sweep isn't slower than the rest. No motion is commanded.
+            try:
+                for _ in range(self.WARMUP_READS):
+                    _ = self.device.Position
+                    _ = self.device.Status
+                    vel_params = self.device.GetVelocityParams()
+                self._max_vel = Decimal.ToDouble(vel_params.MaxVelocity) # For move timeout estimates
+                self._accel = Decimal.ToDouble(vel_params.Acceleration)
+            except Exception as warm_e:
+                logging.debug("KDC101 warm-up read failed (ignored): %s", warm_e)
+
+            # Create the move-completion delegate once per connection
+            self._move_complete_callback = Action[UInt64](self._on_move_completed)
+            self._moveto = self.device.MoveTo
+            self._home = self.device.Home
+            self._move_done.set()
+
             self.serial_no = serial_no
             self._is_connected_and_initialized = True
-            logging.info(f"KDC101 {serial_no} connected and enabled successfully.")
+            logging.info("KDC101 %s connected and enabled successfully.", serial_no)
             return True
 
         except Exception as e:
-            logging.exception(f"Failed to connect to KDC101 {serial_no}: {e}")
+            logging.exception("Failed to connect to KDC101 %s: %s", serial_no, e)
             if self.device:
                 try:
                     self.device.Disconnect(True)
                 except Exception as disc_e:
-                    logging.error(f"Error during disconnect after connection failure: {disc_e}")
+                    logging.error("Error during disconnect after connection failure: %s", disc_e)
             self.device = None
             self.serial_no = None
             self._is_connected_and_initialized = False
+            self._conn_cache_ts = 0.0
+            self._end_simulation()
+            return False
+
+    def _end_simulation(self):
+        """Shuts down Kinesis simulations if this controller started them."""
+        if not self._simulating:
+            return
+        self._simulating = False
+        try:
+            SimulationManager.Instance.UninitializeSimulations()
+            logging.info("Kinesis simulations uninitialized.")
+        except Exception as e:
+            logging.warning("Error uninitializing Kinesis simulations: %s", e)
+
+    def connect_direct(self, serial_no: str) -> bool:
+        """
+        Connects to a known serial number without enumerating devices first.
+        Falls back to building the device list (cached for DEVICE_LIST_TTL_S) and retrying once
+        only if the direct attempt fails.
+        """
+        if self.connect(serial_no):
+            return True
+        logging.info("Direct connect to %s failed; building device list and retrying...", serial_no)
+        devices = self.scan_devices(use_cache=True)
+        if serial_no not in devices:
+            logging.error("KDC101 %s not found in device list: %s", serial_no, devices)
             return False
+        return self.connect(serial_no)
 
     def disconnect(self) -> bool:
         """Disconnects the currently connected KDC101 device."""
@@ -199,7 +363,7 @@ class KDC101Controller:
             return False # Already disconnected
 
         try:
-            logging.info(f"Disconnecting KDC101: {self.serial_no}...")
+            logging.info("Disconnecting KDC101: %s...", self.serial_no)
             if self.device:
                 # Attempt to stop polling, catching potential errors
                 try:
@@ -209,7 +373,7 @@ class KDC101Controller:
                 except AttributeError:
                     logging.warning("'StopPolling' attribute/method not found, skipping.")
                 except Exception as poll_e:
-                    logging.warning(f"Error stopping polling: {poll_e}")
+                    logging.warning("Error stopping polling: %s", poll_e)
 
                 # Attempt to disable device
                 try:
@@ -222,17 +386,27 @@ class KDC101Controller:
                 except AttributeError:
                     logging.warning("'IsEnabled' or 'DisableDevice' attribute/method not found, skipping disable.")
                 except Exception as disable_e:
-                    logging.warning(f"Error disabling device: {disable_e}")
+                    logging.warning("Error disabling device: %s", disable_e)
 
                 # Disconnect the device
                 self.device.Disconnect(True) # Pass True to release resources
-                logging.info(f"Device {self.serial_no} disconnected.")
+                logging.info("Device %s disconnected.", self.serial_no)
             return True
         except Exception as e:
-            logging.exception(f"Error during KDC101 disconnection: {e}")
+            logging.exception("Error during KDC101 disconnection: %s", e)
             return False # Indicate disconnection failed
         finally:
             # Ensure state is updated even if errors occurred
+            self._move_complete_callback = None
+            self._move_done.set() # Release anyone still waiting on a move
+            self._conn_cache_ts = 0.0 # Invalidate the cached connection check
+            self._vel_params_cache.clear() # Structs belong to the disconnected device
+            self._polling_rate_ms = None
+            self._moveto = None
+            self._home = None
+            self._end_simulation()
+            self._max_vel = None
+            self._accel = None
             self.device = None
             self.serial_no = None
             self._is_connected_and_initialized = False
@@ -243,18 +417,22 @@ class KDC101Controller:
         # Simplify the check for GUI purposes. Primarily care if the device object exists,
         # is connected, and settings are initialized. Enabling might fail non-critically.
         if self.device is not None:
+            now = time.monotonic()
+            if now - self._conn_cache_ts < self.CONNECTION_CHECK_TTL_S:
+                return self._is_connected_and_initialized # Checked very recently; skip the CLR round-trip
             try:
                 # Check IsConnected and IsSettingsInitialized
                 is_conn = self.device.IsConnected
                 is_init = self.device.IsSettingsInitialized()
                 self._is_connected_and_initialized = is_conn and is_init
+                self._conn_cache_ts = now
                 # Optionally log the IsEnabled state if debugging enable issues
                 # if self._is_connected_and_initialized:
                 #     logging.debug(f"is_connected check: IsConnected={is_conn}, IsSettingsInitialized={is_init}, IsEnabled={self.device.IsEnabled}")
 
             except Exception as e:
                 # If checking status fails, assume not connected
-                logging.warning(f"Error checking KDC101 connection status: {e}")
+                logging.warning("Error checking KDC101 connection status: %s", e)
                 self._is_connected_and_initialized = False
         else:
             self._is_connected_and_initialized = False
@@ -264,43 +442,98 @@ class KDC101Controller:
         """Homes the KDC101 stage."""
         if not self.is_connected(): raise RuntimeError("KDC101 not connected.")
         try:
-            logging.info(f"Homing KDC101: {self.serial_no}...")
-            self.device.Home(self.DEFAULT_TIMEOUT_MOVE) # Use built-in timeout
-            logging.info(f"Homing complete for {self.serial_no}.")
+            logging.info("Homing KDC101: %s...", self.serial_no)
+            # Callback overload, like _move_to_decimal: wait in Python (GIL released) rather than in a blocking CLR call
+            self._move_done.clear()
+            self._home(self._move_complete_callback)
+            if not self._move_done.wait(self.DEFAULT_TIMEOUT_MOVE / 1000.0):
+                self._move_done.set()
+                raise TimeoutError(f"Homing did not complete within {self.DEFAULT_TIMEOUT_MOVE / 1000.0:.0f} s")
+            logging.info("Homing complete for %s.", self.serial_no)
         except Exception as e:
-            logging.exception(f"An error occurred during homing for {self.serial_no}:")
+            logging.exception("An error occurred during homing for %s:", self.serial_no)
             raise RuntimeError(f"Homing failed: {e}") from e
 
     def move_to(self, position_deg: float):
         """Moves the stage to the specified absolute position in degrees."""
         if not self.is_connected(): raise RuntimeError("KDC101 not connected.")
         try:
-            target_angle_dec = Decimal(position_deg) # Convert to .NET Decimal
-            logging.info(f"Moving KDC101 {self.serial_no} to {target_angle_dec}°...")
-            self.device.MoveTo(target_angle_dec, self.DEFAULT_TIMEOUT_MOVE) # Use built-in timeout
-            logging.info(f"Move to {target_angle_dec}° complete for {self.serial_no}.")
+            target_angle_dec = _to_decimal(position_deg) # Convert to .NET Decimal
+            logging.info("Moving KDC101 %s to %s°...", self.serial_no, target_angle_dec)
+            self._move_to_decimal(target_angle_dec)
+            logging.info("Move to %s° complete for %s.", target_angle_dec, self.serial_no)
         except ValueError as ve:
-            logging.error(f"Invalid angle format for move_to: {position_deg}")
+            logging.error("Invalid angle format for move_to: %s", position_deg)
             raise ValueError(f"Invalid angle: {position_deg}") from ve
+        except TimeoutError:
+            logging.error("Move to %s° timed out for %s.", position_deg, self.serial_no)
+            raise # Stuck axis: surface as TimeoutError, not a generic failure
         except Exception as e:
-            logging.exception(f"An error occurred during move_to for {self.serial_no}:")
+            logging.exception("An error occurred during move_to for %s:", self.serial_no)
             raise RuntimeError(f"MoveTo failed: {e}") from e
 
+    def set_polling_rate(self, polling_rate_ms: int):
+        """Restarts device status polling at the given interval (no-op if already polling at that rate)."""
+        if not self.is_connected(): raise RuntimeError("KDC101 not connected.")
+        if polling_rate_ms == self._polling_rate_ms:
+            return
+        try:
+            self.device.StopPolling()
+            self.device.StartPolling(int(polling_rate_ms))
+            self._polling_rate_ms = int(polling_rate_ms)
+            logging.debug("KDC101 %s polling rate set to %s ms.", self.serial_no, polling_rate_ms)
+        except Exception as e:
+            logging.exception("An error occurred setting polling rate for %s:", self.serial_no)
+            raise RuntimeError(f"SetPollingRate failed: {e}") from e
+
+    def _estimate_move_timeout_ms(self, target_dec) -> int:
+        """
+        Returns a move timeout scaled to the travel distance: twice the trapezoidal profile time
+        (|delta| / v_max + v_max / accel, an upper bound that also covers short triangular moves),
+        plus one status polling interval (the completion callback is driven by the status poll) and a margin.
+        """
+        if not self._max_vel or self._max_vel <= 0 or not self._accel or self._accel <= 0:
+            return self.MOVE_TIMEOUT_FALLBACK_MS
+        try:
+            delta_deg = abs(Decimal.ToDouble(target_dec) - Decimal.ToDouble(self.device.Position))
+        except Exception:
+            return self.MOVE_TIMEOUT_FALLBACK_MS
+        profile_ms = 1000.0 * (delta_deg / self._max_vel + self._max_vel / self._accel)
+        poll_ms = self._polling_rate_ms or self.DEFAULT_POLLING_RATE
+        return int(max(self.MOVE_TIMEOUT_MIN_MS, 2.0 * profile_ms + poll_ms + self.MOVE_TIMEOUT_MARGIN_MS))
+
+    def _move_to_decimal(self, target_dec):
+        """Moves to a .NET Decimal position and blocks until the Kinesis completion callback fires."""
+        timeout_ms = self._estimate_move_timeout_ms(target_dec)
+        if self.ADAPTIVE_POLLING:
+            self.set_polling_rate(self.MOVE_POLLING_RATE)
+        try:
+            # Non-blocking MoveTo overload; the calling thread sleeps on _move_done (GIL released) until
+            # Kinesis invokes the completion callback
+            self._move_done.clear()
+            self._moveto(target_dec, self._move_complete_callback)
+            if not self._move_done.wait(timeout_ms / 1000.0):
+                self._move_done.set() # Don't leave wait_for_move blocked on a move we gave up on
+                raise TimeoutError(f"Move did not complete within {timeout_ms / 1000.0:.1f} s")
+        finally:
+            if self.ADAPTIVE_POLLING:
+                self.set_polling_rate(self.IDLE_POLLING_RATE)
+
+    def move_to_async(self, position_deg: float):
+        """Starts move_to on the shared move pool and returns its concurrent.futures.Future."""
+        return _MOVE_EXECUTOR.submit(self.move_to, position_deg)
+
     def move_relative(self, displacement_deg: float):
         """Moves the stage by the specified relative displacement in degrees."""
         """Simulates relative move by getting current position and calling move_to."""
         if not self.is_connected(): raise RuntimeError("KDC101 not connected.")
-        logging.info(f"Simulating relative move for {self.serial_no} by {displacement_deg}°...")
-        print(f"--- DEBUG (kdc_controller.move_relative - SIMULATED): Received displacement_deg={displacement_deg} ---")
+        logging.info("Simulating relative move for %s by %s°...", self.serial_no, displacement_deg)
         try:
             # 1. Get the relative angle change as Decimal
-            displacement_dec = Decimal(displacement_deg)
-            print(f"--- DEBUG (kdc_controller.move_relative - SIMULATED): Converted displacement to Decimal: {displacement_dec} ---")
+            displacement_dec = _to_decimal(displacement_deg)
 
             # 2. Get the current position (returns float or NaN)
-            print("--- DEBUG (kdc_controller.move_relative - SIMULATED): Reading current position... ---")
             current_position_float = self.get_position()
-            print(f"--- DEBUG (kdc_controller.move_relative - SIMULATED): Read position: {current_position_float} ---")
 
             if math.isnan(current_position_float):
                 logging.error("Could not get current position. Cannot perform relative move.")
@@ -310,23 +543,22 @@ class KDC101Controller:
 
             # 3. Calculate the target absolute position
             target_position_dec = current_position_dec + displacement_dec
-            logging.info(f"Current: {current_position_dec}°, Change: {displacement_dec}°, Target: {target_position_dec}°")
-            print(f"--- DEBUG (kdc_controller.move_relative - SIMULATED): Calculated Target: {target_position_dec} ---")
+            logging.info("Current: %s°, Change: %s°, Target: %s°", current_position_dec, displacement_dec, target_position_dec)
 
             # 4. Move to the target absolute position using the existing move_to method
             # move_to handles the Decimal conversion and Kinesis call
-            self.move_to(float(str(target_position_dec))) # Convert back to float for move_to
+            self.move_to(Decimal.ToDouble(target_position_dec)) # Convert back to float for move_to (no str round-trip)
 
-            logging.info(f"Simulated relative move ({displacement_dec}°) complete for {self.serial_no}.")
+            logging.info("Simulated relative move (%s°) complete for %s.", displacement_dec, self.serial_no)
 
         except ValueError as ve:
-            logging.error(f"Invalid displacement format for move_relative: {displacement_deg}")
+            logging.error("Invalid displacement format for move_relative: %s", displacement_deg)
             raise ValueError(f"Invalid displacement: {displacement_deg}") from ve
         except RuntimeError as rt_e: # Catch errors from get_position or move_to
-            logging.error(f"Runtime error during simulated relative move: {rt_e}")
+            logging.error("Runtime error during simulated relative move: %s", rt_e)
             raise rt_e # Re-raise
         except Exception as e:
-            logging.exception(f"An unexpected error occurred during simulated move_relative for {self.serial_no}:")
+            logging.exception("An unexpected error occurred during simulated move_relative for %s:", self.serial_no)
             raise RuntimeError(f"Simulated MoveRelative failed: {e}") from e
 
     def get_position(self) -> float:
@@ -338,11 +570,12 @@ class KDC101Controller:
         try:
             # Position property directly returns Decimal
             position_dec = self.device.Position
-            position_float = float(str(position_dec))
-            logging.debug(f"KDC101 position: {position_float:.4f}° (Decimal: {position_dec})")
+            position_float = Decimal.ToDouble(position_dec) # Direct conversion, no intermediate string
+            if logging.getLogger().isEnabledFor(logging.DEBUG): # Polled several times a second; skip the call entirely
+                logging.debug("KDC101 position: %.4f° (Decimal: %s)", position_float, position_dec)
             return position_float
         except Exception as e:
-            logging.exception(f"An error occurred while getting position for {self.serial_no}:")
+            logging.exception("An error occurred while getting position for %s:", self.serial_no)
             # Return NaN on error to avoid crashing periodic updates
             return float('nan')
 
@@ -350,46 +583,67 @@ class KDC101Controller:
         """Sets the velocity parameters in degrees/sec and degrees/sec^2."""
         if not self.is_connected(): raise RuntimeError("KDC101 not connected.")
         try:
-            logging.info(f"Setting velocity params for {self.serial_no}: "
-                        f"MinVel={min_velocity_dps:.2f}, Accn={acceleration_dps2:.2f}, MaxVel={max_velocity_dps:.2f} (dps)")
-            # Get the device's current velocity parameters object
-            # The specific type comes from the device driver, not GenericMotorCLI directly
-            vel_params = self.device.GetVelocityParams()
-            logging.debug(f"Current velocity params type: {type(vel_params)}")
-            # Update attributes directly on the retrieved object
-            vel_params.MinVelocity = Decimal(min_velocity_dps)
-            vel_params.Acceleration = Decimal(acceleration_dps2)
-            vel_params.MaxVelocity = Decimal(max_velocity_dps)
+            logging.info("Setting velocity params for %s: MinVel=%.2f, Accn=%.2f, MaxVel=%.2f (dps)",
+                         self.serial_no, min_velocity_dps, acceleration_dps2, max_velocity_dps)
+            key = (min_velocity_dps, acceleration_dps2, max_velocity_dps)
+            vel_params = self._vel_params_cache.get(key)
+            if vel_params is None:
+                # Get the device's current velocity parameters object
+                # The specific type comes from the device driver, not GenericMotorCLI directly
+                vel_params = self.device.GetVelocityParams()
+                logging.debug("Current velocity params type: %s", type(vel_params))
+                # Update attributes directly on the retrieved object
+                vel_params.MinVelocity = _to_decimal(min_velocity_dps)
+                vel_params.Acceleration = _to_decimal(acceleration_dps2)
+                vel_params.MaxVelocity = _to_decimal(max_velocity_dps)
+                self._vel_params_cache[key] = vel_params # Reused for repeat configurations
             # Set the updated struct back to the device
             self.device.SetVelocityParams(vel_params)
+            self._max_vel = float(max_velocity_dps)
+            self._accel = float(acceleration_dps2)
             logging.info("Velocity parameters set successfully.")
         except ValueError as ve:
-            logging.error(f"Invalid value provided for velocity/acceleration: {ve}")
+            logging.error("Invalid value provided for velocity/acceleration: %s", ve)
             raise ValueError("Invalid velocity/acceleration value") from ve
         except Exception as e:
-            logging.exception(f"An error occurred setting velocity for {self.serial_no}:")
+            logging.exception("An error occurred setting velocity for %s:", self.serial_no)
             raise RuntimeError(f"SetVelocity failed: {e}") from e
 
+    def _on_move_completed(self, task_id):
+        """Kinesis completion callback (runs on a .NET thread); wakes wait_for_move."""
+        self._move_done.set()
+
     def wait_for_move(self, timeout_s: float = 30.0):
         """
-        Waits for the current move or home operation to complete by polling status.
-        Note: CLI MoveTo/Home methods are blocking, so this might be redundant
-            unless finer-grained status checking during the move is needed.
+        Waits for the current move or home operation to complete.
+        Moves issued with the completion callback wake this immediately via _move_done; Status is
+        only re-read every MOVE_STATUS_RECHECK_S to cover moves started elsewhere (e.g. the front panel).
+        Note: move_to()/home() issue the non-blocking callback overloads but themselves wait in Python
+        until the callback fires, so after them this returns on the first Status check; it only actually
+        waits for moves still in flight, e.g. one started with move_to_async().
         """
         if not self.is_connected(): raise RuntimeError("KDC101 not connected.")
-        logging.info(f"Waiting for move/home completion on {self.serial_no} (timeout={timeout_s}s)...")
-        start_time = time.time()
+        logging.info("Waiting for move/home completion on %s (timeout=%ss)...", self.serial_no, timeout_s)
+        deadline = time.monotonic() + timeout_s
         try:
-            while time.time() - start_time < timeout_s:
+            while True:
                 status = self.device.Status # Get the status object
                 if not status.IsMoving and not status.IsHoming:
-                    logging.info(f"Move/home appears complete for {self.serial_no}.")
+                    logging.info("Move/home appears complete for %s.", self.serial_no)
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                wait_s = min(remaining, self.MOVE_STATUS_RECHECK_S)
+                if self._move_done.is_set():
+                    time.sleep(wait_s) # No callback move pending (started elsewhere); recheck Status later
+                elif self._move_done.wait(wait_s): # Block until the completion callback fires
+                    logging.info("Move/home completion callback received for %s.", self.serial_no)
                     return True
-                time.sleep(0.1) # Polling interval
-            logging.warning(f"Wait for move timed out after {timeout_s}s for {self.serial_no}.")
+            logging.warning("Wait for move timed out after %ss for %s.", timeout_s, self.serial_no)
             raise TimeoutError(f"Move did not complete within {timeout_s} seconds.")
         except Exception as e:
-            logging.exception(f"Error while waiting for move on {self.serial_no}:")
+            logging.exception("Error while waiting for move on %s:", self.serial_no)
             raise RuntimeError(f"Wait for move failed: {e}") from e
 
 
@@ -397,7 +651,7 @@ class KDC101Controller:
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG) # Show more detail for testing
 
-    if not KINESIS_DLL_LOAD_SUCCESS:
+    if not _ensure_kinesis_loaded():
         print("\nKinesis DLLs failed to load. Cannot run hardware tests.")
         sys.exit(1)
 
@@ -2,8 +2,11 @@ import logging
 import os
 import sys
 import time
+import threading
 import numpy as np
 import typing
+import ctypes
+from concurrent.futures import ThreadPoolExecutor
 
 # --- Globals for .NET types (populated by load_dlls) ---
 clr = None
@@ -12,19 +15,98 @@ DeviceType = None
 ExperimentSettings = None
 CameraSettings = None
 SensorTemperatureStatus = None
+NetException = Exception # System.Exception once load_dlls has run; hot paths catch it first
+GCHandle = None # System.Runtime.InteropServices, used for bulk frame copies
+GCHandleType = None
+# Setting keys resolved once from CameraSettings/ExperimentSettings (populated by load_dlls)
+_EXPOSURE_KEY = None
+_TEMP_KEY = None
+_TEMP_STATUS_KEY = None
+_BASE_FILENAME_KEY = None
+_ACCUMULATIONS_KEY = None # Frames combined into one stored frame (None if this LightField lacks the setting)
+_FRAMES_KEY = None # Frames stored per acquisition
 PYTHONNET_LOADED = False
 LF_DLL_LOAD_SUCCESS = False # Tracks if DLLs/Namespaces loaded successfully
 
 # DLL names (V5) - Assuming V5 based on previous context
 AUTOMATION_DLL_V5 = "PrincetonInstruments.LightField.AutomationV5.dll"
 ADDIN_SUPPORT_DLL = "PrincetonInstruments.LightFieldAddInSupportServices.dll"
-VIEW_DLL_V5 = "PrincetonInstruments.LightFieldViewV5.dll" # Added based on working example
+VIEW_DLL_V5 = "PrincetonInstruments.LightFieldViewV5.dll" # Added based on working example; loaded on connect
+_VIEW_DLL_PATH = None # Full path to the View DLL, recorded by load_dlls
+_VIEW_DLL_LOADED = False
+
+# .NET element type name -> NumPy dtype for frame buffers
+_NET_TO_NUMPY_DTYPE = {
+    "UInt16": np.uint16,
+    "UInt32": np.uint32,
+    "Int16": np.int16,
+    "Int32": np.int32,
+    "Single": np.float32,
+    "Double": np.float64,
+}
+# LightField PixelDataFormat -> NumPy dtype (populated by load_dlls)
+_LF_DTYPE_MAP = {}
+
+def select_clr_runtime() -> str | None:
+    """
+    Loads the .NET runtime named by PYTHONNET_RUNTIME (e.g. "coreclr") before clr is first imported.
+    Must run before any `import clr` in the process (kdc101_controller imports it at module level).
+    The vendor Automation/Kinesis DLLs target .NET Framework, so netfx stays the default.
+    Returns the runtime name used, or None if the pythonnet default applies.
+    """
+    runtime = os.environ.get("PYTHONNET_RUNTIME")
+    if not runtime or "clr" in sys.modules:
+        return None
+    try:
+        from pythonnet import load # pythonnet >= 3.0
+        load(runtime)
+        logging.info("Loaded .NET runtime '%s' for pythonnet.", runtime)
+        return runtime
+    except Exception as e:
+        logging.warning("Could not load .NET runtime '%s', using pythonnet default: %s", runtime, e)
+        return None
+
+select_clr_runtime()
+
+_HOT_PATH_WARN_INTERVAL_S = 10.0 # At most one warning per key per interval from polled accessors
+_last_hot_path_warning: dict[tuple, float] = {}
+
+def _warn_throttled(key: tuple, msg: str, *args):
+    """Logs a warning unless one with the same key was logged in the last _HOT_PATH_WARN_INTERVAL_S."""
+    now = time.monotonic()
+    if now - _last_hot_path_warning.get(key, 0.0) >= _HOT_PATH_WARN_INTERVAL_S:
+        _last_hot_path_warning[key] = now
+        logging.warning(msg, *args)
+
+def _net_message(e) -> str:
+    """Short text for a .NET exception (its Message), without formatting the managed stack."""
+    return getattr(e, "Message", None) or str(e)
+
+def _dir_contents(path: str | None) -> set[str]:
+    """Returns the lower-cased file names in `path` from one directory listing (empty set if it can't be read)."""
+    if not path:
+        return set()
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name.lower() for entry in entries} # Windows names are case-insensitive
+    except OSError:
+        return set()
 
 class LightFieldController:
     """
     Controller class for Princeton Instruments LightField via Automation (pythonnet).
     Connects to a running LightField instance and controls basic experiment parameters/acquisition.
     """
+    # Fixed attribute layout: the hot paths read these on every parameter access
+    __slots__ = ('_automation', '_application', '_experiment', '_is_connected',
+                 '_completed_evt', '_completed_handler', '_completed_source', '_setting_meta', '_frame_buf',
+                 '_lf_exec', '_lf_thread_id', '_dlls_loaded', 'loaded_sdk_path')
+
+    ACQUIRE_TIMEOUT_MIN_S = 5.0 # Lower bound on the completion wait; scaled up to 2x the expected duration
+    ACQUIRE_TIMEOUT_FALLBACK_S = 300.0 # Completion wait when exposure, accumulations or frames can't be read
+    ACQUIRE_READOUT_ALLOWANCE_S = 0.5 # Readout/overhead budget per exposure when sizing the timeout
+    ACQUIRE_POLL_S = 0.005 # IsRunning poll interval when the ExperimentCompleted event is unavailable
+
     def __init__(self):
         """Initializes the controller state."""
         print("--- LFController __init__: START ---")
@@ -32,6 +114,13 @@ class LightFieldController:
         self._application = None
         self._experiment = None
         self._is_connected = False
+        self._completed_evt = threading.Event() # Set by the ExperimentCompleted handler
+        self._completed_handler = None
+        self._completed_source = None # Experiment the handler is subscribed on
+        self._setting_meta: dict[str, tuple[bool, bool]] = {} # setting name -> (exists, is_read_only)
+        self._frame_buf = None # Reusable output array for get_data(reuse_buffer=True)
+        self._lf_exec = None # Single "LFWorker" thread that makes every Automation call (see _call)
+        self._lf_thread_id = None
         self._dlls_loaded = LF_DLL_LOAD_SUCCESS # Use global flag for initial state
         self.loaded_sdk_path = None # Track which path was used for loading
         print(f"--- LFController __init__: Initial _dlls_loaded={self._dlls_loaded} ---")
@@ -44,13 +133,18 @@ class LightFieldController:
         Uses absolute paths for clr.AddReference when possible.
         """
         global clr, Automation, DeviceType, ExperimentSettings, CameraSettings, SensorTemperatureStatus
+        global GCHandle, GCHandleType, _VIEW_DLL_PATH, NetException
+        global _EXPOSURE_KEY, _TEMP_KEY, _TEMP_STATUS_KEY, _BASE_FILENAME_KEY, _ACCUMULATIONS_KEY, _FRAMES_KEY
         global PYTHONNET_LOADED, LF_DLL_LOAD_SUCCESS
 
         # --- 1. Check/Import pythonnet ---
         if not PYTHONNET_LOADED:
             try:
                 print("--- DEBUG (load_dlls): Attempting import clr...")
+                select_clr_runtime()
                 import clr
+                if hasattr(clr, 'setPreload'): # pythonnet 2.x only
+                    clr.setPreload(False) # Import only the types we ask for, not every namespace of each assembly
                 PYTHONNET_LOADED = True
                 print("--- DEBUG (load_dlls): import clr SUCCESS.")
             except ImportError:
@@ -87,10 +181,9 @@ class LightFieldController:
         # Check paths for required DLLs
         for source, path in search_paths:
             print(f"-- INFO: Checking path ({source}): {path}")
-            if path and os.path.isdir(path):
-                auto_dll_full = os.path.join(path, AUTOMATION_DLL_V5)
-                addin_dll_full = os.path.join(path, ADDIN_SUPPORT_DLL)
-                if os.path.isfile(auto_dll_full) and os.path.isfile(addin_dll_full):
+            names = _dir_contents(path) # One listing instead of an isdir/isfile stat per DLL
+            if names:
+                if AUTOMATION_DLL_V5.lower() in names and ADDIN_SUPPORT_DLL.lower() in names:
                     sdk_dll_directory_to_use = path
                     path_source = source
                     print(f"## SUCCESS: Found required LightField DLLs in {source}: {path}")
@@ -129,15 +222,8 @@ class LightFieldController:
             clr.AddReference(addin_dll_full) # Use full path
             print(f"--- DEBUG (load_dlls): clr.AddReference for AddInSupport SUCCESS.")
 
-            # Add View DLL reference
-            if os.path.exists(view_dll_full): # Check if it exists before adding
-                print(f"--- DEBUG (load_dlls): Attempting clr.AddReference('{view_dll_full}')...")
-                clr.AddReference(view_dll_full) # Use full path
-                print(f"--- DEBUG (load_dlls): clr.AddReference for ViewV5 SUCCESS.")
-            else:
-                # Log warning if View DLL is missing, might not be critical but good to know
-                print(f"--- WARNING (load_dlls): View DLL not found at '{view_dll_full}', skipping AddReference.")
-                logging.warning(f"View DLL not found at '{view_dll_full}', skipping AddReference.")
+            # View DLL reference is deferred to connect(), see _ensure_view_loaded
+            _VIEW_DLL_PATH = view_dll_full
 
             logging.info("Successfully added references to LightField V5 DLLs.")
 
@@ -165,6 +251,40 @@ class LightFieldController:
             CameraSettings = CameraSettings_mod
             SensorTemperatureStatus = SensorTemperatureStatus_mod
 
+            # Plain strings, so accessors skip pythonnet's static property lookup on every call
+            _EXPOSURE_KEY = str(CameraSettings.ShutterTimingExposureTime)
+            _TEMP_KEY = str(CameraSettings.SensorTemperatureReading)
+            _TEMP_STATUS_KEY = str(CameraSettings.SensorTemperatureStatus)
+            _BASE_FILENAME_KEY = str(ExperimentSettings.FileNameGenerationBaseFileName)
+            # Only used to size the acquire timeout; optional across LightField versions
+            accumulations_setting = getattr(ExperimentSettings, 'OnlineProcessingFrameCombinationFramesCombined', None)
+            frames_setting = getattr(ExperimentSettings, 'AcquisitionFramesToStore', None)
+            _ACCUMULATIONS_KEY = str(accumulations_setting) if accumulations_setting is not None else None
+            _FRAMES_KEY = str(frames_setting) if frames_setting is not None else None
+
+            # Frame pixel formats, so get_data picks the right dtype without guessing
+            try:
+                from PrincetonInstruments.LightField.AddIns import PixelDataFormat
+                _LF_DTYPE_MAP.clear()
+                for fmt_name, fmt_dtype in (("MonochromeUnsigned16", np.uint16),
+                                            ("MonochromeUnsigned32", np.uint32),
+                                            ("MonochromeFloating32", np.float32)):
+                    if hasattr(PixelDataFormat, fmt_name):
+                        _LF_DTYPE_MAP[getattr(PixelDataFormat, fmt_name)] = fmt_dtype
+            except ImportError:
+                logging.warning("PixelDataFormat enum not found in AddIns, get_data will infer dtype from the buffer.")
+
+            from System import Exception as NetException_mod
+            NetException = NetException_mod
+
+            # Interop types for pinning frame buffers in get_data (optional, list fallback otherwise)
+            try:
+                from System.Runtime.InteropServices import GCHandle as GCHandle_mod, GCHandleType as GCHandleType_mod
+                GCHandle = GCHandle_mod
+                GCHandleType = GCHandleType_mod
+            except ImportError:
+                logging.warning("System.Runtime.InteropServices not available, get_data will use slow list conversion.")
+
             LF_DLL_LOAD_SUCCESS = True
             self._dlls_loaded = True
             self.loaded_sdk_path = sdk_dll_directory_to_use
@@ -180,6 +300,23 @@ class LightFieldController:
             self.loaded_sdk_path = None
             return False
 
+    @staticmethod
+    def _ensure_view_loaded():
+        """Adds the ViewV5 DLL reference on first use rather than at startup (once per process)."""
+        global _VIEW_DLL_LOADED
+        if _VIEW_DLL_LOADED or not _VIEW_DLL_PATH:
+            return
+        _VIEW_DLL_LOADED = True
+        if os.path.exists(_VIEW_DLL_PATH): # Check if it exists before adding
+            try:
+                clr.AddReference(_VIEW_DLL_PATH) # Use full path
+                logging.debug("clr.AddReference for ViewV5 succeeded.")
+            except Exception as e:
+                logging.warning("clr.AddReference for View DLL '%s' failed: %s", _VIEW_DLL_PATH, e)
+        else:
+            # Log warning if View DLL is missing, might not be critical but good to know
+            logging.warning("View DLL not found at '%s', skipping AddReference.", _VIEW_DLL_PATH)
+
     def connect(self) -> bool:
         """
         Connects to an already running LightField application instance.
@@ -194,9 +331,11 @@ class LightFieldController:
             logging.warning("Already connected to LightField.")
             return True
 
+        self._start_worker()
         try:
             print("-- INFO: Attempting to connect to running LightField instance...")
             logging.info("Connecting to LightField Automation...")
+            self._ensure_view_loaded() # Automation may resolve View types when attaching
             # Use Automation(True, None) to attach to running instance
             self._automation = Automation(True, None)
             self._application = self._automation.LightFieldApplication
@@ -215,6 +354,8 @@ class LightFieldController:
                 self._application = None
                 return False
             print("-- INFO: Experiment object obtained.")
+            self._setting_meta.clear()
+            self._attach_completed_handler()
 
             # --- Verify Camera Presence ---
             print("-- INFO: Checking for camera device in current experiment context...")
@@ -250,6 +391,7 @@ class LightFieldController:
         except Exception as e:
             print(f"!! ERROR: Exception during connect: {e}")
             logging.exception("Failed to connect to LightField:")
+            self._detach_completed_handler()
             self._experiment = None
             self._application = None
             self._automation = None
@@ -265,6 +407,8 @@ class LightFieldController:
         # self._application = None
         # self._automation = None # Release reference
         self._is_connected = False # Still mark as disconnected internally
+        self._detach_completed_handler() # connect() creates a new Experiment; the handler must not stay on this one
+        self._setting_meta.clear()
         logging.info("LightField internal connection state set to False.")
         print("-- INFO: LightField internal connection state set to False.")
         return True
@@ -285,6 +429,12 @@ class LightFieldController:
         else:
             logging.warning("Dispose called but self._automation is None.")
         # Clear references after disposing
+        self._detach_completed_handler()
+        if self._lf_exec is not None:
+            self._lf_exec.shutdown(wait=False)
+            self._lf_exec = None
+            self._lf_thread_id = None
+        self._setting_meta.clear()
         self._experiment = None
         self._application = None
         self._automation = None
@@ -306,39 +456,69 @@ class LightFieldController:
         #     connected_state = False
         #     self._is_connected = False # Update internal state if ping fails
         #     logging.warning("LightField connection lost (ping failed).")
-        print(f"--- PRINT: Inside LightFieldController.is_connected, returning: {connected_state} ---")
         return connected_state
 
-    def _check_setting(self, setting_name) -> bool:
-        """Checks if a setting exists and is available."""
-        if not self.is_connected(): return False
+    # --- Worker Thread ---
+
+    def _start_worker(self):
+        """Creates the LFWorker thread once; it lives until dispose()."""
+        if self._lf_exec is not None:
+            return
+        def _record_thread_id():
+            self._lf_thread_id = threading.get_ident()
+        self._lf_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LFWorker",
+                                           initializer=_record_thread_id)
+
+    def _call(self, fn, *args):
+        """
+        Runs a (possibly blocking) Automation call on the LFWorker thread and returns its result.
+        The caller waits on the future with the GIL released. Calls already on the worker run inline.
+        """
+        if self._lf_exec is None or threading.get_ident() == self._lf_thread_id:
+            return fn(*args)
+        return self._lf_exec.submit(fn, *args).result()
+
+    def _setting_info(self, setting_name) -> tuple[bool, bool]:
+        """
+        Returns (exists, is_read_only) for a setting, querying LightField only on first access.
+        The cache is cleared on connect/disconnect.
+        """
+        meta = self._setting_meta.get(setting_name)
+        if meta is not None:
+            return meta
+        experiment = self._experiment
+        def _query():
+            exists = bool(experiment.Exists(setting_name))
+            return exists, (bool(experiment.IsReadOnly(setting_name)) if exists else False)
         try:
-            if self._experiment.Exists(setting_name):
-                # print(f"--- DEBUG: Setting '{setting_name}' exists.")
-                # is_avail = self._experiment.IsAvailable(setting_name)
-                # print(f"--- DEBUG: Setting '{setting_name}' available: {is_avail}.")
-                # is_ro = self._experiment.IsReadOnly(setting_name)
-                # print(f"--- DEBUG: Setting '{setting_name}' read-only: {is_ro}.")
-                # return is_avail # Check if available is more useful than just exists
-                return True # Just check existence for now
-            else:
-                # print(f"--- DEBUG: Setting '{setting_name}' does NOT exist.")
-                return False
+            exists, is_ro = self._call(_query)
+        except NetException as e:
+            _warn_throttled(("check", setting_name), "Error checking setting %s: %s", setting_name, _net_message(e))
+            return (False, False)
         except Exception as e:
-            print(f"!! ERROR: Checking setting '{setting_name}' failed: {e}")
-            logging.warning(f"Error checking setting {setting_name}: {e}")
-            return False
+            logging.warning("Error checking setting %s: %s", setting_name, e)
+            return (False, False) # Not cached, so a transient failure is retried
+        meta = (exists, is_ro)
+        self._setting_meta[setting_name] = meta
+        return meta
+
+    def _check_setting(self, setting_name) -> bool:
+        """Checks if a setting exists and is available."""
+        if not self._is_connected: return False # Plain flag; is_connected() is for callers outside the class
+        return self._setting_info(setting_name)[0]
 
     def _get_value(self, setting_name, default_value=None):
         """Safely gets a value from the experiment."""
         if self._check_setting(setting_name):
             try:
-                value = self._experiment.GetValue(setting_name)
+                value = self._call(self._experiment.GetValue, setting_name)
                 # print(f"--- DEBUG: GetValue '{setting_name}' -> {value} (Type: {type(value)})")
                 return value
+            except NetException as e:
+                _warn_throttled(("get", setting_name), "GetValue failed for %s: %s", setting_name, _net_message(e))
+                return default_value
             except Exception as e:
-                print(f"!! ERROR: GetValue for '{setting_name}' failed: {e}")
-                logging.error(f"GetValue failed for {setting_name}: {e}")
+                logging.error("GetValue failed for %s: %s", setting_name, e)
                 return default_value
         return default_value
 
@@ -346,129 +526,282 @@ class LightFieldController:
         """Safely sets a value in the experiment."""
         if self._check_setting(setting_name):
             try:
-                if self._experiment.IsReadOnly(setting_name):
-                    print(f"!! WARNING: Cannot set '{setting_name}', it is read-only.")
-                    logging.warning(f"Cannot set read-only setting: {setting_name}")
+                if self._setting_info(setting_name)[1]:
+                    logging.warning("Cannot set read-only setting: %s", setting_name)
                     return False
                 # print(f"--- DEBUG: SetValue '{setting_name}' = {value} (Type: {type(value)})")
-                self._experiment.SetValue(setting_name, value)
+                self._call(self._experiment.SetValue, setting_name, value)
                 return True
+            except NetException as e:
+                _warn_throttled(("set", setting_name), "SetValue failed for %s=%s: %s", setting_name, value, _net_message(e))
+                return False
             except Exception as e:
-                print(f"!! ERROR: SetValue for '{setting_name}' = {value} failed: {e}")
-                logging.error(f"SetValue failed for {setting_name}={value}: {e}")
+                logging.error("SetValue failed for %s=%s: %s", setting_name, value, e)
                 return False
         else:
-            print(f"!! WARNING: Cannot set '{setting_name}', setting does not exist.")
-            logging.warning(f"Cannot set non-existent setting: {setting_name}")
+            logging.warning("Cannot set non-existent setting: %s", setting_name)
             return False
 
     # --- Parameter Access Methods ---
 
     def get_exposure_time_ms(self) -> typing.Optional[float]:
         """Gets the current exposure time in milliseconds."""
-        if not CameraSettings: return None
-        return self._get_value(CameraSettings.ShutterTimingExposureTime, default_value=None)
+        if not _EXPOSURE_KEY: return None
+        return self._get_value(_EXPOSURE_KEY, default_value=None)
 
     def set_exposure_time_ms(self, exposure_ms: float) -> bool:
         """Sets the exposure time in milliseconds."""
-        if not CameraSettings: return False
-        return self._set_value(CameraSettings.ShutterTimingExposureTime, float(exposure_ms))
+        if not _EXPOSURE_KEY: return False
+        return self._set_value(_EXPOSURE_KEY, float(exposure_ms))
 
     def get_sensor_temperature(self) -> typing.Optional[float]:
         """Gets the current sensor temperature reading."""
-        if not CameraSettings: return None
-        return self._get_value(CameraSettings.SensorTemperatureReading, default_value=None)
+        if not _TEMP_KEY: return None
+        return self._get_value(_TEMP_KEY, default_value=None)
 
     def get_sensor_temperature_status(self) -> typing.Optional[str]:
         """Gets the current sensor temperature status as a string."""
-        if not CameraSettings or not SensorTemperatureStatus: return None
-        status_enum_val = self._get_value(CameraSettings.SensorTemperatureStatus, default_value=None)
-        if status_enum_val is not None:
+        if not _TEMP_STATUS_KEY or not SensorTemperatureStatus: return None
+        status_enum_val = self._get_value(_TEMP_STATUS_KEY, default_value=None)
+        return self._temperature_status_name(status_enum_val)
+
+    @staticmethod
+    def _temperature_status_name(status_enum_val) -> typing.Optional[str]:
+        """Converts a SensorTemperatureStatus enum value to its name."""
+        if status_enum_val is None or not SensorTemperatureStatus:
+            return None
+        try:
+            # Convert .NET enum value to its string name
+            return SensorTemperatureStatus.GetName(SensorTemperatureStatus, status_enum_val)
+        except Exception as e:
+            logging.warning("Failed to get name for SensorTemperatureStatus enum value %s: %s", status_enum_val, e)
+            return f"Enum {status_enum_val}" # Fallback
+
+    def snapshot(self) -> dict:
+        """
+        Reads exposure, sensor temperature and temperature status in one pass.
+        Returns {"exposure_ms", "temp_c", "temp_status"}; values are None if unavailable.
+        """
+        if not _EXPOSURE_KEY or not self._is_connected:
+            return {"exposure_ms": None, "temp_c": None, "temp_status": None}
+        return self._call(self._read_snapshot) # One worker hop for all three reads
+
+    def _read_snapshot(self) -> dict:
+        """Body of snapshot(), run on the LFWorker thread."""
+        result = {"exposure_ms": None, "temp_c": None, "temp_status": None}
+        experiment = self._experiment
+        for key, setting in (("exposure_ms", _EXPOSURE_KEY),
+                             ("temp_c", _TEMP_KEY),
+                             ("temp_status", _TEMP_STATUS_KEY)):
+            if not self._setting_info(setting)[0]: # Cached after the first snapshot
+                continue
             try:
-                # Convert .NET enum value to its string name
-                return SensorTemperatureStatus.GetName(SensorTemperatureStatus, status_enum_val)
+                result[key] = experiment.GetValue(setting)
+            except NetException as e:
+                _warn_throttled(("get", setting), "GetValue failed for %s: %s", setting, _net_message(e))
             except Exception as e:
-                print(f"!! ERROR: Failed to get name for SensorTemperatureStatus enum value {status_enum_val}: {e}")
-                logging.warning(f"Failed to get name for SensorTemperatureStatus enum value {status_enum_val}: {e}")
-                return f"Enum {status_enum_val}" # Fallback
-        return None
+                logging.error("GetValue failed for %s: %s", setting, e)
+        result["temp_status"] = self._temperature_status_name(result["temp_status"])
+        return result
 
     def set_base_filename(self, filename: str) -> bool:
         """Sets the base filename for saving."""
-        if not ExperimentSettings: return False
+        if not _BASE_FILENAME_KEY: return False
         # Basic validation: remove invalid chars? Or let LightField handle it?
         # For now, just pass it through.
-        return self._set_value(ExperimentSettings.FileNameGenerationBaseFileName, str(filename))
+        return self._set_value(_BASE_FILENAME_KEY, str(filename))
 
     # Note: set_save_path is intentionally omitted as per requirements
 
     # --- Acquisition Methods ---
 
+    def _attach_completed_handler(self):
+        """Subscribes to ExperimentCompleted on the current experiment so acquire() wakes as soon as the shot is done."""
+        if self._completed_handler is not None:
+            if self._completed_source is self._experiment:
+                return
+            self._detach_completed_handler() # Still on a previous connection's experiment
+        try:
+            handler = lambda sender, args: self._completed_evt.set()
+            self._experiment.ExperimentCompleted += handler
+            self._completed_handler = handler
+            self._completed_source = self._experiment
+            logging.debug("Subscribed to ExperimentCompleted.")
+        except Exception as e:
+            logging.warning("Could not subscribe to ExperimentCompleted, acquire() will poll IsRunning: %s", e)
+
+    def _detach_completed_handler(self):
+        """Unsubscribes the ExperimentCompleted handler, if attached."""
+        if self._completed_handler is None:
+            return
+        if self._completed_source is not None:
+            try:
+                self._completed_source.ExperimentCompleted -= self._completed_handler
+            except Exception as e:
+                logging.debug("Failed to unsubscribe ExperimentCompleted: %s", e)
+        self._completed_handler = None
+        self._completed_source = None
+
+    def _acquire_timeout_s(self) -> float:
+        """
+        Completion wait for one acquisition: twice (exposure + readout allowance) x accumulations x frames,
+        but at least ACQUIRE_TIMEOUT_MIN_S. If any of these can't be read, at least ACQUIRE_TIMEOUT_FALLBACK_S.
+        """
+        exposure_ms = self.get_exposure_time_ms()
+        if not exposure_ms:
+            return self.ACQUIRE_TIMEOUT_FALLBACK_S
+        exposures = 1
+        all_known = True
+        for key in (_ACCUMULATIONS_KEY, _FRAMES_KEY):
+            count = self._get_value(key) if key else None
+            if count is None:
+                all_known = False
+            else:
+                exposures *= max(1, int(count))
+        timeout_s = max(2.0 * exposures * (exposure_ms / 1000.0 + self.ACQUIRE_READOUT_ALLOWANCE_S), self.ACQUIRE_TIMEOUT_MIN_S)
+        return timeout_s if all_known else max(timeout_s, self.ACQUIRE_TIMEOUT_FALLBACK_S)
+
+    def _stop_acquisition(self):
+        """Stops a running acquisition (after a timeout), so LightField isn't left acquiring."""
+        try:
+            self._call(self._experiment.Stop)
+            logging.info("Stopped the timed-out LightField acquisition.")
+        except Exception as e:
+            logging.error("Failed to stop LightField acquisition: %s", e)
+
+    def _wait_for_acquire(self, timeout_s: float) -> bool:
+        """Waits for the running acquisition to finish. Returns False on timeout."""
+        if self._completed_handler is not None:
+            return self._completed_evt.wait(timeout_s)
+        deadline = time.monotonic() + timeout_s
+        while self._call(lambda: self._experiment.IsRunning):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.ACQUIRE_POLL_S)
+        return True
+
     def acquire(self) -> bool:
         """Starts acquisition using current experiment settings and waits for completion."""
         if not self.is_connected():
-            print("!! ERROR: Cannot acquire, not connected.")
             logging.error("Acquire called but not connected.")
             return False
         try:
-            print("-- INFO: Checking experiment readiness...")
-            if self._experiment.IsReadyToRun:
-                print("-- INFO: Experiment is ready. Triggering Acquire()...")
+            if self._call(lambda: self._experiment.IsReadyToRun):
                 logging.info("Starting LightField acquisition...")
+                timeout_s = self._acquire_timeout_s()
+                self._completed_evt.clear()
                 logging.debug("Calling self._experiment.Acquire()...")
-                self._experiment.Acquire() # Blocks until finished? Needs testing.
-                logging.debug("self._experiment.Acquire() call finished.")
-                # Add delay as requested
-                logging.debug("Sleeping for 0.5s after Acquire()...")
-                time.sleep(0.5)
-                logging.debug("Finished sleeping.")
-                # TODO: Add robust waiting if Acquire() is non-blocking (e.g., check IsReadyToRun in a loop with timeout)
-                print("## SUCCESS: Acquire() command finished (after delay).")
-                logging.info("LightField acquisition finished (after delay).")
+                self._call(self._experiment.Acquire) # Returns immediately, completion is signalled by the event
+                if not self._wait_for_acquire(timeout_s):
+                    logging.error("LightField acquisition timed out after %.1f s.", timeout_s)
+                    self._stop_acquisition()
+                    return False
+                logging.info("LightField acquisition finished.")
                 return True
             else:
-                print("!! WARNING: Experiment not ready to run. Cannot acquire.")
                 logging.warning("LightField experiment not ready to run.")
                 return False
         except Exception as e:
-            print(f"!! ERROR: Exception during Acquire(): {e}")
             logging.exception("Failed to acquire data in LightField:")
             return False
 
-    def get_data(self) -> typing.Optional[np.ndarray]:
+    @staticmethod
+    def _frame_dtype(frame, buffer):
+        """
+        Returns the NumPy dtype for a frame, from its PixelDataFormat if known,
+        else from the buffer's .NET element type, else uint16.
+        """
+        try:
+            np_dtype = _LF_DTYPE_MAP.get(frame.Format)
+            if np_dtype is not None:
+                return np_dtype
+        except Exception as e:
+            logging.debug("Could not read frame.Format: %s", e)
+        try:
+            return _NET_TO_NUMPY_DTYPE.get(buffer.GetType().GetElementType().Name, np.uint16)
+        except Exception:
+            return np.uint16
+
+    def _ensure_frame_buf(self, shape: tuple, np_dtype) -> np.ndarray:
+        """Returns the reusable frame array, reallocating it only when shape or dtype change."""
+        if self._frame_buf is None or self._frame_buf.shape != shape or self._frame_buf.dtype != np_dtype:
+            self._frame_buf = np.empty(shape, dtype=np_dtype)
+        return self._frame_buf
+
+    @staticmethod
+    def _copy_frame_buffer(buffer, width: int, height: int, np_dtype, out=None) -> typing.Optional[np.ndarray]:
+        """
+        Copies a frame's System.Array into a new NumPy array (or into `out`) in one memmove.
+        The copy uses the buffer's own element type and is cast to np_dtype afterwards if they differ.
+        Returns None if the interop types are unavailable or the buffer cannot be pinned,
+        in which case the caller falls back to the per-element conversion.
+        """
+        if GCHandle is None:
+            return None
+        try:
+            element_name = buffer.GetType().GetElementType().Name
+            buffer_dtype = _NET_TO_NUMPY_DTYPE.get(element_name)
+            if buffer_dtype is None:
+                logging.debug("No bulk copy mapping for element type %s.", element_name)
+                return None
+            n = buffer.Length
+            if n != width * height:
+                logging.debug("Buffer length %d does not match frame %dx%d, skipping bulk copy.", n, width, height)
+                return None
+            shape = (height, width) if height > 1 else (n,) # Allocated in final shape, no reshape afterwards
+            same_dtype = np.dtype(buffer_dtype) == np.dtype(np_dtype)
+            if same_dtype and out is not None and out.shape == shape and out.dtype == np_dtype:
+                np_data = out
+            elif same_dtype:
+                np_data = np.empty(shape, dtype=np_dtype)
+            handle = GCHandle.Alloc(buffer, GCHandleType.Pinned) # Keep the GC from moving the array during the copy
+            try:
+                src_ptr = handle.AddrOfPinnedObject().ToInt64()
+                if same_dtype:
+                    ctypes.memmove(np_data.ctypes.data, src_ptr, np_data.nbytes)
+                else:
+                    # Format and buffer disagree: cast straight from a view of the pinned memory,
+                    # so the only allocation is the converted output
+                    nbytes = n * np.dtype(buffer_dtype).itemsize
+                    src_view = np.frombuffer((ctypes.c_char * nbytes).from_address(src_ptr), dtype=buffer_dtype)
+                    np_data = src_view.reshape(shape).astype(np_dtype)
+            finally:
+                handle.Free()
+        except Exception as e:
+            logging.warning("Bulk frame copy failed, falling back to list conversion: %s", e)
+            return None
+        return np_data
+
+    def get_data(self, reuse_buffer: bool = False) -> typing.Optional[np.ndarray]:
         """
         Gets the most recently acquired data as a NumPy array.
+        With reuse_buffer=True the frame is copied into an array owned by the controller and
+        overwritten by the next call; callers that keep the data must copy it.
         Returns None if not connected, no data available, or on error.
         """
         if not self.is_connected():
-            print("!! ERROR: Cannot get data, not connected.")
             logging.error("get_data called but not connected.")
             return None
         try:
-            print("-- INFO: Getting latest image data from LightField...")
             logging.debug("Calling self._experiment.GetLatestImage()...")
-            image_data_set = self._experiment.GetLatestImage()
-            logging.debug(f"GetLatestImage returned: {type(image_data_set)}") # Log type
+            image_data_set = self._call(self._experiment.GetLatestImage)
+            logging.debug("GetLatestImage returned: %s", type(image_data_set)) # Log type
 
             if image_data_set is None:
-                print("!! WARNING: GetLatestImage returned None (no data available?).")
                 logging.warning("GetLatestImage returned None.")
                 return None
 
             # Assuming 1D spectrum (Height=1) or first frame of 2D
             frame_count = image_data_set.Frames
             if frame_count == 0:
-                print("!! WARNING: ImageDataSet contains 0 frames.")
                 logging.warning("ImageDataSet contains 0 frames.")
                 return None
 
-            print(f"-- INFO: ImageDataSet contains {frame_count} frame(s). Getting frame 0.")
-            logging.debug(f"Calling image_data_set.GetFrame(0)... (Frame count: {frame_count})")
-            frame = image_data_set.GetFrame(0) # Frame index is 0
-            logging.debug(f"GetFrame(0) returned: {type(frame)}") # Log type
+            logging.debug("Calling image_data_set.GetFrame(0)... (Frame count: %s)", frame_count)
+            frame = self._call(image_data_set.GetFrame, 0) # Frame index is 0
+            logging.debug("GetFrame(0) returned: %s", type(frame)) # Log type
 
             if frame is None:
-                print("!! WARNING: GetFrame(0) returned None.")
                 logging.warning("GetFrame(0) returned None.")
                 return None
 
@@ -476,65 +809,85 @@ class LightFieldController:
             buffer = frame.GetData()
             width = frame.Width
             height = frame.Height
-            logging.debug(f"Frame dimensions: {width}x{height}. Buffer type: {type(buffer)}")
-            print(f"-- INFO: Frame dimensions: {width}x{height}. Buffer type: {type(buffer)}")
-            try:
-                # Log first few elements if possible
-                buffer_len = len(buffer) if hasattr(buffer, '__len__') else -1
-                logging.debug(f"Buffer length: {buffer_len}. First 5 elements (if possible): {buffer[:5] if buffer_len > 5 else buffer}")
-            except Exception as log_e:
-                logging.warning(f"Could not log buffer elements: {log_e}")
-
+            logging.debug("Frame dimensions: %sx%s. Buffer type: %s", width, height, type(buffer))
 
             # --- Data Marshalling ---
-            # Attempt conversion from System.Array (common case)
+            # Fast path: pin the System.Array and memmove it into a preallocated NumPy buffer
+            np_dtype = self._frame_dtype(frame, buffer) # Queried once per frame
+            out = None
+            if reuse_buffer:
+                out = self._ensure_frame_buf((height, width) if height > 1 else (width * height,), np.dtype(np_dtype))
+            np_data = self._copy_frame_buffer(buffer, width, height, np_dtype, out=out)
+            if np_data is not None:
+                logging.info("Successfully retrieved data via bulk copy. Shape: %s, Type: %s", np_data.shape, np_data.dtype)
+                return np_data
+
+            # Fallback: attempt conversion from System.Array element by element
             try:
-                logging.debug("Attempting conversion: list(buffer)...")
-                # Convert buffer to a Python list first
-                py_list = list(buffer)
-                logging.debug(f"list(buffer) successful. List length: {len(py_list)}")
-                # Determine numpy dtype based on frame data format if possible
-                # This requires mapping LightField enums to numpy types
-                # For now, assume common types like uint16 or float32
-                np_dtype = np.uint16 # Default assumption - NEEDS VERIFICATION
-                logging.debug(f"Using assumed np_dtype: {np_dtype}")
-                # Example: Check frame.DataType if available and map it
-                # data_format = frame.DataType # Check actual property name
-                # if data_format == SomeLFEnum.MonochromeUnsigned16: np_dtype = np.uint16
-                # elif data_format == SomeLFEnum.MonochromeFloating32: np_dtype = np.float32
-
-                logging.debug(f"Attempting conversion: np.array(py_list, dtype={np_dtype})...")
-                np_data = np.array(py_list, dtype=np_dtype)
-                logging.debug(f"np.array conversion successful. Shape: {np_data.shape}, Dtype: {np_data.dtype}")
+                logging.debug("Attempting conversion: np.fromiter(buffer, dtype=%s)...", np_dtype)
+                # Fill the array straight from the iterator, without an intermediate Python list
+                np_data = np.fromiter(buffer, dtype=np_dtype, count=buffer.Length)
+                logging.debug("np.fromiter conversion successful. Shape: %s, Dtype: %s", np_data.shape, np_data.dtype)
 
                 # Reshape based on dimensions
                 if height > 1:
-                    logging.debug(f"Reshaping to ({height}, {width})...")
+                    logging.debug("Reshaping to (%s, %s)...", height, width)
                     np_data = np_data.reshape((height, width))
-                    logging.debug(f"Reshape successful. Final shape: {np_data.shape}")
-                    print(f"## SUCCESS: Retrieved data. Shape: {np_data.shape}, Type: {np_data.dtype}")
+                    logging.debug("Reshape successful. Final shape: %s", np_data.shape)
                 else:
                     # If height is 1, keep as 1D array
                     logging.debug("Height is 1, keeping as 1D array.")
-                    print(f"## SUCCESS: Retrieved 1D data. Length: {np_data.shape[0]}, Type: {np_data.dtype}")
 
-                logging.info(f"Successfully retrieved and converted data. Shape: {np_data.shape}, Type: {np_data.dtype}")
+                logging.info("Successfully retrieved and converted data. Shape: %s, Type: %s", np_data.shape, np_data.dtype)
                 return np_data
 
             except TypeError as te:
-                print(f"!! ERROR: Failed to convert buffer to list/numpy array: {te}. Marshalling needed.")
-                logging.error(f"TypeError during buffer conversion: {te}")
+                logging.error("TypeError during buffer conversion: %s", te)
                 return None
             except Exception as conv_e:
-                print(f"!! ERROR: Unexpected error during data conversion: {conv_e}")
-                logging.exception(f"Unexpected error during data conversion (buffer type: {type(buffer)}):")
+                logging.exception("Unexpected error during data conversion (buffer type: %s):", type(buffer))
                 return None
 
         except Exception as e:
-            print(f"!! ERROR: Exception during get_data: {e}")
             logging.exception("Failed to get data from LightField:")
             return None
 
+    def get_wavelengths(self) -> typing.Optional[np.ndarray]:
+        """
+        Returns the wavelength axis (nm per column) from LightField's system calibration as float32.
+        Returns None if not connected or no calibration is available.
+        """
+        if not self.is_connected():
+            return None
+        try:
+            calibration = self._call(lambda: self._experiment.SystemColumnCalibration)
+            if calibration is None or calibration.Length == 0:
+                return None
+            n = calibration.Length
+            wavelengths = self._copy_frame_buffer(calibration, n, 1, np.float32)
+            if wavelengths is None:
+                wavelengths = np.fromiter(calibration, dtype=np.float32, count=n)
+            return wavelengths
+        except Exception as e:
+            _warn_throttled(("calibration",), "Could not read SystemColumnCalibration: %s", e)
+            return None
+
+    def get_last_frame_np(self) -> typing.Optional[tuple[np.ndarray, np.ndarray]]:
+        """
+        Returns (wavelengths, intensities) of the last acquired spectrum straight from memory,
+        both float32 like the columns returned by load_spectrum_csv.
+        Returns None for 2D frames or when the calibration does not match the frame width,
+        in which case callers fall back to reading the exported file.
+        """
+        intensities = self.get_data()
+        if intensities is None or intensities.ndim != 1:
+            return None
+        wavelengths = self.get_wavelengths()
+        if wavelengths is None or wavelengths.size != intensities.size:
+            logging.debug("No usable wavelength calibration for a %d-pixel frame.", intensities.size)
+            return None
+        return wavelengths, intensities.astype(np.float32, copy=False)
+
 # --- Example Usage (for testing script directly) ---
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s')
@@ -554,9 +907,8 @@ if __name__ == "__main__":
             print("--- Connection Test: SUCCESS ---")
 
             print("\n--- Testing Parameter Reading ---")
-            exp = controller.get_exposure_time_ms()
-            temp = controller.get_sensor_temperature()
-            status = controller.get_sensor_temperature_status()
+            params = controller.snapshot()
+            exp, temp, status = params["exposure_ms"], params["temp_c"], params["temp_status"]
             print(f"Read Exposure: {exp} ms")
             print(f"Read Temperature: {temp} C")
             print(f"Read Temp Status: {status}")
@@ -3,8 +3,11 @@ import logging
 import time # For periodic updates (though managed by 'after' now)
 import sys # To check command-line arguments
 import threading # <-- Import threading
+import functools
+import itertools
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor, wait
 import lightfield_controller
-print(f"--- IMPORTING lightfield_controller FROM: {lightfield_controller.__file__} ---")
 
 # Assuming gui_main_window is in the same directory or correctly in sys.path
 try:
@@ -16,6 +19,8 @@ except ImportError as e:
 
 # Conditionally import real or mock hardware
 USE_MOCK = "--mock" in sys.argv
+_CONTROLLER_LABEL = "Mock" if USE_MOCK else "" # Prefix for controller log messages
+_EARLY_DLL_LOAD = not USE_MOCK # Mock controllers have no DLLs to load
 
 if USE_MOCK:
     try:
@@ -43,19 +48,41 @@ except ImportError as e:
     sys.exit(1)
 
 # Basic logging setup
-log_level = logging.DEBUG # Keep DEBUG for detailed output
+log_level = logging.DEBUG if "--debug" in sys.argv else logging.INFO # Pass --debug for detailed output
 logging.basicConfig(level=log_level, format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s')
 
+def _skip_if_closing(method):
+    """Decorator: the wrapped method returns None without running once the app is closing."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._closing.is_set(): return None
+        return method(self, *args, **kwargs)
+    return wrapper
+
 class PolarizationScanApp(ctk.CTk):
     """
     Main application class for the Polarization Scan Controller.
     Orchestrates the GUI and controller interactions.
     Includes threaded periodic position updates and safe closing mechanism.
     """
+    ACTIVE_POLL_MS = 150 # Position poll interval while the stage is moving or being commanded
+    IDLE_POLL_MS = 1000 # Position poll interval once the stage has been still for a while
+    IDLE_POLL_AFTER = 5 # Consecutive unchanged reads before switching to IDLE_POLL_MS
+    POSITION_CHANGE_EPS = 1e-3 # Degrees; smaller differences count as "unchanged"
+    SHUTDOWN_TIMEOUT_S = 3.0 # Hard deadline for the parallel device disconnects on close
+    LF_CONNECTED_TTL_S = 0.25 # How long update_manual_controls_state reuses the last LF is_connected() result
+
     def __init__(self):
         super().__init__()
 
-        self._is_closing = False # <-- Flag to indicate shutdown sequence
+        self._closing = threading.Event() # Set once the shutdown sequence starts; safe to read from any thread
+        self._window_alive = True # Cleared in destroy(); checked instead of a winfo_exists() Tcl round trip
+        # Frames used by the hot GUI callbacks, bound once MainWindow exists (None until then / after cleanup)
+        self._status_frame = None
+        self._manual_frame = None
+        self._lf_connected_cache = (0.0, False) # (monotonic time, result); reset by invalidate_lf_connected_cache
+        self._after_ids = {} # token -> after() id of jobs scheduled via _after, cancelled in cleanup
+        self._after_seq = itertools.count()
 
         self.title("Polarization Scan Controller")
         self.geometry("1200x800")
@@ -66,35 +93,36 @@ class PolarizationScanApp(ctk.CTk):
         # --- Initialize Controllers ---
         try:
             self.kdc101_controller = KDC101Controller()
-            logging.info(f"{'Mock' if USE_MOCK else ''}KDC101Controller instantiated.")
+            logging.info("%sKDC101Controller instantiated.", _CONTROLLER_LABEL)
         except Exception as e:
             logging.exception("Failed to instantiate KDC101Controller:")
             self.kdc101_controller = None
 
         try:
             self.lightfield_controller = LightFieldController()
-            logging.info(f"{'Mock' if USE_MOCK else ''}LightFieldController instantiated.")
+            logging.info("%sLightFieldController instantiated.", _CONTROLLER_LABEL)
             # --- Force early DLL load attempt for debugging ---
-            if not USE_MOCK and self.lightfield_controller:
-                print("--- Attempting early DLL load... ---")
+            if _EARLY_DLL_LOAD and self.lightfield_controller:
+                logging.debug("Attempting early DLL load...")
                 try:
                     # Pass None, load_dlls has internal logic to find path
                     load_success = self.lightfield_controller.load_dlls(None)
-                    print(f"--- Early DLL load attempt finished. Success: {load_success} ---")
+                    logging.debug("Early DLL load attempt finished. Success: %s", load_success)
                 except Exception as dll_load_e:
-                    print(f"--- EXCEPTION during early DLL load attempt: {dll_load_e} ---")
-                    logging.error(f"Exception during early DLL load: {dll_load_e}")
+                    logging.error("Exception during early DLL load: %s", dll_load_e)
             # --- End early DLL load ---
-            print("-" * 40)
-            print(f"--- PRINT IMMEDIATELY AFTER CREATION (and early load attempt) ---")
-            print(f"--- Type: {type(self.lightfield_controller)}")
-            print(f"--- Does it have 'is_connected'? {hasattr(self.lightfield_controller, 'is_connected')}")
-            print(f"--- Does it have 'disconnect'? {hasattr(self.lightfield_controller, 'disconnect')}")
-            print("-" * 40)
+            logging.debug("LightField controller type: %s", type(self.lightfield_controller))
         except Exception as e:
-            logging.exception(f"Failed to instantiate {'Mock' if USE_MOCK else ''}LightFieldController:")
+            logging.exception("Failed to instantiate %sLightFieldController:", _CONTROLLER_LABEL)
             self.lightfield_controller = None
 
+        # Resolve controller methods once: the controller objects (mock or real) are fixed for the
+        # process, so hot paths call these directly instead of re-checking None/hasattr each time
+        self._kdc_is_connected = getattr(self.kdc101_controller, 'is_connected', lambda: False)
+        self._kdc_disconnect = getattr(self.kdc101_controller, 'disconnect', lambda: None)
+        self._lf_is_connected = getattr(self.lightfield_controller, 'is_connected', lambda: False)
+        self._lf_dispose = getattr(self.lightfield_controller, 'dispose', lambda: None)
+
         # --- Initialize Modules ---
         self.analysis_module = AnalysisModule()
         logging.info("AnalysisModule instantiated.")
@@ -110,7 +138,8 @@ class PolarizationScanApp(ctk.CTk):
             status_callback=self.update_status_bar,
             progress_callback=self.update_progress_display, # Use new combined method
             completion_callback=self.on_scan_completed,
-            eta_callback=self.update_eta_display # Pass the new callback
+            eta_callback=self.update_eta_display, # Pass the new callback
+            scan_state_callback=self.update_scan_state_display
         )
         logging.info("ScanLogic instantiated.")
 
@@ -119,14 +148,22 @@ class PolarizationScanApp(ctk.CTk):
             # Pass self (PolarizationScanApp instance) as 'app_instance'
             self.main_window = MainWindow(master=self, app_instance=self)
             self.main_window.pack(expand=True, fill="both")
+            self._status_frame = getattr(self.main_window, 'status_log_frame', None)
+            self._manual_frame = getattr(self.main_window, 'manual_control_frame', None)
         except Exception as e:
             logging.exception("Failed to create MainWindow GUI:")
+            self._window_alive = False
             self.destroy() # Attempt cleanup even if GUI fails
             return
 
         # --- Periodic Updates ---
-        self.position_update_ms = 200 # Update interval in milliseconds (faster refresh)
-        self.position_update_job = None
+        self.position_update_ms = self.ACTIVE_POLL_MS # Adapted between ACTIVE_/IDLE_POLL_MS by the poller
+        self._poll_timer = None # Background thread that paces position fetches (see _poll_timer_loop)
+        self._last_position = None # Last polled KDC position, to detect idle
+        self._idle_count = 0
+        # One pooled worker serves all position fetches; at most one fetch is pending at a time
+        self._kdc_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kdc-poll")
+        self._pending_future = None
         self.start_periodic_updates()
 
         # --- Window Closing Handler ---
@@ -139,100 +176,153 @@ class PolarizationScanApp(ctk.CTk):
 
     # --- Callback Methods ---
 
+    @_skip_if_closing
     def on_scan_completed(self, success: bool, message: str):
         """Callback function passed to ScanLogic, executed when scan finishes."""
-        if self._is_closing: return # Prevent execution during shutdown
         logging.info(f"Scan completion callback received: Success={success}, Msg='{message}'")
-        self.after(0, lambda: self._handle_scan_completion_gui(success, message))
+        self._after(0, self._handle_scan_completion_gui, success, message)
 
+    def _after(self, ms: int, func, *args):
+        """after() that records the job so _perform_cleanup can cancel it (args are forwarded, no closure)."""
+        token = next(self._after_seq)
+        self._after_ids[token] = self.after(ms, self._run_after, token, func, *args)
+
+    def _run_after(self, token: int, func, *args):
+        """Runs a job scheduled by _after, forgetting its id first."""
+        self._after_ids.pop(token, None)
+        func(*args)
+
+    def _cancel_after_jobs(self):
+        """Cancels every job scheduled via _after that hasn't run yet."""
+        for after_id in list(self._after_ids.values()):
+            try:
+                self.after_cancel(after_id)
+            except tk.TclError:
+                pass # Already ran or window gone
+        self._after_ids.clear()
+
+    @_skip_if_closing
     def _handle_scan_completion_gui(self, success: bool, message: str):
         """Handles GUI updates after scan completion (runs in main thread)."""
-        if self._is_closing: return # Prevent execution during shutdown
         if hasattr(self, 'main_window') and hasattr(self.main_window, 'scan_params_frame'):
             self.main_window.scan_params_frame.scan_finished_callback(success, message)
         else:
             logging.error("Cannot find scan_params_frame to signal scan completion.")
         self.update_status_bar(message, error=not success)
 
+    def report_callback_exception(self, exc, val, tb):
+        """
+        Central handler for exceptions escaping Tk callbacks (overrides Tk's default).
+        Button handlers only catch the controller errors they expect; anything else lands here.
+        """
+        logging.error("Unhandled exception in Tk callback:", exc_info=(exc, val, tb))
+        self.update_status_bar(f"Unexpected Error: {val}", error=True)
+
     # --- GUI Update Methods ---
 
-    def update_status_bar(self, message: str, error: bool = False):
-        """Updates the status bar in the StatusLogFrame."""
-        if self._is_closing: return # Prevent execution during shutdown
-        if hasattr(self, 'main_window') and hasattr(self.main_window, 'status_log_frame'):
-            self.after(0, lambda msg=message, err=error:
-                    self.main_window.status_log_frame.update_status(msg, err))
+    @_skip_if_closing
+    def update_status_bar(self, message: str, error: bool = False, log: bool = True):
+        """Updates the status bar in the StatusLogFrame (log=False skips the log history)."""
+        if self._status_frame is not None:
+            # StatusLogFrame queues the update itself, so this is safe from the scan/worker threads
+            self._status_frame.update_status(message, error, log)
         else:
             log_func = logging.error if error else logging.info
             log_func(f"Status Update (Early/No GUI): {message}")
 
     # --- Combined Progress Update Method ---
+    @_skip_if_closing
     def update_progress_display(self, value: float, current_step: int | None = None, total_steps: int | None = None, eta_sec: float | None = None):
         """Updates the progress bar, step count, and ETA in the StatusLogFrame."""
-        if self._is_closing: return # Prevent execution during shutdown
-        if hasattr(self, 'main_window') and hasattr(self.main_window, 'status_log_frame'):
-            # Pass all arguments to the frame's update method
-            self.after(0, lambda v=value, cs=current_step, ts=total_steps, eta=eta_sec:
-                    self.main_window.status_log_frame.update_progress(v, cs, ts, eta))
+        if self._status_frame is not None:
+            # Pass all arguments to the frame's (thread-safe, queued) update method
+            self._status_frame.update_progress(value, current_step, total_steps, eta_sec)
+
+    @_skip_if_closing
+    def update_scan_state_display(self, message: str, value: float, current_step: int | None = None, total_steps: int | None = None, eta_sec: float | None = None):
+        """Shows a transient scan status and the progress/ETA with one post to the StatusLogFrame."""
+        if self._status_frame is not None:
+            self._status_frame.update_scan_state(message, value, current_step, total_steps, eta_sec)
 
     # --- Separate ETA Update (kept for potential direct use, though combined is preferred now) ---
+    @_skip_if_closing
     def update_eta_display(self, eta_string: str):
         """Updates the ETA display in the StatusLogFrame."""
         # This might be redundant now if update_progress_display handles ETA
         # Kept for clarity or if direct ETA update is needed elsewhere
-        if self._is_closing: return
-        if hasattr(self, 'main_window') and hasattr(self.main_window, 'status_log_frame'):
-            # Assuming status_log_frame has an update_eta method
-            if hasattr(self.main_window.status_log_frame, 'update_eta'):
-                self.after(0, lambda eta=eta_string:
-                        self.main_window.status_log_frame.update_eta(eta))
-            else: # Fallback if only update_progress exists
-                logging.warning("update_eta method not found on status_log_frame, ETA might not display separately.")
+        if self._status_frame is not None:
+            self._status_frame.update_eta(eta_string) # Thread-safe, coalesced per drain
 
 
+    @_skip_if_closing
     def log_message(self, message: str, is_error: bool = False):
         """Adds a message to the log text area in the StatusLogFrame."""
-        if self._is_closing: return # Prevent execution during shutdown
-        if hasattr(self, 'main_window') and hasattr(self.main_window, 'status_log_frame'):
-            self.after(0, lambda msg=message, err=is_error:
-                    self.main_window.status_log_frame.log_message(msg, err))
+        if self._status_frame is not None:
+            self._status_frame.log_message(message, is_error) # Thread-safe, queued
+
+    def invalidate_lf_connected_cache(self):
+        """Forces the next update_manual_controls_state to re-query LightField (call after connect/disconnect)."""
+        self._lf_connected_cache = (0.0, False)
 
     # --- Threaded Periodic Position Update ---
 
-    def start_periodic_updates(self):
-        """Starts the periodic task initiator for KDC101 position updates."""
-        def _periodic_update_task_initiator():
-            if self._is_closing: return # Stop if closing
+    @property
+    def _is_closing(self) -> bool:
+        """Read-only view of the closing event (frames check this attribute)."""
+        return self._closing.is_set()
 
+    def start_periodic_updates(self):
+        """Starts the background timer thread that requests KDC101 position fetches."""
+        if self._closing.is_set(): return # Don't start if already closing during init
+        if self._poll_timer is not None and self._poll_timer.is_alive(): return
+        self._poll_timer = threading.Thread(target=self._poll_timer_loop, name="kdc-poll-timer", daemon=True)
+        self._poll_timer.start()
+        logging.info("Started periodic position updates.")
+
+    def _poll_timer_loop(self):
+        """Requests a position fetch every position_update_ms until closing (or stop_periodic_updates)."""
+        me = threading.current_thread()
+        # Waiting on the closing event paces the loop and wakes it immediately on shutdown
+        while not self._closing.wait(self.position_update_ms / 1000.0) and self._poll_timer is me:
             try:
-                if self.kdc101_controller and self.kdc101_controller.is_connected() and self.winfo_exists():
-                    fetch_thread = threading.Thread(target=self._fetch_kdc_position_background, daemon=True)
-                    fetch_thread.start()
+                if self._kdc_is_connected():
+                    self._request_position_fetch()
             except Exception as e:
-                logging.error(f"Unhandled exception in periodic update initiator: {e}")
-            finally:
-                # Reschedule only if not closing
-                if not self._is_closing and self.winfo_exists():
-                    self.position_update_job = self.after(self.position_update_ms, _periodic_update_task_initiator)
+                logging.error("Unhandled exception in periodic update timer: %s", e)
 
-        self.stop_periodic_updates()
-        if not self._is_closing: # Don't start if already closing during init
-            self.position_update_job = self.after(self.position_update_ms, _periodic_update_task_initiator)
-            logging.info("Started periodic position update initiator.")
+    def force_active_poll(self):
+        """Switches position polling back to the active rate right away (call before commanding a move)."""
+        self._idle_count = 0
+        self.position_update_ms = self.ACTIVE_POLL_MS
+        if not self._closing.is_set() and self._kdc_is_connected():
+            self._request_position_fetch() # Read now rather than after the rest of an idle-length wait
 
     def stop_periodic_updates(self):
-        """Stops the periodic position update initiator."""
-        if self.position_update_job:
-            self.after_cancel(self.position_update_job)
-            self.position_update_job = None
+        """Stops the position timer thread (it exits at its next wake-up)."""
+        if getattr(self, '_poll_timer', None) is not None: # Absent if init failed before polling started
+            self._poll_timer = None
             logging.info("Stopped periodic position updates.")
 
-    def _fetch_kdc_position_background(self):
-        """Fetches KDC101 position in a background thread."""
-        if self._is_closing: return
+    def _request_position_fetch(self):
+        """Submits a position fetch to the poll pool unless one is already pending or running."""
+        if self._pending_future is not None and not self._pending_future.done():
+            return # Coalesce: the in-flight fetch will report the current position
+        try:
+            self._pending_future = self._kdc_pool.submit(self._do_fetch_position)
+        except RuntimeError: # Pool already shut down (closing)
+            return
+        self._pending_future.add_done_callback(self._on_position_ready)
+
+    def _stop_poll_worker(self):
+        """Shuts down the poll pool, dropping any fetch that hasn't started."""
+        if not hasattr(self, '_kdc_pool'): return # Init failed before the pool was created
+        self._kdc_pool.shutdown(wait=False, cancel_futures=True)
 
+    def _do_fetch_position(self) -> tuple[float, str | None]:
+        """Fetches KDC101 position (runs on the poll pool). Returns (position, error)."""
         position = float('nan')
         error = None
+        if self._closing.is_set(): return position, "Closing"
         try:
             if self.kdc101_controller:
                 position = self.kdc101_controller.get_position()
@@ -245,72 +335,80 @@ class PolarizationScanApp(ctk.CTk):
             error = f"Unexpected error getting KDC position: {e}"
             logging.exception(error)
 
+        if error is None:
+            if self._last_position is not None and abs(position - self._last_position) < self.POSITION_CHANGE_EPS:
+                self._idle_count += 1
+            else:
+                self._idle_count = 0
+            self._last_position = position
+        return position, error
+
+    @_skip_if_closing
+    def _on_position_ready(self, future):
+        """Done-callback for a position fetch; hands the result to the Tk thread."""
+        if future.cancelled(): return
+        position, error = future.result() # _do_fetch_position catches its own exceptions
         # Schedule UI update only if not closing
-        if not self._is_closing and self.winfo_exists():
-            self.after(0, lambda: self._update_position_display_mainthread(position, error))
+        if not self._closing.is_set() and self._window_alive:
+            self._after(0, self._update_position_display_mainthread, position, error)
 
+    @_skip_if_closing
     def _update_position_display_mainthread(self, position: float, error: str | None):
         """Updates the position display (runs in main thread)."""
-        if self._is_closing: return # Prevent execution during shutdown
+
+        self.position_update_ms = self.IDLE_POLL_MS if self._idle_count > self.IDLE_POLL_AFTER else self.ACTIVE_POLL_MS
 
         if error:
             position = float('nan')
 
-        if (hasattr(self, 'main_window') and self.main_window and
-            hasattr(self.main_window, 'manual_control_frame') and self.main_window.manual_control_frame and
-            hasattr(self.main_window.manual_control_frame, 'update_position_display')):
+        if self._manual_frame is not None:
             try:
-                self.main_window.manual_control_frame.update_position_display(position)
+                self._manual_frame.update_position_display(position)
             except Exception as e:
                 logging.error(f"Error calling update_position_display on manual frame: {e}")
 
     # --- State Update Method ---
 
+    @_skip_if_closing
     def update_manual_controls_state(self):
         """ Checks device connection status and updates the ManualControlFrame's widget states."""
-        if self._is_closing: return # Prevent execution during shutdown
 
         kdc_connected = False
         lf_connected = False
 
         # Safely check KDC status
-        if self.kdc101_controller:
-            try:
-                kdc_connected = self.kdc101_controller.is_connected()
-            except Exception as e:
-                logging.error(f"Error checking KDC status in update_manual_controls_state: {e}")
-                kdc_connected = False
-        logging.debug(f"Checking KDC connection status for GUI update: {kdc_connected}")
+        try:
+            kdc_connected = self._kdc_is_connected()
+        except Exception as e:
+            logging.error(f"Error checking KDC status in update_manual_controls_state: {e}")
+            kdc_connected = False
+        logging.debug("Checking KDC connection status for GUI update: %s", kdc_connected)
 
         # Safely check LightField status
-        if self.lightfield_controller:
-            try:
-                # *** IMPORTANT: Check if this is the source of the error ***
-                if hasattr(self.lightfield_controller, 'is_connected'):
-                    lf_connected = self.lightfield_controller.is_connected()
-                else:
-                    logging.error("'is_connected' method MISSING from self.lightfield_controller object!")
-                    lf_connected = False # Assume not connected if method is missing
-            except Exception as e:
-                # Log the specific error from the is_connected call if it exists
-                logging.error(f"Error calling/checking LF is_connected in update_manual_controls_state: {e}")
-                lf_connected = False
-        logging.debug(f"Checking LF connection status for GUI update: {lf_connected}")
+        try:
+            checked_at, cached = self._lf_connected_cache
+            now = time.monotonic()
+            if now - checked_at < self.LF_CONNECTED_TTL_S:
+                lf_connected = cached
+            else:
+                lf_connected = self._lf_is_connected()
+                self._lf_connected_cache = (now, lf_connected)
+        except Exception as e:
+            logging.error(f"Error calling LF is_connected in update_manual_controls_state: {e}")
+            lf_connected = False
+        logging.debug("Checking LF connection status for GUI update: %s", lf_connected)
 
         # Update the ManualControlFrame
-        if (hasattr(self, 'main_window') and self.main_window and
-            hasattr(self.main_window, 'manual_control_frame') and self.main_window.manual_control_frame):
-            print(f"--- DEBUG (main_app.update_manual_controls_state): Calling manual_frame.set_controls_state with kdc={kdc_connected}, lf={lf_connected} ---") # Log before call
-            logging.debug(f"Calling manual_control_frame.set_controls_state(kdc_connected={kdc_connected}, lf_connected={lf_connected})")
+        if self._manual_frame is not None:
+            logging.debug("Calling manual_control_frame.set_controls_state(kdc_connected=%s, lf_connected=%s)", kdc_connected, lf_connected)
             try:
-                self.main_window.manual_control_frame.set_controls_state(
+                self._manual_frame.set_controls_state(
                     kdc_connected=kdc_connected,
                     lf_connected=lf_connected
                 )
                 if kdc_connected:
                     self._update_position_display_mainthread(float('nan'), None)
-                    immediate_fetch_thread = threading.Thread(target=self._fetch_kdc_position_background, daemon=True)
-                    immediate_fetch_thread.start()
+                    self._request_position_fetch()
             except Exception as e:
                 logging.error(f"Error calling set_controls_state on manual frame: {e}")
         else:
@@ -320,13 +418,16 @@ class PolarizationScanApp(ctk.CTk):
     # --- Application Closing ---
 
     # Renamed from on_closing
+    @_skip_if_closing # Prevent double execution
     def _perform_cleanup(self):
         """Handles cleanup actions before the application window is destroyed."""
-        if self._is_closing: return # Prevent double execution
-        self._is_closing = True # Set the closing flag
+        self._closing.set() # Also wakes the position timer so it exits at once
 
         logging.info("Performing cleanup actions...")
         self.stop_periodic_updates()
+        self._stop_poll_worker()
+        self._status_frame = None # Callbacks arriving from worker threads now find no frame to touch
+        self._manual_frame = None
 
         # Stop Scan Thread First
         if self.scan_logic and self.scan_logic.is_running():
@@ -335,55 +436,28 @@ class PolarizationScanApp(ctk.CTk):
             scan_thread = getattr(self.scan_logic, '_scan_thread', None)
             if scan_thread and scan_thread.is_alive():
                 logging.info("Waiting for scan thread to exit (max 2s)...")
-                scan_thread.join(timeout=2.0)
+                deadline = time.monotonic() + 2.0
+                while scan_thread.is_alive() and time.monotonic() < deadline:
+                    scan_thread.join(timeout=0.05)
+                    self._pump_idle_tasks() # Keep the window repainting while we wait
                 if scan_thread.is_alive(): logging.warning("Scan thread did not exit cleanly.")
                 else: logging.info("Scan thread exited.")
             elif self.scan_logic.is_running(): logging.warning("Scan logic running but no thread found?")
 
-        # --- Debugging LightFieldController just before disconnect attempt ---
-        print("--- PRINT (Cleanup): Checking lightfield_controller before disconnect ---")
-        controller_to_check = self.lightfield_controller
-        lf_can_disconnect = False
-        if controller_to_check:
-            print(f"--- PRINT (Cleanup): Type of self.lightfield_controller: {type(controller_to_check)}")
-            has_is_connected = hasattr(controller_to_check, 'is_connected')
-            has_disconnect = hasattr(controller_to_check, 'disconnect')
-            print(f"--- PRINT (Cleanup): Does it have 'is_connected'? {has_is_connected}")
-            print(f"--- PRINT (Cleanup): Does it have 'disconnect'? {has_disconnect}")
-            if has_is_connected and has_disconnect:
-                try:
-                    if controller_to_check.is_connected():
-                            lf_can_disconnect = True
-                except Exception as e:
-                        print(f"--- PRINT (Cleanup): EXCEPTION during is_connected check: {e} ---")
-                        logging.error(f"Error checking LF is_connected during cleanup: {e}")
-            else:
-                print("--- PRINT (Cleanup): is_connected or disconnect method MISSING ---")
-                logging.error("is_connected or disconnect method missing from lightfield_controller!")
-        else:
-            print("--- PRINT (Cleanup): self.lightfield_controller is None ---")
-        # --- End Debugging Block ---
-
-
-        # Disconnect KDC
-        if self.kdc101_controller and self.kdc101_controller.is_connected():
+        # KDC disconnect and LightField dispose are independent, so run them in parallel
+        shutdown_tasks = {}
+        if self._kdc_is_connected():
             logging.info("Disconnecting KDC101...")
-            try:
-                self.kdc101_controller.disconnect()
-            except Exception as e:
-                logging.exception("Error disconnecting KDC101:")
+            shutdown_tasks["KDC101 disconnect"] = self._kdc_disconnect
 
         # --- Dispose LightField Automation Object ---
         # Call the new dispose method to explicitly release the automation object
-        if self.lightfield_controller and hasattr(self.lightfield_controller, 'dispose'):
+        if self.lightfield_controller is not None:
             logging.info("Calling LightField controller dispose...")
-            try:
-                self.lightfield_controller.dispose()
-                logging.info("LightField controller dispose finished.")
-            except Exception as e:
-                logging.exception("Error disposing LightField controller:")
+            shutdown_tasks["LightField dispose"] = self._lf_dispose
         else:
-            logging.warning("LightField controller not found or has no dispose method.")
+            logging.warning("LightField controller not found.")
+        self._run_shutdown_tasks(shutdown_tasks)
         # --- End Dispose LightField ---
 
 
@@ -395,23 +469,50 @@ class PolarizationScanApp(ctk.CTk):
             except Exception as e:
                 logging.exception("Error during plotting cleanup:")
 
-        # Process pending Tkinter events before destroying (optional)
+        # Drop queued GUI callbacks rather than running them (they'd only see _closing and bail),
+        # then flush pending redraws once; a full update() would re-dispatch that stale work
+        self._cancel_after_jobs()
         try:
-            logging.debug("Processing idle tasks before destroy...")
             self.update_idletasks()
-            self.update()
-            logging.debug("Idle tasks processed.")
         except Exception as e:
-            logging.warning(f"Exception during update_idletasks/update on close: {e}")
+            logging.warning(f"Exception during update_idletasks on close: {e}")
 
         logging.info("Cleanup finished.")
         # --- IMPORTANT: DO NOT CALL self.destroy() HERE ---
 
+    def _pump_idle_tasks(self):
+        """Processes pending redraws so the window stays responsive during a blocking close step."""
+        try:
+            self.update_idletasks()
+        except Exception:
+            pass # Window may already be half torn down
+
+    def _run_shutdown_tasks(self, tasks: dict):
+        """Runs {name: callable} in parallel, pumping idle tasks, until all finish or SHUTDOWN_TIMEOUT_S passes."""
+        if not tasks:
+            return
+        pool = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="shutdown")
+        futures = {pool.submit(fn): name for name, fn in tasks.items()}
+        deadline = time.monotonic() + self.SHUTDOWN_TIMEOUT_S
+        pending = set(futures)
+        while pending and time.monotonic() < deadline:
+            _, pending = wait(pending, timeout=0.05)
+            self._pump_idle_tasks()
+        pool.shutdown(wait=False) # Don't block the close on a hung driver call
+        for future, name in futures.items():
+            if future in pending:
+                logging.warning("%s did not finish within %.1f s.", name, self.SHUTDOWN_TIMEOUT_S)
+            elif future.exception() is not None:
+                logging.error("Error during %s: %s", name, future.exception())
+            else:
+                logging.info("%s finished.", name)
+
     # Overridden destroy method
     def destroy(self):
         """Overrides the default destroy method to perform cleanup first."""
         logging.info("Window destroy initiated...")
-        if not self._is_closing: # Ensure cleanup runs only once
+        self._window_alive = False
+        if not self._closing.is_set(): # Ensure cleanup runs only once
             try:
                 self._perform_cleanup() # Call the cleanup logic
             except Exception as e:
@@ -437,7 +538,7 @@ if __name__ == "__main__":
             print(f"Specific error: {e}\n")
 
     app = PolarizationScanApp()
-    if app.winfo_exists():
+    if app._window_alive:
         try:
             app.mainloop()
         except Exception as e:
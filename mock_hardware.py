@@ -1,19 +1,47 @@
 import time
-import time
+import threading
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import logging
 import random
 import typing # Add typing import
+import sys
 
 # Basic logging setup
 # logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Simulated time (seconds) accumulated by mocks running with real_time=False
+SIM_CLOCK = 0.0
+_sim_clock_lock = threading.Lock() # Mocks are driven from the GUI, poll and scan threads
+
+def _sim_sleep(dt: float, real_time: bool):
+    """Simulates a hardware delay: really sleeps if real_time, else just advances SIM_CLOCK."""
+    global SIM_CLOCK
+    if real_time:
+        time.sleep(dt)
+        return
+    with _sim_clock_lock:
+        SIM_CLOCK += dt
+
+async def _sim_sleep_async(dt: float, real_time: bool):
+    """Awaitable _sim_sleep: yields to the event loop instead of blocking the thread."""
+    if real_time:
+        await asyncio.sleep(dt)
+        return
+    _sim_sleep(dt, False)
+    await asyncio.sleep(0)
+
+# Mirrors kdc101_controller's move pool so MockKDC101Controller.move_to_async behaves the same way
+_MOCK_MOVE_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="MockKDCMove")
+
 class MockKDC101Controller:
     """
     Mock version of the KDC101Controller for testing without hardware.
-    Simulates basic behavior and delays.
+    Simulates basic behavior and delays (pass real_time=False to skip the waits, e.g. for automated runs).
     """
-    def __init__(self):
+    def __init__(self, real_time: bool = True):
+        self._real_time = real_time # False: delays only advance SIM_CLOCK
         self._pos = 0.0
         self._connected = False
         self._devices = ["SIM_27000001", "SIM_27000002"] # Simulated serial numbers
@@ -22,12 +50,12 @@ class MockKDC101Controller:
 
     def scan_devices(self) -> list[str]:
         logging.info("MockKDC: Scanning for devices...")
-        time.sleep(0.3) # Simulate scan time
+        _sim_sleep(0.3, self._real_time) # Simulate scan time
         return self._devices
 
     def connect(self, serial_no: str) -> bool:
         logging.info(f"MockKDC: Attempting to connect to {serial_no}...")
-        time.sleep(0.5) # Simulate connection time
+        _sim_sleep(0.5, self._real_time) # Simulate connection time
         if serial_no in self._devices:
             self._connected = True
             self.connected_serial = serial_no
@@ -39,7 +67,7 @@ class MockKDC101Controller:
 
     def disconnect(self) -> bool:
         logging.info(f"MockKDC: Disconnecting from {self.connected_serial}...")
-        time.sleep(0.1)
+        _sim_sleep(0.1, self._real_time)
         self._connected = False
         self.connected_serial = None
         logging.info("MockKDC: Disconnected.")
@@ -51,7 +79,7 @@ class MockKDC101Controller:
     def home(self):
         if not self.is_connected(): raise RuntimeError("MockKDC: Not connected.")
         logging.info(f"MockKDC: Homing {self.connected_serial}...")
-        time.sleep(1.5) # Simulate homing time
+        _sim_sleep(1.5, self._real_time) # Simulate homing time
         self._pos = 0.0
         logging.info("MockKDC: Homing complete.")
 
@@ -60,16 +88,20 @@ class MockKDC101Controller:
         logging.info(f"MockKDC: Moving {self.connected_serial} to {position_deg:.2f}°...")
         # Simulate move time based on distance (simple approximation)
         move_time = abs(position_deg - self._pos) / 20.0 # Assume 20 deg/sec avg speed
-        time.sleep(max(0.1, move_time))
+        _sim_sleep(max(0.1, move_time), self._real_time)
         self._pos = position_deg
         logging.info(f"MockKDC: Move complete. Position: {self._pos:.2f}°")
 
+    def move_to_async(self, position_deg: float):
+        """Starts move_to on the mock move pool and returns its concurrent.futures.Future (as the real controller does)."""
+        return _MOCK_MOVE_EXECUTOR.submit(self.move_to, position_deg)
+
     def move_relative(self, displacement_deg: float):
         if not self.is_connected(): raise RuntimeError("MockKDC: Not connected.")
         target_pos = self._pos + displacement_deg
         logging.info(f"MockKDC: Moving {self.connected_serial} by {displacement_deg:.2f}° (to {target_pos:.2f}°)...")
         move_time = abs(displacement_deg) / 20.0
-        time.sleep(max(0.1, move_time))
+        _sim_sleep(max(0.1, move_time), self._real_time)
         self._pos = target_pos
         logging.info(f"MockKDC: Relative move complete. Position: {self._pos:.2f}°")
 
@@ -86,44 +118,58 @@ class MockKDC101Controller:
         # No actual effect in mock
 
     def wait_for_move(self, timeout_s: float = 30.0):
-        # In mock, moves are blocking (via time.sleep), so this doesn't need to do much.
+        # In mock, moves are blocking (via _sim_sleep), so this doesn't need to do much.
         # Could add a small delay just to simulate polling time if needed.
         if not self.is_connected(): raise RuntimeError("MockKDC: Not connected.")
         logging.debug("MockKDC: wait_for_move called (no-op in mock as moves are blocking).")
-        time.sleep(0.05) # Simulate minimal check time
+        _sim_sleep(0.05, self._real_time) # Simulate minimal check time
 
 
 class MockLightFieldController:
     """
     Mock version of the LightFieldController for testing without hardware/software.
-    Simulates basic behavior and delays.
+    Simulates basic behavior and delays (pass real_time=False to skip the waits, e.g. for automated runs).
     """
-    def __init__(self):
+    PIXELS = 1024 # Length of the simulated spectrum
+
+    def __init__(self, real_time: bool = True):
+        self._real_time = real_time # False: delays only advance SIM_CLOCK
         self._is_connected = False
         self._last_spectrum = None
         self._exposure = 0.1
         self._accumulations = 1
         self.loaded_sdk_path = None # Add this to match real controller interface
+        # Spectrum generation: one RNG and scratch buffers reused by every acquire().
+        # float32 throughout: simulated counts fit easily and it halves the bytes moved per frame.
+        self._rng = np.random.default_rng()
+        self._x = np.arange(self.PIXELS, dtype=np.float32)
+        self._wavelengths = np.linspace(380.0, 430.0, self.PIXELS, dtype=np.float32) # Simulated calibration, nm
+        self._wavelengths.flags.writeable = False
+        self._signal = np.empty(self.PIXELS, dtype=np.float32)
+        self._noise = np.empty(self.PIXELS, dtype=np.float32)
+        # Ranges of the per-spectrum random parameters: peak position, peak width, peak height, baseline
+        self._param_low = np.array([200.0, 20.0, 5000.0, 50.0])
+        self._param_high = np.array([800.0, 50.0, 50000.0, 200.0])
         logging.info("MockLightFieldController initialized.")
 
     def load_dlls(self, sdk_path: str | None = None) -> bool:
         """Mock method to simulate loading DLLs."""
         logging.info(f"MockLF: 'Loading' DLLs (path ignored: {sdk_path})...")
-        time.sleep(0.05) # Simulate tiny delay
+        _sim_sleep(0.05, self._real_time) # Simulate tiny delay
         self.loaded_sdk_path = "mock_path" # Simulate setting a path
         logging.info("MockLF: DLLs 'loaded'.")
         return True
 
     def connect(self) -> bool:
         logging.info("MockLF: Connecting to LightField...")
-        time.sleep(0.8) # Simulate connection time
+        _sim_sleep(0.8, self._real_time) # Simulate connection time
         self._is_connected = True
         logging.info("MockLF: Connected.")
         return True
 
     def disconnect(self) -> bool:
         logging.info("MockLF: Disconnecting...")
-        time.sleep(0.2)
+        _sim_sleep(0.2, self._real_time)
         self._is_connected = False
         logging.info("MockLF: Disconnected.")
         return True
@@ -138,45 +184,93 @@ class MockLightFieldController:
         self._accumulations = accumulations
         return True
 
+    def snapshot(self) -> dict:
+        """Mock of the real controller's combined exposure/temperature read."""
+        if not self.is_connected():
+            return {"exposure_ms": None, "temp_c": None, "temp_status": None}
+        return {"exposure_ms": self._exposure * 1000.0, "temp_c": -70.0, "temp_status": "Locked"}
+
+    def set_base_filename(self, filename: str) -> bool:
+        """Mock of the real controller's base filename setter (the mock saves no files)."""
+        if not self.is_connected(): return False
+        logging.info(f"MockLF: Base filename set to {filename}")
+        return True
+
+    def _acquire_time(self) -> float:
+        """Simulated duration of one acquisition (exposure x accumulations + overhead)."""
+        return max(0.1, self._exposure * self._accumulations + 0.1)
+
     def acquire(self) -> bool:
         if not self.is_connected(): raise RuntimeError("MockLF: Not connected.")
         logging.info(f"MockLF: Acquiring (Exp={self._exposure}s, Accums={self._accumulations})...")
-        acq_time = self._exposure * self._accumulations + 0.1 # Simulate acquisition + overhead
-        time.sleep(max(0.1, acq_time))
-
-        # Generate simulated spectrum data (e.g., Gaussian peak + noise)
-        pixels = 1024
-        peak_pos = random.uniform(200, 800)
-        peak_width = random.uniform(20, 50)
-        peak_intensity = random.uniform(5000, 50000) * self._exposure * self._accumulations
-        noise_level = peak_intensity * 0.02
-
-        x = np.arange(pixels)
-        signal = peak_intensity * np.exp(-((x - peak_pos)**2) / (2 * peak_width**2))
-        noise = np.random.normal(0, noise_level**0.5, pixels)
-        baseline = random.uniform(50, 200)
-
-        self._last_spectrum = signal + noise + baseline
-        self._last_spectrum[self._last_spectrum < 0] = 0 # No negative counts
+        _sim_sleep(self._acquire_time(), self._real_time)
+        self._generate_spectrum()
+        logging.info("MockLF: Acquisition complete.")
+        return True
 
+    async def acquire_async(self) -> bool:
+        """Awaitable acquire(); the event loop keeps running during the simulated exposure."""
+        if not self.is_connected(): raise RuntimeError("MockLF: Not connected.")
+        logging.info(f"MockLF: Acquiring async (Exp={self._exposure}s, Accums={self._accumulations})...")
+        await _sim_sleep_async(self._acquire_time(), self._real_time)
+        self._generate_spectrum()
         logging.info("MockLF: Acquisition complete.")
         return True
 
+    async def get_data_async(self) -> typing.Union[np.ndarray, None]:
+        """Awaitable get_data()."""
+        return self.get_data()
+
+    def _generate_spectrum(self):
+        """Fills _last_spectrum with a new simulated spectrum."""
+        # Generate simulated spectrum data (e.g., Gaussian peak + noise), in place in the scratch buffers
+        peak_pos, peak_width, peak_height, baseline = self._rng.uniform(self._param_low, self._param_high) # One draw for all four
+        peak_intensity = peak_height * self._exposure * self._accumulations
+        noise_level = peak_intensity * 0.02
+
+        signal = self._signal
+        np.subtract(self._x, np.float32(peak_pos), out=signal)
+        signal *= signal
+        signal *= np.float32(-1.0 / (2 * peak_width**2))
+        np.exp(signal, out=signal)
+        signal *= np.float32(peak_intensity)
+        self._rng.standard_normal(dtype=np.float32, out=self._noise)
+        self._noise *= np.float32(noise_level**0.5)
+        signal += self._noise
+        signal += np.float32(baseline)
+
+        self._last_spectrum = np.maximum(signal, np.float32(0)) # No negative counts; the only allocation, as it is handed out
+
     def get_data(self) -> typing.Union[np.ndarray, None]:
+        """Returns the last spectrum as a read-only view (callers that modify it must copy)."""
         if not self.is_connected(): raise RuntimeError("MockLF: Not connected.")
         if self._last_spectrum is not None:
             logging.debug("MockLF: Getting data...")
-            return self._last_spectrum.copy() # Return a copy
+            view = self._last_spectrum.view() # acquire() allocates a new array each time, so this stays valid
+            view.flags.writeable = False
+            return view
         else:
             logging.warning("MockLF: No data acquired yet.")
             return None
 
+    def get_wavelengths(self) -> typing.Union[np.ndarray, None]:
+        """Returns the simulated wavelength axis (read-only)."""
+        return self._wavelengths if self.is_connected() else None
+
+    def get_last_frame_np(self) -> typing.Union[tuple, None]:
+        """Returns (wavelengths, intensities) of the last spectrum, like the real controller."""
+        intensities = self.get_data()
+        if intensities is None:
+            return None
+        return self._wavelengths, intensities # Already float32
+
 # Example usage
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
+    real_time = "--real-time" in sys.argv # Default: simulated delays, so the self-test finishes instantly
 
     print("--- Testing Mock KDC101 ---")
-    mock_kdc = MockKDC101Controller()
+    mock_kdc = MockKDC101Controller(real_time=real_time)
     devices = mock_kdc.scan_devices()
     print(f"Found: {devices}")
     if devices:
@@ -194,7 +288,7 @@ if __name__ == "__main__":
             print("Connection failed.")
 
     print("\n--- Testing Mock LightField ---")
-    mock_lf = MockLightFieldController()
+    mock_lf = MockLightFieldController(real_time=real_time)
     if mock_lf.connect():
         print(f"Connected: {mock_lf.is_connected()}")
         mock_lf.set_experiment_settings(0.5, 3)
@@ -214,3 +308,4 @@ if __name__ == "__main__":
         print(f"Connected: {mock_lf.is_connected()}")
     else:
         print("Connection failed.")
+    print(f"\nSimulated hardware time: {SIM_CLOCK:.2f} s")
@@ -6,11 +6,48 @@ from matplotlib.axes import Axes # For type hinting
 import re # For filename parsing
 from scipy.optimize import curve_fit # For fitting
 import os # For basename in loading
+import threading
+import tkinter as tk # TclError from the drain timer
+import time
+import bisect
+import functools
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor # For parallel file loading
+from file_io_utils import load_spectrum_csv, load_spe_frame
+
+def _use_constrained_layout(fig):
+    """
+    Lets the figure lay itself out as part of its normal draws (constrained layout) instead of a
+    separate tight_layout renderer pass at setup, which was also only right for the initial figsize.
+    """
+    try:
+        if hasattr(fig, 'set_layout_engine'): # Matplotlib >= 3.6
+            fig.set_layout_engine('constrained')
+        else:
+            fig.set_constrained_layout(True)
+    except Exception as e:
+        logging.warning(f"Error enabling constrained layout: {e}")
+
+@functools.lru_cache(maxsize=8)
+def _fit_grid(lo: float, hi: float, n: int = 200) -> np.ndarray:
+    """Angle grid for drawing fit curves, shared between refits over the same data range (read-only)."""
+    grid = np.linspace(lo, hi, n)
+    grid.flags.writeable = False
+    return grid
+
+_ANGLE_RE = re.compile(r'_(-?\d+)p(\d+)') # Angle in saved filenames, e.g. "Name_10p0.csv" or "Name_-10p5.csv"
 
 class PlottingModule:
     """
     Handles updating the Matplotlib plots embedded in the GUI tabs.
     """
+    FILE_CACHE_MAX_BYTES = 256 * 1024 * 1024 # Parsed-file cache budget for load_analysis_data
+    MAX_CACHE_SIZE = 4096 # Entries kept in the (file, range) -> max intensity cache
+    LIVE_RESCALE_EVERY = 20 # Live frames between forced autoscales (so limits can shrink again)
+    MIN_DRAW_INTERVAL_S = 1 / 30 # Per-plot redraw rate cap; updates arriving faster are coalesced
+    ANALYSIS_INITIAL_CAPACITY = 64 # Starting size of the analysis point buffers (doubled when full)
+    LIVE_QUEUE_LEN = 4 # Live frames waiting for the GUI thread; older ones are dropped
+
     def __init__(self):
         logging.info("PlottingModule initialized.")
         self.live_ax: Axes | None = None
@@ -21,14 +58,68 @@ class PlottingModule:
         self.intensity_plot_points = None
         self.fit_plot_line = None
 
-        # Store data for analysis plot
-        self.angle_data = []
-        self.intensity_data = []
+        # Live plot blitting state (see _on_live_draw / _draw_live)
+        self._live_bg = None # Axes background without the spectrum line, re-captured on every full draw
+        self._live_full_redraw = False # Set by updates that need a rescale + full draw instead of a blit
+        self._live_frame_count = 0
+
+        # Redraw throttling (see _schedule_draw): plot name -> last draw time / names with a draw queued
+        self._last_draw: dict[str, float] = {}
+        self._draw_pending: set[str] = set()
+
+        # Handoff from the scan thread: it only appends here, a Tk timer (_drain_queues) does the plotting
+        self._live_queue = deque(maxlen=self.LIVE_QUEUE_LEN) # (spectrum, x_axis); only the newest is drawn
+        self._point_queue = deque() # (angle, max_intensity); every point is kept
+        self._gui_thread_id = None # Thread that owns the Tk canvas, set in setup_live_plot
+        self._drain_widget = None
+        self._drain_job = None # Armed by _arm_drain only while something is queued
+        self._drain_lock = threading.Lock()
+
+        # Store data for analysis plot: preallocated buffers, the first _n_points entries are valid
+        self._angle_buf = np.empty(self.ANALYSIS_INITIAL_CAPACITY, dtype=np.float64)
+        self._intensity_buf = np.empty(self.ANALYSIS_INITIAL_CAPACITY, dtype=np.float64)
+        self._n_points = 0
+        # Point indices in ascending-angle order, kept sorted on insert (plus the angles, as bisect keys)
+        self._sorted_idx: list[int] = []
+        self._sorted_angles: list[float] = []
 
         # Store fit function details (can be set by GUI later)
         self._fit_function = None
         self._fit_param_names = []
 
+        # load_analysis_data caches (LRU order, shared by its loader threads under _cache_lock)
+        self._file_cache: OrderedDict[tuple[str, float], tuple[np.ndarray, bool]] = OrderedDict() # (path, mtime) -> (parsed array, wavelengths sorted)
+        self._file_cache_bytes = 0
+        self._max_cache: OrderedDict[tuple, float] = OrderedDict() # (path, mtime, wvl_min, wvl_max) -> max intensity
+        self._cache_lock = threading.Lock()
+
+    @property
+    def angle_data(self) -> np.ndarray:
+        """Angles of the analysis points (a view into the buffer, no copy)."""
+        return self._angle_buf[:self._n_points]
+
+    @property
+    def intensity_data(self) -> np.ndarray:
+        """Intensities of the analysis points (a view into the buffer, no copy)."""
+        return self._intensity_buf[:self._n_points]
+
+    def _append_point(self, angle: float, intensity: float):
+        """Appends one analysis point, doubling the buffers when they are full."""
+        n = self._n_points
+        if n == len(self._angle_buf):
+            # Grow into new arrays; views handed out earlier keep pointing at the old ones
+            angle_buf = np.empty(2 * n, dtype=np.float64)
+            intensity_buf = np.empty(2 * n, dtype=np.float64)
+            angle_buf[:n] = self._angle_buf[:n]
+            intensity_buf[:n] = self._intensity_buf[:n]
+            self._angle_buf, self._intensity_buf = angle_buf, intensity_buf
+        self._angle_buf[n] = angle
+        self._intensity_buf[n] = intensity
+        self._n_points = n + 1
+        pos = bisect.bisect_right(self._sorted_angles, angle)
+        self._sorted_angles.insert(pos, angle)
+        self._sorted_idx.insert(pos, n)
+
     # --- Setup Methods (called by GUI tabs during initialization) ---
 
     def setup_live_plot(self, ax: Axes):
@@ -39,13 +130,15 @@ class PlottingModule:
         self.live_ax.set_ylabel("Intensity (Counts)")
         self.live_ax.grid(True)
         # Initialize the plot line (empty data initially)
-        self.live_plot_line, = self.live_ax.plot([], [], marker='.', linestyle='-', markersize=4)
+        # animated=True keeps the line out of full draws so it can be blitted over the cached background
+        self.live_plot_line, = self.live_ax.plot([], [], marker='.', linestyle='-', markersize=4, animated=True)
+        self.live_ax.figure.canvas.mpl_connect('draw_event', self._on_live_draw)
+        canvas = self.live_ax.figure.canvas
+        if hasattr(canvas, 'get_tk_widget'):
+            self._gui_thread_id = threading.get_ident()
+            self._drain_widget = canvas.get_tk_widget()
         logging.info("Live plot axes configured.")
-        # Ensure layout is adjusted
-        try:
-            self.live_ax.figure.tight_layout()
-        except Exception as e:
-            logging.warning(f"Error during live plot tight_layout: {e}")
+        _use_constrained_layout(self.live_ax.figure)
 
 
     def setup_analysis_plot(self, ax: Axes):
@@ -56,15 +149,11 @@ class PlottingModule:
         self.analysis_ax.set_ylabel("Integrated Intensity (a.u.)")
         self.analysis_ax.grid(True)
         # Initialize plot lines (empty data initially)
-        self.intensity_plot_points, = self.analysis_ax.plot([], [], 'bo', label='Data', markersize=5) # Points for data
+        self.intensity_plot_points = self.analysis_ax.scatter([], [], s=25, c='b', label='Data') # Points for data (PathCollection; s=25 matches markersize 5)
         self.fit_plot_line, = self.analysis_ax.plot([], [], 'r-', label='Fit') # Line for fit
         self.analysis_ax.legend()
         logging.info("Analysis plot axes configured.")
-        # Ensure layout is adjusted
-        try:
-            self.analysis_ax.figure.tight_layout(rect=[0, 0, 1, 0.97]) # Adjust rect if needed
-        except Exception as e:
-            logging.warning(f"Error during analysis plot tight_layout: {e}")
+        _use_constrained_layout(self.analysis_ax.figure)
 
 
     # --- Update Methods (called by scan logic or analysis module) ---
@@ -81,6 +170,10 @@ class PlottingModule:
         if self.live_ax is None or self.live_plot_line is None:
             logging.warning("Live plot axes not initialized. Cannot update plot.")
             return
+        if not self._on_gui_thread():
+            self._live_queue.append((spectrum_data, x_axis)) # Thread-safe; drawn by _drain_queues
+            self._arm_drain()
+            return
 
         if spectrum_data is None or spectrum_data.ndim != 1:
             logging.warning(f"Invalid spectrum data for live plot (ndim={spectrum_data.ndim if spectrum_data is not None else 'None'}).")
@@ -90,45 +183,145 @@ class PlottingModule:
 
         if x_axis is None:
             x_data = np.arange(len(spectrum_data))
-            self.live_ax.set_xlabel("Pixel Index")
+            xlabel = "Pixel Index"
         elif len(x_axis) == len(spectrum_data):
             x_data = x_axis
-            self.live_ax.set_xlabel("Wavelength (nm)") # Assume nm if x_axis provided
+            xlabel = "Wavelength (nm)" # Assume nm if x_axis provided
         else:
             logging.warning("x_axis length mismatch with spectrum_data. Using pixel indices.")
             x_data = np.arange(len(spectrum_data))
-            self.live_ax.set_xlabel("Pixel Index")
+            xlabel = "Pixel Index"
 
         # Update plot data
         self.live_plot_line.set_data(x_data, spectrum_data)
 
-        # Rescale axes
-        self.live_ax.relim()
-        self.live_ax.autoscale_view()
+        # A full redraw is only needed when the axes change; otherwise just blit the line
+        self._live_frame_count += 1
+        full_redraw = self._live_bg is None or self._live_frame_count % self.LIVE_RESCALE_EVERY == 0
+        if self.live_ax.get_xlabel() != xlabel:
+            self.live_ax.set_xlabel(xlabel)
+            full_redraw = True
+        if not full_redraw and spectrum_data.size:
+            xlo, xhi = sorted(self.live_ax.get_xlim())
+            ylo, yhi = sorted(self.live_ax.get_ylim())
+            full_redraw = (x_data.min() < xlo or x_data.max() > xhi
+                           or spectrum_data.min() < ylo or spectrum_data.max() > yhi)
+
+        if full_redraw:
+            self._live_full_redraw = True # Kept until the (possibly coalesced) draw runs
+        self._schedule_draw("live", self.live_ax, self._draw_live)
+        logging.debug("Live plot updated.")
+
+    def _on_gui_thread(self) -> bool:
+        """True if matplotlib may be called directly (the Tk thread, or no Tk canvas at all)."""
+        return self._drain_widget is None or threading.get_ident() == self._gui_thread_id
+
+    def _arm_drain(self):
+        """Schedules one _drain_queues tick unless one is already pending (called after queueing)."""
+        with self._drain_lock:
+            if self._drain_job is not None or self._drain_widget is None:
+                return
+            try:
+                self._drain_job = self._drain_widget.after(int(self.MIN_DRAW_INTERVAL_S * 1000), self._drain_queues)
+            except (tk.TclError, RuntimeError): # Widget destroyed / main loop gone
+                self._drain_widget = None
+
+    def _drain_queues(self):
+        """Tk timer: plots what the scan thread queued since it was armed; the next append re-arms it."""
+        with self._drain_lock:
+            self._drain_job = None # Cleared before draining so an append from now on arms a new tick
+        latest = None
+        while self._live_queue: # Only the newest queued frame is drawn
+            latest = self._live_queue.popleft()
+        if latest is not None:
+            self.update_live_plot(*latest)
+        n_points = len(self._point_queue)
+        if n_points:
+            for _ in range(n_points):
+                self._append_point(*self._point_queue.popleft())
+            if self.analysis_ax is not None: # Otherwise drawn once the analysis tab is built
+                self.update_analysis_plot()
+
+    def _on_live_draw(self, event):
+        """draw_event handler: caches the live axes background and paints the (animated) line on top."""
+        if self.live_ax is None or self.live_plot_line is None:
+            return
+        canvas = self.live_ax.figure.canvas
+        self._live_bg = canvas.copy_from_bbox(self.live_ax.bbox) # Also covers resizes, which trigger a full draw
+        self.live_ax.draw_artist(self.live_plot_line)
+
+    def _schedule_draw(self, name: str, ax: Axes, draw_fn):
+        """
+        Runs draw_fn on the Tk thread, at most once per MIN_DRAW_INTERVAL_S for each plot name.
+        Calls made while a draw is queued coalesce into it, so the latest data is what gets drawn.
+        """
+        if name in self._draw_pending:
+            return
+        self._draw_pending.add(name)
+        delay_ms = int((self._last_draw.get(name, 0.0) + self.MIN_DRAW_INTERVAL_S - time.monotonic()) * 1000)
+        canvas = ax.figure.canvas
+        if hasattr(canvas, 'get_tk_widget'):
+            widget = canvas.get_tk_widget() # Updates may come from the scan thread
+            if delay_ms > 0:
+                widget.after(delay_ms, self._run_draw, name, draw_fn)
+            else:
+                widget.after_idle(self._run_draw, name, draw_fn)
+        else:
+            self._run_draw(name, draw_fn)
 
-        # Redraw the canvas (use draw_idle for efficiency)
+    def _run_draw(self, name: str, draw_fn):
+        """Runs a draw queued by _schedule_draw."""
+        self._draw_pending.discard(name)
+        self._last_draw[name] = time.monotonic()
         try:
-            self.live_ax.figure.canvas.draw_idle()
-            logging.debug("Live plot updated.")
+            draw_fn()
         except Exception as e:
-            logging.error(f"Error drawing live plot canvas: {e}")
+            logging.error(f"Error drawing {name} plot canvas: {e}")
+
+    def _draw_live(self):
+        """Redraws the live plot: full rescale + draw if needed, else blits only the spectrum line."""
+        if self.live_ax is None or self.live_plot_line is None:
+            return
+        canvas = self.live_ax.figure.canvas
+        if self._live_full_redraw or self._live_bg is None:
+            self._live_full_redraw = False
+            # Rescale axes and redraw everything (the draw_event re-captures the background)
+            self.live_ax.relim()
+            self.live_ax.autoscale_view()
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self._live_bg)
+        self.live_ax.draw_artist(self.live_plot_line)
+        canvas.blit(self.live_ax.bbox)
+
+    def _draw_analysis(self):
+        """Rescales and redraws the analysis plot."""
+        if self.analysis_ax is None:
+            return
+        self.analysis_ax.relim() # Covers the fit line only; relim skips collections
+        if self.intensity_plot_points is not None and len(self.intensity_plot_points.get_offsets()):
+            self.analysis_ax.update_datalim(self.intensity_plot_points.get_offsets())
+        self.analysis_ax.autoscale_view()
+        self.analysis_ax.figure.canvas.draw_idle()
 
     def add_analysis_point(self, angle: float, intensity: float):
         """Adds a single data point to the internal storage for the analysis plot."""
-        self.angle_data.append(angle)
-        self.intensity_data.append(intensity)
+        self._append_point(angle, intensity)
         logging.debug(f"Added analysis point: Angle={angle:.2f}, Intensity={intensity:.2f}")
         # Update the plot immediately with the new point
         self.update_analysis_plot()
 
     def add_intensity_analysis_point(self, angle: float, max_intensity: float):
         """Adds a single data point (angle, max_intensity) from dynamic scan analysis."""
-        if self.analysis_ax is None:
-            logging.warning("Analysis plot axes not initialized. Cannot add point.")
+        if not self._on_gui_thread():
+            self._point_queue.append((angle, max_intensity)) # Appended and drawn by _drain_queues
+            self._arm_drain()
             return
-        self.angle_data.append(angle)
-        self.intensity_data.append(max_intensity)
+        self._append_point(angle, max_intensity)
         logging.debug(f"Added dynamic analysis point: Angle={angle:.2f}, Max Intensity={max_intensity:.3f}")
+        # The analysis tab is built on first view; points are kept and drawn once its axes exist
+        if self.analysis_ax is None:
+            return
         # Update the plot immediately
         self.update_analysis_plot()
 
@@ -147,14 +340,14 @@ class PlottingModule:
             return
 
         # Update data points
-        self.intensity_plot_points.set_data(self.angle_data, self.intensity_data)
+        self.intensity_plot_points.set_offsets(np.column_stack((self.angle_data, self.intensity_data)))
 
         # Update fit line
         if fit_curve is not None:
             if fit_angles is None:
                 # Assume fit corresponds to the collected angle data, sort for line plot
-                sorted_indices = np.argsort(self.angle_data)
-                fit_angles_sorted = np.array(self.angle_data)[sorted_indices]
+                sorted_indices = np.array(self._sorted_idx, dtype=np.intp) # Maintained by _append_point, no argsort
+                fit_angles_sorted = self.angle_data[sorted_indices]
                 fit_curve_sorted = fit_curve[sorted_indices]
                 self.fit_plot_line.set_data(fit_angles_sorted, fit_curve_sorted)
             elif len(fit_angles) == len(fit_curve):
@@ -166,22 +359,17 @@ class PlottingModule:
         else:
             self.fit_plot_line.set_data([], []) # Clear fit line if no fit provided
 
-        # Rescale axes
-        self.analysis_ax.relim()
-        self.analysis_ax.autoscale_view()
-
-        # Redraw the canvas
-        try:
-            self.analysis_ax.figure.canvas.draw_idle()
-            logging.debug("Analysis plot updated.")
-        except Exception as e:
-            logging.error(f"Error drawing analysis plot canvas: {e}")
+        # Rescale and redraw (throttled; a burst of new points is drawn once)
+        self._schedule_draw("analysis", self.analysis_ax, self._draw_analysis)
+        logging.debug("Analysis plot updated.")
 
     def clear_analysis_data(self):
         """Clears the stored data and resets the analysis plot."""
         logging.info("Clearing analysis data and plot.")
-        self.angle_data = []
-        self.intensity_data = []
+        self._point_queue.clear() # Points queued by a running scan but not yet drained
+        self._n_points = 0 # Buffers are kept and overwritten by the next points
+        self._sorted_idx = []
+        self._sorted_angles = []
         # Call update_analysis_plot to clear the visual plot as well
         self.update_analysis_plot(fit_curve=None, fit_angles=None)
     
@@ -189,12 +377,23 @@ class PlottingModule:
         """Cleans up Matplotlib figures and resources."""
         logging.info("Cleaning up plotting resources...")
         try:
+            with self._drain_lock:
+                if self._drain_widget is not None and self._drain_job is not None:
+                    try:
+                        self._drain_widget.after_cancel(self._drain_job)
+                    except tk.TclError:
+                        pass
+                self._drain_widget = None
+                self._drain_job = None
+            self._live_queue.clear()
+            self._point_queue.clear()
             if self.live_ax and self.live_ax.figure:
                 logging.debug("Closing live plot figure.")
                 # Clear the figure first, then close it
                 self.live_ax.figure.clf()
                 plt.close(self.live_ax.figure)
                 self.live_ax = None # Clear references
+                self._live_bg = None
                 self.live_plot_line = None
             if self.analysis_ax and self.analysis_ax.figure:
                 logging.debug("Closing analysis plot figure.")
@@ -211,6 +410,100 @@ class PlottingModule:
 
     # --- New Data Loading and Fitting Methods ---
 
+    def _read_cached(self, fpath: str, mtime: float) -> tuple[np.ndarray, bool]:
+        """
+        Returns (parsed file, wavelength column is ascending), re-reading the file only if
+        unseen or modified since it was cached.
+        """
+        key = (fpath, mtime)
+        with self._cache_lock:
+            entry = self._file_cache.get(key)
+            if entry is not None:
+                self._file_cache.move_to_end(key)
+                return entry
+        data = load_spectrum_csv(fpath) # Parse outside the lock so loader threads overlap
+        is_sorted = data.ndim == 2 and bool(np.all(data[1:, 0] >= data[:-1, 0])) # Checked once per parse
+        entry = (data, is_sorted)
+        with self._cache_lock:
+            if key not in self._file_cache:
+                self._file_cache[key] = entry
+                self._file_cache_bytes += data.nbytes
+                while self._file_cache_bytes > self.FILE_CACHE_MAX_BYTES and len(self._file_cache) > 1:
+                    _, (evicted, _) = self._file_cache.popitem(last=False)
+                    self._file_cache_bytes -= evicted.nbytes
+        return entry
+
+    def _load_one(self, fpath: str, wvl_min: float, wvl_max: float) -> tuple[float | None, float | None, str | None]:
+        """
+        Loads one CSV file for load_analysis_data (runs on a worker thread).
+
+        Returns:
+            tuple: (angle, max_intensity, None) on success, (None, None, error_message) otherwise.
+        """
+        filename = os.path.basename(fpath)
+        logging.debug(f"Processing file: {filename}")
+        try:
+            # Extract angle from filename (e.g., "Name_10p0.csv" or "Name_-10p5.csv")
+            match = _ANGLE_RE.search(filename)
+            if not match:
+                logging.warning(f"Could not extract angle from filename: {filename}. Skipping.")
+                return None, None, f"No angle in {filename}"
+
+            angle_str = f"{match.group(1)}.{match.group(2)}"
+            angle = float(angle_str)
+
+            mtime = os.path.getmtime(fpath)
+            max_key = (fpath, mtime, wvl_min, wvl_max)
+            with self._cache_lock:
+                max_intensity = self._max_cache.get(max_key)
+                if max_intensity is not None: self._max_cache.move_to_end(max_key)
+            if max_intensity is not None:
+                return angle, max_intensity, None
+
+            if fpath.lower().endswith('.spe'):
+                # Memory-mapped, not cached: only the pages inside the wavelength window get read
+                wavelength_data, intensity_data_full = load_spe_frame(fpath)
+                wvl_sorted = bool(np.all(wavelength_data[1:] >= wavelength_data[:-1]))
+            else:
+                # Load data (expecting wavelength, intensity)
+                loaded_data, wvl_sorted = self._read_cached(fpath, mtime)
+                if loaded_data.ndim != 2 or loaded_data.shape[1] != 2:
+                    logging.warning(f"Unexpected data shape {loaded_data.shape} in {filename}. Skipping.")
+                    return None, None, f"Bad format in {filename}"
+
+                wavelength_data = loaded_data[:, 0]
+                intensity_data_full = loaded_data[:, 1]
+
+            # Calculate max intensity in range
+            if wvl_sorted:
+                # Spectrometer wavelengths ascend: locate the range by bisection, no mask or copy
+                lo = np.searchsorted(wavelength_data, wvl_min, side='left')
+                hi = np.searchsorted(wavelength_data, wvl_max, side='right')
+                in_range = intensity_data_full[lo:hi]
+            else:
+                in_range = intensity_data_full[(wavelength_data >= wvl_min) & (wavelength_data <= wvl_max)]
+            if in_range.size == 0:
+                logging.warning(f"No data points found within range [{wvl_min}, {wvl_max}] in {filename}. Skipping.")
+                return None, None, f"No data in range for {filename}"
+
+            max_intensity = float(in_range.max()) # Plain float, also for memmapped integer SPE data
+            with self._cache_lock:
+                self._max_cache[max_key] = max_intensity
+                if len(self._max_cache) > self.MAX_CACHE_SIZE:
+                    self._max_cache.popitem(last=False)
+            logging.debug(f"Loaded point from {filename}: Angle={angle:.2f}, Max Intensity={max_intensity:.3f}")
+            return angle, max_intensity, None
+
+        except FileNotFoundError:
+            logging.error(f"File not found: {fpath}")
+            return None, None, f"Not found: {filename}"
+        except ValueError as ve:
+            logging.error(f"ValueError processing {filename}: {ve}")
+            return None, None, f"Value error in {filename}"
+        except Exception as e:
+            logging.exception(f"Unexpected error processing {filename}:")
+            return None, None, f"Error in {filename}"
+
     def load_analysis_data(self, filepaths: list[str], wvl_min: float | None, wvl_max: float | None) -> tuple[bool, str]:
         """
         Loads intensity data from multiple CSV files, calculates max intensity in range,
@@ -235,54 +528,17 @@ class PlottingModule:
             logging.error(msg)
             return False, msg
 
-        for fpath in filepaths:
-            filename = os.path.basename(fpath)
-            logging.debug(f"Processing file: {filename}")
-            try:
-                # Extract angle from filename (e.g., "Name_10p0.csv" or "Name_-10p5.csv")
-                match = re.search(r'_(-?\d+)p(\d+)', filename)
-                if not match:
-                    logging.warning(f"Could not extract angle from filename: {filename}. Skipping.")
-                    error_messages.append(f"No angle in {filename}")
-                    continue
-
-                angle_str = f"{match.group(1)}.{match.group(2)}"
-                angle = float(angle_str)
+        # Parse files in parallel (np.loadtxt dominates); map() keeps results in filepaths order
+        n_workers = max(1, min(len(filepaths), os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="load-analysis") as pool:
+            results = list(pool.map(lambda fpath: self._load_one(fpath, wvl_min, wvl_max), filepaths))
 
-                # Load data (expecting wavelength, intensity)
-                loaded_data = np.loadtxt(fpath, delimiter='\t')
-                if loaded_data.ndim != 2 or loaded_data.shape[1] != 2:
-                    logging.warning(f"Unexpected data shape {loaded_data.shape} in {filename}. Skipping.")
-                    error_messages.append(f"Bad format in {filename}")
-                    continue
-
-                wavelength_data = loaded_data[:, 0]
-                intensity_data_full = loaded_data[:, 1]
-
-                # Calculate max intensity in range
-                mask = (wavelength_data >= wvl_min) & (wavelength_data <= wvl_max)
-                if not np.any(mask):
-                    logging.warning(f"No data points found within range [{wvl_min}, {wvl_max}] in {filename}. Skipping.")
-                    error_messages.append(f"No data in range for {filename}")
-                    continue
-
-                max_intensity = np.max(intensity_data_full[mask])
-
-                # Add data point
-                self.angle_data.append(angle)
-                self.intensity_data.append(max_intensity)
-                loaded_count += 1
-                logging.debug(f"Loaded point from {filename}: Angle={angle:.2f}, Max Intensity={max_intensity:.3f}")
-
-            except FileNotFoundError:
-                logging.error(f"File not found: {fpath}")
-                error_messages.append(f"Not found: {filename}")
-            except ValueError as ve:
-                logging.error(f"ValueError processing {filename}: {ve}")
-                error_messages.append(f"Value error in {filename}")
-            except Exception as e:
-                logging.exception(f"Unexpected error processing {filename}:")
-                error_messages.append(f"Error in {filename}")
+        for angle, max_intensity, error in results:
+            if error is not None:
+                error_messages.append(error)
+                continue
+            self._append_point(angle, max_intensity)
+            loaded_count += 1
 
         if loaded_count > 0:
             self.update_analysis_plot() # Update plot with loaded data
@@ -299,7 +555,7 @@ class PlottingModule:
             return False, msg
 
 
-    def fit_intensity_data(self, fit_func, p0, bounds, fixed_params_mask=None, param_names=None) -> tuple[dict | None, dict | None, str]:
+    def fit_intensity_data(self, fit_func, p0, bounds, fixed_params_mask=None, param_names=None, jac=None) -> tuple[dict | None, dict | None, str]:
         """
         Fits the current angle_data and intensity_data using scipy.optimize.curve_fit.
 
@@ -310,6 +566,8 @@ class PlottingModule:
             fixed_params_mask (list[bool] | None): Boolean mask indicating which parameters are fixed.
                                                 If None, all parameters are varied.
             param_names (list[str] | None): Names of the parameters for result display.
+            jac (callable | None): Optional analytic Jacobian jac(x, *params) -> (N, P) array for
+                                   fit_func; avoids curve_fit's finite-difference evaluations.
 
         Returns:
             tuple[dict | None, dict | None, str]: (fit_params, fit_errors, status_message)
@@ -317,7 +575,7 @@ class PlottingModule:
                 fit_errors: Dictionary of parameter names and standard deviations.
                 status_message: Message indicating success or failure.
         """
-        if not self.angle_data or not self.intensity_data or len(self.angle_data) < 3:
+        if self._n_points < 3:
             msg = "Not enough data points to perform fit."
             logging.warning(msg)
             return None, None, msg
@@ -327,8 +585,8 @@ class PlottingModule:
             logging.error(msg)
             return None, None, msg
 
-        angles_deg = np.array(self.angle_data)
-        intensities = np.array(self.intensity_data)
+        angles_deg = self.angle_data # Views; curve_fit only reads them
+        intensities = self.intensity_data
 
         # --- Handle fixed parameters (if any) ---
         # curve_fit doesn't directly support fixing parameters easily.
@@ -341,13 +599,26 @@ class PlottingModule:
             logging.warning(msg)
             return None, None, msg
 
-        # Create a wrapper function that only takes the varied parameters
-        def wrapped_fit_func(x, *varied_args):
-            all_args = list(p0) # Start with initial guesses (or fixed values)
-            for i, arg_val in enumerate(varied_args):
-                all_args[varied_indices[i]] = arg_val
-            # Fixed parameters remain at their p0 value
-            return fit_func(x, *all_args)
+        if len(varied_indices) == len(p0):
+            # Nothing fixed: fit the model directly, no per-evaluation wrapper
+            wrapped_fit_func = fit_func
+            wrapped_jac = jac
+        else:
+            # Wrappers taking only the varied parameters; fixed ones stay at their p0 value.
+            # all_args is reused across calls, the varied slots overwritten by one fancy-indexed store.
+            all_args = np.asarray(p0, dtype=np.float64).copy()
+            var_idx = np.asarray(varied_indices, dtype=np.intp)
+
+            def wrapped_fit_func(x, *varied_args):
+                all_args[var_idx] = varied_args
+                return fit_func(x, *all_args)
+
+            # Jacobian columns of the varied parameters only
+            wrapped_jac = None
+            if jac is not None:
+                def wrapped_jac(x, *varied_args):
+                    all_args[var_idx] = varied_args
+                    return np.asarray(jac(x, *all_args))[:, var_idx]
 
         # Adjust p0 and bounds for the wrapper function
         p0_varied = [p0[i] for i in varied_indices]
@@ -364,31 +635,31 @@ class PlottingModule:
                 intensities,
                 p0=p0_varied,
                 bounds=bounds_varied,
+                jac=wrapped_jac if wrapped_jac is not None else '2-point',
+                method='trf', # What curve_fit picks for bounded fits anyway; explicit for x_scale
+                x_scale='jac', # Parameters differ by orders of magnitude (offset/amplitude vs. degrees)
                 maxfev=5000 # Increase max iterations
             )
 
-            # Reconstruct full popt and pcov
-            popt = list(p0) # Start with initial/fixed values
-            perr = [np.inf] * len(p0) # Initialize errors
-            pcov = np.full((len(p0), len(p0)), np.inf) # Initialize full covariance
-
-            for i, idx_varied in enumerate(varied_indices):
-                popt[idx_varied] = popt_varied[i]
-                # Fill diagonal elements for varied params' errors
-                if pcov_varied.shape == (len(popt_varied), len(popt_varied)):
-                    perr[idx_varied] = np.sqrt(np.diag(pcov_varied))[i] if np.diag(pcov_varied)[i] >= 0 else np.inf
-                    # Fill the corresponding submatrix in the full pcov
-                    for j, idx_varied2 in enumerate(varied_indices):
-                        pcov[idx_varied, idx_varied2] = pcov_varied[i, j]
-                else: # Handle cases where curve_fit returns 1D variance array
-                    if i < len(pcov_varied):
-                        perr[idx_varied] = np.sqrt(pcov_varied[i]) if pcov_varied[i] >= 0 else np.inf
-                        pcov[idx_varied, idx_varied] = pcov_varied[i]
+            # Reconstruct full popt, perr and pcov (fixed parameters keep p0 and infinite errors)
+            idx = np.asarray(varied_indices, dtype=np.intp)
+            popt = np.asarray(p0, dtype=np.float64).copy()
+            popt[idx] = popt_varied
+            perr = np.full(len(p0), np.inf)
+            pcov = np.full((len(p0), len(p0)), np.inf)
+            if pcov_varied.ndim == 2:
+                variances = np.diag(pcov_varied)
+                pcov[np.ix_(idx, idx)] = pcov_varied
+            else: # Handle cases where curve_fit returns 1D variance array
+                variances = np.asarray(pcov_varied)
+                pcov[idx, idx] = variances
+            with np.errstate(invalid='ignore'):
+                perr[idx] = np.where(variances < 0, np.inf, np.sqrt(variances)) # Negative variance -> inf, as before
 
 
             # Generate smooth curve for plotting
             min_angle, max_angle = np.min(angles_deg), np.max(angles_deg)
-            fit_angles_deg = np.linspace(min_angle, max_angle, 200)
+            fit_angles_deg = _fit_grid(float(min_angle), float(max_angle))
             fit_curve = fit_func(fit_angles_deg, *popt) # Use original function with full popt
 
             # Update the plot with the fit
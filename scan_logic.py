@@ -10,15 +10,116 @@ import os
 from analysis_module import AnalysisModule # Import
 from plotting_module import PlottingModule # Import
 # from file_io_utils import save_scan_data # Import save function later
+from file_io_utils import load_spectrum_csv
+try:
+    # Optional: lets the scan block on a directory-change notification instead of polling for each file
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+try:
+    import h5py # Optional: results and spectra are streamed to an HDF5 file as the scan runs
+except ImportError:
+    h5py = None
+
+
+class _FileArrivalWatcher(FileSystemEventHandler):
+    """
+    Watches a directory (via watchdog) and sets a per-file Event when an expected file appears.
+    Register the path with expect() before triggering whatever writes it, so the event can't be missed.
+    """
+    def __init__(self, directory: str):
+        super().__init__()
+        self._expected = {} # normalized path -> threading.Event
+        self._lock = threading.Lock()
+        self._observer = Observer()
+        self._observer.schedule(self, directory, recursive=False)
+        self._observer.daemon = True
+        self._observer.start()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def expect(self, path: str) -> threading.Event:
+        """Returns the Event that is set once path is created (or renamed into place)."""
+        event = threading.Event()
+        with self._lock:
+            self._expected[self._key(path)] = event
+        return event
+
+    def forget(self, path: str):
+        with self._lock:
+            self._expected.pop(self._key(path), None)
+
+    def _notify(self, path: str):
+        with self._lock:
+            event = self._expected.pop(self._key(path), None)
+        if event is not None:
+            event.set()
+
+    def on_created(self, event):
+        self._notify(event.src_path)
+
+    def on_moved(self, event):
+        self._notify(event.dest_path)
+
+    def stop(self):
+        self._observer.stop()
+        self._observer.join(timeout=1.0)
+
+
+class _ScanHDF5Writer:
+    """
+    Appends each scan step to an HDF5 file: 'results' (one record per step), 'spectra' (one row per step,
+    NaN where no spectrum was loaded; absent if no step had one) and 'wavelengths'.
+    Data reaches disk every FLUSH_EVERY steps and on close.
+    """
+    FLUSH_EVERY = 10
+
+    def __init__(self, path: str, result_dtype: np.dtype):
+        self.path = path
+        self._file = h5py.File(path, 'w', libver='latest')
+        self._results = self._file.create_dataset('results', shape=(0,), maxshape=(None,), dtype=result_dtype, chunks=True)
+        self._spectra = None # Created with the first spectrum, once its width is known
+
+    def write_step(self, i: int, record: np.void, spectrum: np.ndarray | None, wavelengths: np.ndarray | None):
+        self._results.resize(i + 1, axis=0)
+        self._results[i] = record
+        if spectrum is not None and self._spectra is None:
+            self._file.create_dataset('wavelengths', data=np.asarray(wavelengths, dtype=np.float32))
+            self._spectra = self._file.create_dataset(
+                'spectra', shape=(0, spectrum.size), maxshape=(None, spectrum.size), dtype=np.float32,
+                chunks=(1, spectrum.size), compression='lzf', fillvalue=np.nan)
+        if self._spectra is not None:
+            self._spectra.resize(i + 1, axis=0) # Every step, so rows stay aligned with 'results' (NaN fill)
+            if spectrum is not None and spectrum.size == self._spectra.shape[1]:
+                self._spectra[i] = spectrum
+        if (i + 1) % self.FLUSH_EVERY == 0:
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
 
 class ScanLogic:
     """
     Handles the execution of the polarization scan loop in a separate thread.
     Communicates with hardware controllers and modules, and updates the GUI via callbacks.
     """
+    # Scan control states (self._state); written under self._cv, read lock-free by the scan loop
+    STATE_RUNNING = 0
+    STATE_PAUSED = 1
+    STATE_ABORT = 2
+    ETA_SMOOTHING = 0.1 # Weight of the newest step duration in the ETA's moving average
+    FILE_SETTLE_S = 0.02 # A saved file counts as complete once its size is unchanged for this long
+    # One record per step; max_in_range is the dynamic-intensity point (NaN when not computed)
+    RESULT_DTYPE = np.dtype([('angle_target', 'f8'), ('angle_actual', 'f8'), ('intensity', 'f8'), ('max_in_range', 'f4')])
+
     # Add eta_callback to __init__
     def __init__(self, kdc_controller, lf_controller, analysis_module: AnalysisModule, plotting_module: PlottingModule,
-                status_callback, progress_callback, completion_callback, eta_callback):
+                status_callback, progress_callback, completion_callback, eta_callback, scan_state_callback=None):
         """
         Initializes the ScanLogic.
 
@@ -31,6 +132,8 @@ class ScanLogic:
             progress_callback: Function to update the GUI progress bar and step count.
             completion_callback: Function to call when the scan finishes.
             eta_callback: Function to update the GUI ETA display.
+            scan_state_callback: Optional function posting a step's status and progress/ETA together
+                (status, progress, current_step, total_steps, eta_sec); one GUI post per step instead of two.
         """
         self.kdc = kdc_controller
         self.lf = lf_controller
@@ -39,15 +142,53 @@ class ScanLogic:
         self.update_status = status_callback
         self.update_progress = progress_callback # This likely needs modification in main_app to handle ETA
         self.update_eta = eta_callback # Store the new callback
+        self.update_scan_state = scan_state_callback
         self.scan_completed = completion_callback
 
         self._scan_thread = None
-        self._abort_event = threading.Event() # Renamed from _stop_event
-        self._pause_event = threading.Event()
-        self._pause_event.set() # Start in the "not paused" state (event is set)
+        self._state = self.STATE_RUNNING # Replaces the former abort/pause Events
+        self._cv = threading.Condition() # Wakes the loop when a pause ends
         self.scan_parameters = {} # Stores parameters for the current scan
         self.scan_running = False
         self._current_scan_params = {} # Store validated params for loop access
+        # (axis size, first, last wavelength, wvl_min, wvl_max) -> in-range slice (None: axis not ascending).
+        # The spectrometer axis rarely changes, so this carries over between steps and scans.
+        self._wvl_slice_cache = {}
+        self._results = np.empty(0, dtype=self.RESULT_DTYPE) # Per-step results, preallocated at scan start
+        self._n_results = 0 # Steps filled so far (fewer than len(_results) after an abort)
+        self._spectra = None # (steps, pixels) float32, allocated once the first spectrum's size is known
+        self._spectra_wavelengths = None # Wavelength axis shared by all rows of _spectra
+
+    def get_results(self) -> np.ndarray:
+        """
+        Returns the completed steps of the current/last scan as a structured array with fields
+        'angle_target', 'angle_actual', 'intensity' and 'max_in_range' (e.g. results['intensity'] for one column).
+        With the dynamic-intensity plot enabled, results['max_in_range'] is the complete analysis curve.
+        """
+        return self._results[:self._n_results]
+
+    def get_spectra(self) -> tuple[np.ndarray | None, np.ndarray | None]:
+        """
+        Returns (wavelengths, spectra) of the current/last scan: spectra has one float32 row per
+        completed step (NaN where no spectrum was loaded). (None, None) before any spectrum arrived.
+        """
+        if self._spectra is None:
+            return None, None
+        return self._spectra_wavelengths, self._spectra[:self._n_results]
+
+    def max_intensity_in_range(self, wvl_min: float, wvl_max: float) -> np.ndarray | None:
+        """Per-step maximum intensity within [wvl_min, wvl_max], computed over all stored spectra at once."""
+        wavelengths, spectra = self.get_spectra()
+        if spectra is None:
+            return None
+        wvl_range_slice = self._wavelength_range_slice(wavelengths, wvl_min, wvl_max)
+        if wvl_range_slice is not None:
+            in_range = spectra[:, wvl_range_slice]
+        else: # Axis not ascending
+            in_range = spectra[:, (wavelengths >= wvl_min) & (wavelengths <= wvl_max)]
+        if in_range.shape[1] == 0:
+            return None
+        return np.nanmax(in_range, axis=1)
 
     def is_running(self):
         """Returns True if a scan is currently active."""
@@ -64,7 +205,7 @@ class ScanLogic:
         # Log connection checks
         kdc_conn = self.kdc and self.kdc.is_connected()
         lf_conn = self.lf and self.lf.is_connected()
-        logging.debug(f"Connection check: KDC={kdc_conn}, LF={lf_conn}")
+        logging.debug("Connection check: KDC=%s, LF=%s", kdc_conn, lf_conn)
 
         if not kdc_conn:
             self.update_status("KDC101 not connected. Cannot start scan.", error=True)
@@ -79,8 +220,7 @@ class ScanLogic:
         self._current_scan_params = parameters.copy()
         self.scan_parameters = parameters # Keep this for potential external access? Or remove? Let's keep for now.
 
-        self._abort_event.clear() # Clear abort flag
-        self._pause_event.set() # Ensure scan starts in non-paused state
+        self._set_state(self.STATE_RUNNING) # Clear abort flag, ensure scan starts in non-paused state
         self.scan_running = True
 
         self.update_status("Starting scan...")
@@ -91,7 +231,7 @@ class ScanLogic:
         self._scan_thread = threading.Thread(target=self._run_scan_loop, daemon=True)
         logging.debug("Starting scan thread...") # Log before thread start
         self._scan_thread.start()
-        logging.info(f"Scan thread started with parameters: {parameters}")
+        logging.info("Scan thread started with parameters: %s", parameters)
 
     def stop_scan(self):
         """Signals the scan thread to stop."""
@@ -102,9 +242,7 @@ class ScanLogic:
 
         logging.info("Stop signal received for scan thread.")
         self.update_status("Stopping scan...")
-        # Assuming _stop_event was the old name for _abort_event
-        self._abort_event.set() # Use the correct event name
-        self._pause_event.set() # Ensure it can exit if paused
+        self._set_state(self.STATE_ABORT) # Also wakes it if paused
         # The completion callback will be called from within the thread when it exits
 
     # --- New Pause/Resume Methods ---
@@ -113,14 +251,14 @@ class ScanLogic:
         if self.is_running():
             logging.info("Pause signal received for scan thread.")
             self.update_status("Pausing scan...")
-            self._pause_event.clear() # Clear the event to block wait()
+            self._set_state(self.STATE_PAUSED, only_from=self.STATE_RUNNING) # Never overrides an abort
 
     def resume_scan(self):
         """Signals the scan thread to resume."""
         if self.is_running():
             logging.info("Resume signal received for scan thread.")
             self.update_status("Resuming scan...")
-            self._pause_event.set() # Set the event to unblock wait()
+            self._set_state(self.STATE_RUNNING, only_from=self.STATE_PAUSED)
 
     # --- Renamed stop_scan to abort_scan ---
     def abort_scan(self):
@@ -131,15 +269,80 @@ class ScanLogic:
 
         logging.info("Abort signal received for scan thread.")
         self.update_status("Aborting scan...")
-        self._abort_event.set()
-        # Ensure scan resumes if paused, so it can check the abort flag and exit
-        self._pause_event.set()
+        # Waking a paused scan lets it see the abort and exit
+        self._set_state(self.STATE_ABORT)
         # The completion callback will be called from within the thread when it exits
 
+    def _set_state(self, state: int, only_from: int | None = None):
+        """Sets the control state (optionally only if currently only_from) and wakes a paused loop."""
+        with self._cv:
+            if only_from is None or self._state == only_from:
+                self._state = state
+                self._cv.notify_all()
+
+    def _wait_while_paused(self):
+        """Blocks the scan thread while paused; returns on resume or abort."""
+        with self._cv:
+            while self._state == self.STATE_PAUSED:
+                self._cv.wait()
+
+
+    @classmethod
+    def _wait_until_written(cls, path: str, deadline: float) -> bool:
+        """
+        Waits until path is non-empty and its size is unchanged over FILE_SETTLE_S (i.e. the writer is done).
+        Returns False if that does not happen before deadline (time.monotonic()).
+        """
+        last_size = -1
+        while True:
+            try:
+                size = os.stat(path).st_size
+            except FileNotFoundError:
+                size = 0
+            if size and size == last_size:
+                return True
+            last_size = size
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logging.warning(f"{path} still empty or growing at the deadline.")
+                return False
+            time.sleep(min(cls.FILE_SETTLE_S, remaining))
+
+    @staticmethod
+    def angle_grid(start: float, end: float, step: float) -> np.ndarray:
+        """
+        Scan angles from start in increments of step, never going past end.
+        Points are computed as start + k*step (no accumulated rounding); when the range is a whole
+        number of steps the grid comes from linspace, so both endpoints are exact. Otherwise the
+        last point is the last whole step before end (e.g. 0 -> 30 in steps of 20 gives [0, 20]).
+        """
+        if step == 0:
+            raise ValueError("Step size cannot be zero")
+        if (end - start) * step < 0:
+            raise ValueError("Step size sign does not match the scan direction")
+        n = int(np.floor(abs(end - start) / abs(step) + 1e-9)) + 1
+        if abs(start + (n - 1) * step - end) <= 1e-9 * abs(step):
+            return np.linspace(start, end, n)
+        return start + step * np.arange(n, dtype=np.float64)
+
+    @staticmethod
+    def _wavelength_range_slice(wavelength_data: np.ndarray, wvl_min: float, wvl_max: float) -> slice | None:
+        """
+        Returns the slice of an ascending wavelength axis covering [wvl_min, wvl_max] (inclusive),
+        or None if the axis is not ascending and a boolean mask has to be used instead.
+        """
+        if wavelength_data.size > 1 and wavelength_data[0] > wavelength_data[-1]:
+            return None
+        i_min = int(np.searchsorted(wavelength_data, wvl_min, side='left'))
+        i_max = int(np.searchsorted(wavelength_data, wvl_max, side='right'))
+        return slice(i_min, i_max)
 
     def _run_scan_loop(self):
         """The main loop executed by the scan thread."""
         logging.debug("_run_scan_loop thread started.") # Log thread entry
+        file_watcher = None
+        h5_writer = None
+        pending_move = None # Next step's move, started once the current acquisition is done
         try:
             # Use the stored _current_scan_params for reliability within the thread
             start = self._current_scan_params['start_angle']
@@ -179,59 +382,106 @@ class ScanLogic:
             logging.info(f"Scan Params: Exp={exposure_sec*1000:.1f}ms, Accum={accumulations}, Base={base_filename}, SaveDir={save_directory}, Plot={plot_live}")
             # --- End Get other params ---
 
-            logging.debug("Calculating angles...")
-            angles = np.arange(start, end + step / 2, step)
-            if abs(angles[-1] - end) > abs(step / 2):
-                angles = np.arange(start, end, step)
-            num_steps = len(angles)
+            if Observer is not None:
+                try:
+                    file_watcher = _FileArrivalWatcher(save_directory)
+                except Exception as watch_e: # e.g. directory missing or watch limit reached
+                    logging.warning(f"Could not watch {save_directory}, polling for files instead: {watch_e}")
+
+            if self._current_scan_params.get('save_hdf5', False) and h5py is None:
+                logging.warning("HDF5 output requested but h5py is not installed.")
+                self.update_status("Warning: h5py not installed, HDF5 output skipped.", error=True)
+            elif self._current_scan_params.get('save_hdf5', False):
+                h5_path = os.path.join(save_directory, f"{base_filename}_{time.strftime('%Y%m%d-%H%M%S')}.h5")
+                try:
+                    h5_writer = _ScanHDF5Writer(h5_path, self.RESULT_DTYPE)
+                    logging.info(f"Streaming scan results to {h5_path}")
+                except Exception as h5_e:
+                    logging.warning(f"Could not create {h5_path}, results are kept in memory only: {h5_e}")
+
+            angles = self._current_scan_params.get('angles') # Precomputed by ScanParamsFrame
+            if angles is None:
+                logging.debug("Calculating angles...")
+                angles = self.angle_grid(start, end, step)
+            num_steps = self._current_scan_params.get('n_steps', len(angles))
             logging.info(f"Scan angles ({num_steps} steps): {angles}")
 
-            start_time = time.time() # Record start time for ETA calculation
+            csv_path_prefix = os.path.join(save_directory, '') # Directory plus separator, joined once per scan
+            get_frame = getattr(self.lf, 'get_last_frame_np', None) # In-memory spectrum; CSV is the fallback
+            last_step_end = time.monotonic() # For per-step durations (ETA)
+            step_time_ema = None # Exponential moving average of the step duration
 
             # if self.plotter:
                 # Commented out plotting/analysis
                 # self.plotter.clear_analysis_data()
 
-            all_results = []
+            self._results = np.empty(len(angles), dtype=self.RESULT_DTYPE)
+            self._n_results = 0
+            self._spectra = None
+            self._spectra_wavelengths = None
             logging.debug("Starting scan loop...")
+            # Per-step calls bound once; the loop body then skips the attribute lookups
+            kdc_move_to = self.kdc.move_to
+            kdc_wait_for_move = self.kdc.wait_for_move
+            kdc_get_position = self.kdc.get_position
+            lf_set_base_filename = getattr(self.lf, 'set_base_filename', None) # Not every controller (e.g. the mock) has it
+            lf_acquire = self.lf.acquire
+            update_status = self.update_status
+            update_progress = self.update_progress
+            update_scan_state = self.update_scan_state
+            step_status_posted = False # Set when the previous step's progress post already carried this step's status
+            kdc_move_to_async = getattr(self.kdc, 'move_to_async', None)
             for i, angle in enumerate(angles):
-                logging.debug(f"--- Loop Start: Step {i+1}/{num_steps}, Target Angle: {angle:.2f} ---")
-                # --- Check for Abort Signal ---
-                if self._abort_event.is_set():
-                    logging.info("Abort event detected, exiting scan loop.")
-                    self.update_status("Scan aborted by user.")
-                    return # Exit the loop
-
-                # --- Check for Pause Signal (before starting next step) ---
-                logging.debug(f"Loop {i+1}/{num_steps}: Checking pause event...")
-                self._pause_event.wait() # Blocks if event is cleared (paused)
-                logging.debug(f"Loop {i+1}/{num_steps}: Pause check passed (or resumed).")
-
-                # --- Check for Abort Signal AGAIN after potential pause ---
-                if self._abort_event.is_set():
-                    logging.info("Abort event detected after pause, exiting scan loop.")
-                    self.update_status("Scan aborted by user.")
-                    return # Exit the loop
+                logging.debug("--- Loop Start: Step %d/%d, Target Angle: %.2f ---", i + 1, num_steps, angle)
+                # --- Check for Pause/Abort Signals (before starting next step) ---
+                was_paused = False
+                if self._state != self.STATE_RUNNING: # Plain attribute read; the common case is this one compare
+                    # --- Check for Abort Signal ---
+                    if self._state == self.STATE_ABORT:
+                        logging.info("Abort event detected, exiting scan loop.")
+                        self.update_status("Scan aborted by user.")
+                        return # Exit the loop
+
+                    # --- Wait out a pause (the only path that takes the Condition lock) ---
+                    logging.debug("Loop %d/%d: Paused, waiting...", i + 1, num_steps)
+                    was_paused = True
+                    self._wait_while_paused()
+                    logging.debug("Loop %d/%d: Resumed.", i + 1, num_steps)
+
+                    # --- Check for Abort Signal AGAIN after the pause ---
+                    if self._state == self.STATE_ABORT:
+                        logging.info("Abort event detected after pause, exiting scan loop.")
+                        self.update_status("Scan aborted by user.")
+                        return # Exit the loop
 
                 # --- Proceed with the scan step ---
-                self.update_status(f"Step {i+1}/{num_steps}: Moving to {angle:.2f}°")
+                if not step_status_posted or was_paused: # After a pause the label shows "Resuming scan..."
+                    update_status(f"Step {i+1}/{num_steps}: Moving to {angle:.2f}° and acquiring", log=False) # Transient, not logged
+                step_status_posted = False
                 logging.info(f"Moving to angle: {angle:.2f}")
 
-                self.kdc.move_to(angle)
-                self.kdc.wait_for_move(timeout_s=30)
+                if pending_move is not None:
+                    move, pending_move = pending_move, None
+                    move.result() # Raises the same errors a direct move_to would
+                    if was_paused:
+                        kdc_move_to(angle) # The stage may have been moved by hand during the pause
+                else:
+                    kdc_move_to(angle)
+                kdc_wait_for_move(timeout_s=30)
                 time.sleep(0.1)
-                current_pos = self.kdc.get_position()
+                current_pos = kdc_get_position()
                 logging.info(f"Stage reached: {current_pos:.2f}° (Target: {angle:.2f}°, Step: {i+1}/{num_steps})")
-                self.update_status(f"Step {i+1}/{num_steps}: Acquiring at {current_pos:.2f}°")
 
                 # --- Set LF Filename based on checkbox ---
                 step_filename = base_filename
                 if add_pos_to_fname:
                     pos_str = f"{current_pos:.1f}".replace('.', 'p')
                     step_filename = f"{base_filename}_{pos_str}"
-                logging.debug(f"Setting LF base filename to: {step_filename}")
+                logging.debug("Setting LF base filename to: %s", step_filename)
                 try:
-                    if not self.lf.set_base_filename(step_filename):
+                    if lf_set_base_filename is None:
+                        logging.debug("LightField controller has no set_base_filename; keeping its current filename.")
+                    elif not lf_set_base_filename(step_filename):
                         logging.warning(f"Could not set base filename to '{step_filename}' in LightField.")
                         self.update_status(f"Warning: Failed to set filename '{step_filename}'", error=True)
                     else:
@@ -241,75 +491,128 @@ class ScanLogic:
                     self.update_status(f"Error setting filename: {fname_e}", error=True)
                 # --- End Set LF Filename ---
 
+                full_csv_path = csv_path_prefix + step_filename + ".csv" # Assume .csv extension
+                file_ready = file_watcher.expect(full_csv_path) if file_watcher else None # Before acquire, so the event can't be missed
+
                 logging.debug("Calling lf.acquire()...")
-                if not self.lf.acquire():
+                if not lf_acquire():
                     raise RuntimeError(f"LightField acquisition command failed at angle {angle:.2f}°")
                 logging.debug("lf.acquire() finished.")
+                # The exposure is over: move to the next angle while this step's data is processed
+                if kdc_move_to_async is not None and i + 1 < len(angles) and self._state == self.STATE_RUNNING:
+                    pending_move = kdc_move_to_async(angles[i + 1])
 
-                # --- Load data from saved CSV file ---
+                # --- Get the spectrum: in memory from LightField, else from the saved CSV ---
                 wavelength_data = None
                 intensity_data = None
-                csv_filename = f"{step_filename}.csv" # Assume .csv extension
-                full_csv_path = os.path.join(save_directory, csv_filename)
-                logging.info(f"Attempting to load spectrum from: {full_csv_path}")
-
-                # Wait briefly for the file to appear (e.g., max 3 seconds)
-                file_found = False
-                max_wait_time = 3.0
-                wait_interval = 0.2
-                elapsed_time = 0.0
-                while elapsed_time < max_wait_time:
-                    if os.path.exists(full_csv_path):
-                        file_found = True
-                        logging.info(f"Found file: {full_csv_path}")
-                        break
-                    time.sleep(wait_interval)
-                    elapsed_time += wait_interval
-                    logging.debug(f"Waiting for file {csv_filename}... ({elapsed_time:.1f}s)")
-
-                if file_found:
-                    try:
-                        logging.debug(f"Loading data from {full_csv_path} using np.loadtxt with tab delimiter...")
-                        # Load data, specifying tab delimiter, no header
-                        loaded_data = np.loadtxt(full_csv_path, delimiter='\t')
-                        if loaded_data.ndim == 2 and loaded_data.shape[1] == 2:
-                            wavelength_data = loaded_data[:, 0]
-                            intensity_data = loaded_data[:, 1]
-                            logging.info(f"Successfully loaded {len(wavelength_data)} points from {csv_filename}")
-                        else:
-                            logging.warning(f"Loaded data from {csv_filename} has unexpected shape: {loaded_data.shape}")
-                    except Exception as load_e:
-                        logging.error(f"Error loading data from {full_csv_path}: {load_e}")
-                        self.update_status(f"Error loading file {csv_filename}", error=True)
+                frame = get_frame() if get_frame is not None else None
+                if frame is not None:
+                    wavelength_data, intensity_data = frame
+                    if file_ready is not None:
+                        file_watcher.forget(full_csv_path) # Not waiting for the file; LightField still saves it
+                    logging.debug("Got %d points from LightField memory", len(intensity_data))
                 else:
-                    logging.warning(f"File not found after {max_wait_time}s: {full_csv_path}")
-                    self.update_status(f"File not found: {csv_filename}", error=True)
+                    csv_filename = os.path.basename(full_csv_path)
+                    logging.info(f"Attempting to load spectrum from: {full_csv_path}")
+
+                    # Wait briefly for the file to appear (e.g., max 3 seconds)
+                    file_found = False
+                    max_wait_time = 3.0
+                    deadline = time.monotonic() + max_wait_time
+                    if file_ready is not None:
+                        # Woken by the directory watcher as soon as the file is created; it may still be
+                        # empty or half-written then, so also wait for its size to settle
+                        file_found = os.path.exists(full_csv_path) or file_ready.wait(timeout=max_wait_time)
+                        file_watcher.forget(full_csv_path)
+                        if file_found:
+                            file_found = self._wait_until_written(full_csv_path, deadline)
+                        if file_found:
+                            logging.info(f"Found file: {full_csv_path}")
+                    else:
+                        wait_interval = 0.2
+                        while True:
+                            try:
+                                # One stat per probe; an empty file is still being written, keep waiting
+                                if os.stat(full_csv_path).st_size:
+                                    file_found = self._wait_until_written(full_csv_path, deadline)
+                                    if file_found:
+                                        logging.info(f"Found file: {full_csv_path}")
+                                    break
+                            except FileNotFoundError:
+                                pass
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                break
+                            time.sleep(min(wait_interval, remaining))
+                            logging.debug("Waiting for file %s... (%.1fs)", csv_filename, max_wait_time - remaining)
+
+                    if file_found:
+                        try:
+                            logging.debug("Loading data from %s (tab delimiter, no header)...", full_csv_path)
+                            loaded_data = load_spectrum_csv(full_csv_path)
+                            if loaded_data.ndim == 2 and loaded_data.shape[1] == 2:
+                                wavelength_data = loaded_data[:, 0]
+                                intensity_data = loaded_data[:, 1]
+                                logging.info(f"Successfully loaded {len(wavelength_data)} points from {csv_filename}")
+                            else:
+                                logging.warning(f"Loaded data from {csv_filename} has unexpected shape: {loaded_data.shape}")
+                        except Exception as load_e:
+                            logging.error(f"Error loading data from {full_csv_path}: {load_e}")
+                            self.update_status(f"Error loading file {csv_filename}", error=True)
+                    else:
+                        logging.warning(f"File not found after {max_wait_time}s: {full_csv_path}")
+                        self.update_status(f"File not found: {csv_filename}", error=True)
                 # --- End Load data ---
 
+                # --- Keep the spectrum in the per-scan matrix ---
+                if intensity_data is not None:
+                    if self._spectra is None:
+                        self._spectra = np.full((len(angles), intensity_data.size), np.nan, dtype=np.float32) # NaN rows: no data
+                        self._spectra_wavelengths = np.array(wavelength_data, dtype=np.float32)
+                    if intensity_data.size == self._spectra.shape[1]:
+                        np.copyto(self._spectra[i], intensity_data, casting='same_kind')
+                    else:
+                        logging.warning(f"Spectrum at step {i+1} has {intensity_data.size} points, expected {self._spectra.shape[1]}; not stored.")
+
 
                 # --- Update Plotting (if data loaded and checkbox enabled) ---
-                logging.debug(f"Checking plotting condition: plot_live={plot_live}, plotter exists={self.plotter is not None}, data loaded={wavelength_data is not None}")
+                logging.debug("Checking plotting condition: plot_live=%s, plotter exists=%s, data loaded=%s", plot_live, self.plotter is not None, wavelength_data is not None)
                 if plot_live and self.plotter and wavelength_data is not None and intensity_data is not None:
                     try:
-                        logging.debug("Calling plotter.update_live_plot...")
                         # Correct argument order: intensity first, wavelength as optional x_axis
                         self.plotter.update_live_plot(intensity_data, x_axis=wavelength_data)
-                        logging.debug("Called plotter.update_live_plot with loaded data")
                     except Exception as plot_e:
                         logging.error(f"Error calling update_live_plot: {plot_e}")
                         self.update_status(f"Plotting Error: {plot_e}", error=True)
                 # --- End Update Live Plotting ---
 
+                intensity = None # Filled by the fused pass below when it runs
+                max_intensity_in_range = None
                 # --- Calculate Max Intensity for Dynamic Plot (if enabled and data valid) ---
-                logging.debug(f"Checking dynamic intensity plot condition: enabled={plot_dynamic_intensity}, plotter exists={self.plotter is not None}, wvl_min={wvl_min}, wvl_max={wvl_max}, wvl_data exists={wavelength_data is not None}, int_data exists={intensity_data is not None}")
+                logging.debug("Checking dynamic intensity plot condition: enabled=%s, plotter exists=%s, wvl_min=%s, wvl_max=%s, wvl_data exists=%s, int_data exists=%s",
+                              plot_dynamic_intensity, self.plotter is not None, wvl_min, wvl_max, wavelength_data is not None, intensity_data is not None)
                 if (plot_dynamic_intensity and self.plotter and
                         wvl_min is not None and wvl_max is not None and
                         wavelength_data is not None and intensity_data is not None):
                     try:
-                        # Create mask for wavelength range
-                        mask = (wavelength_data >= wvl_min) & (wavelength_data <= wvl_max)
-                        if np.any(mask): # Check if any data falls within the range
-                            max_intensity_in_range = np.max(intensity_data[mask])
+                        range_key = (wavelength_data.size, wavelength_data[0], wavelength_data[-1], wvl_min, wvl_max)
+                        if range_key in self._wvl_slice_cache:
+                            wvl_range_slice = self._wvl_slice_cache[range_key]
+                        else:
+                            wvl_range_slice = self._wavelength_range_slice(wavelength_data, wvl_min, wvl_max)
+                            if len(self._wvl_slice_cache) >= 64: self._wvl_slice_cache.clear() # Keep it bounded
+                            self._wvl_slice_cache[range_key] = wvl_range_slice
+                        if wvl_range_slice is not None and self.analyzer:
+                            # One pass yields both the integrated intensity and the in-range max
+                            intensity, max_intensity_in_range = self.analyzer.calculate_intensity_and_max(intensity_data, wvl_range_slice)
+                        else:
+                            if wvl_range_slice is not None:
+                                in_range = intensity_data[wvl_range_slice]
+                            else: # Axis not ascending; fall back to a boolean mask
+                                in_range = intensity_data[(wavelength_data >= wvl_min) & (wavelength_data <= wvl_max)]
+                            if in_range.size:
+                                max_intensity_in_range = np.max(in_range)
+                        if max_intensity_in_range is not None: # Check if any data falls within the range
                             actual_angle = current_pos # Use the actual position measured
                             logging.info(f"Dynamic Plot: Angle={actual_angle:.2f}, Max Intensity ({wvl_min}-{wvl_max}nm)={max_intensity_in_range:.3f}")
                             # Call the NEW plotting method (to be added in plotting_module.py)
@@ -323,8 +626,9 @@ class ScanLogic:
 
 
                 # --- Intensity Calculation (OLD - can still run if data loaded, but maybe remove later?) ---
-                intensity = 0.0 # Keep for now, might be used elsewhere or removed later
-                if self.analyzer and intensity_data is not None:
+                if intensity is not None:
+                    logging.info(f"Calculated intensity: {intensity:.2f}")
+                elif self.analyzer and intensity_data is not None:
                     logging.debug("Calculating intensity...")
                     try:
                         intensity = self.analyzer.calculate_intensity(intensity_data) # Pass intensity array
@@ -342,25 +646,43 @@ class ScanLogic:
                     # Commented out plotting/analysis
                     # self.plotter.add_analysis_point(current_pos, intensity)
 
-                result_entry = {'angle_target': angle, 'angle_actual': current_pos, 'intensity': intensity}
-                all_results.append(result_entry)
+                self._results[i] = (angle, current_pos, intensity if intensity is not None else 0.0,
+                                    max_intensity_in_range if max_intensity_in_range is not None else np.nan)
+                self._n_results = i + 1
+                if h5_writer is not None:
+                    try:
+                        h5_writer.write_step(i, self._results[i], intensity_data, wavelength_data)
+                    except Exception as h5_e:
+                        logging.error(f"Writing step {i+1} to {h5_writer.path} failed, stopping HDF5 output: {h5_e}")
+                        self.update_status(f"HDF5 write error: {h5_e}", error=True)
+                        try:
+                            h5_writer.close()
+                        except Exception:
+                            pass
+                        h5_writer = None
 
                 # --- Calculate and Update Progress/ETA ---
                 progress = (i + 1) / num_steps
-                elapsed_time = time.time() - start_time
-                eta_sec = None
-                if i > 0: # Avoid division by zero and estimate after first step
-                    time_per_step = elapsed_time / (i + 1)
-                    remaining_steps = num_steps - (i + 1)
-                    eta_sec = remaining_steps * time_per_step
-                    logging.debug(f"ETA Calculation: Elapsed={elapsed_time:.1f}s, Time/Step={time_per_step:.2f}s, Remaining={remaining_steps}, ETA={eta_sec:.1f}s")
-
-                # Call progress update - assuming it handles step count and ETA
-                # For now, pass all info. The receiving function needs to handle it.
-                self.update_progress(progress, current_step=(i + 1), total_steps=num_steps, eta_sec=eta_sec)
+                now = time.monotonic()
+                step_time = now - last_step_end
+                last_step_end = now
+                # Smoothed step time: usable after the first step and steady against one slow step
+                step_time_ema = step_time if step_time_ema is None else (
+                    (1 - self.ETA_SMOOTHING) * step_time_ema + self.ETA_SMOOTHING * step_time)
+                remaining_steps = num_steps - (i + 1)
+                eta_sec = remaining_steps * step_time_ema
+                logging.debug("ETA Calculation: Step=%.2fs, Avg=%.2fs, Remaining=%d, ETA=%.1fs", step_time, step_time_ema, remaining_steps, eta_sec)
+
+                # Progress for this step and the next step's status go to the GUI as one post
+                if update_scan_state is not None and i + 1 < len(angles):
+                    update_scan_state(f"Step {i+2}/{num_steps}: Moving to {angles[i + 1]:.2f}° and acquiring",
+                                      progress, current_step=(i + 1), total_steps=num_steps, eta_sec=eta_sec)
+                    step_status_posted = True
+                else:
+                    update_progress(progress, current_step=(i + 1), total_steps=num_steps, eta_sec=eta_sec)
                 # --- End Progress/ETA Update ---
 
-                logging.debug(f"--- Loop End: Step {i+1}/{num_steps} ---")
+                logging.debug("--- Loop End: Step %d/%d ---", i + 1, num_steps)
 
             # Scan finished successfully
             logging.info("Scan loop completed successfully.")
@@ -386,14 +708,26 @@ class ScanLogic:
             self.scan_completed(success=False, message=f"Unexpected Scan Error: {e}")
         finally:
             logging.info("Scan loop finished or exited. Running finally block.")
+            if file_watcher is not None:
+                file_watcher.stop()
+            if h5_writer is not None:
+                try:
+                    h5_writer.close() # Flushes the remaining steps
+                except Exception as h5_e:
+                    logging.error(f"Error closing {h5_writer.path}: {h5_e}")
+            if pending_move is not None: # Aborted or failed with the next move in flight: let it finish
+                try:
+                    pending_move.result(timeout=30)
+                except Exception as move_e:
+                    logging.warning(f"Move started ahead of the aborted step failed: {move_e}")
             self.scan_running = False
             self.update_progress(0, eta_sec=None) # Clear progress and ETA on exit
             # Ensure completion callback is called if loop finishes normally or aborts cleanly
             # Check if it was already called due to an error
-            if not self._abort_event.is_set() and 'e' not in locals(): # Check if finished normally
+            if self._state != self.STATE_ABORT and 'e' not in locals(): # Check if finished normally
                 # Message was set previously for normal completion
                 pass # scan_completed called at end of try block
-            elif self._abort_event.is_set(): # Check if aborted
+            elif self._state == self.STATE_ABORT: # Check if aborted
                 # Check if completion already called by an error during abort sequence
                 if 'e' not in locals():
                     self.scan_completed(success=False, message="Scan aborted by user.")
@@ -405,6 +739,20 @@ class ScanLogic:
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
 
+    # --- angle_grid regression checks: the grid must never pass the end angle ---
+    for args, expected in [((0, 90, 15), [0, 15, 30, 45, 60, 75, 90]),
+                           ((0, 30, 20), [0, 20]),
+                           ((0, 14, 4), [0, 4, 8, 12]),
+                           ((90, 0, -15), [90, 75, 60, 45, 30, 15, 0]),
+                           ((30, 0, -20), [30, 10]),
+                           ((0, 0.3, 0.1), [0, 0.1, 0.2, 0.3])]:
+        grid = ScanLogic.angle_grid(*args)
+        assert np.allclose(grid, expected), f"angle_grid{args} -> {grid}, expected {expected}"
+        if expected[-1] == args[1]:
+            assert grid[-1] == args[1], f"angle_grid{args} does not end exactly on {args[1]}"
+    assert ScanLogic.angle_grid(0, 350, 20)[-1] == 340
+    print("angle_grid checks passed.")
+
     class MockKDC:
         def __init__(self): self._pos = 0.0; self._connected = True
         def is_connected(self): return self._connected
@@ -440,7 +788,7 @@ if __name__ == "__main__":
         def add_analysis_point(self, angle, intensity): self.angle_data.append(angle); self.intensity_data.append(intensity); logging.debug(f"MockPlotter: Added analysis point ({angle:.1f}, {intensity:.1f})")
         def update_analysis_plot(self, fit_curve=None, fit_angles=None): logging.debug(f"MockPlotter: Update analysis plot (Fit={fit_curve is not None})")
 
-    def mock_status(msg, error=False): print(f"STATUS: {msg}" + (" [ERROR]" if error else ""))
+    def mock_status(msg, error=False, log=True): print(f"STATUS: {msg}" + (" [ERROR]" if error else ""))
     def mock_progress(val): print(f"PROGRESS: {val:.2f}")
     def mock_completion(success, message): print(f"COMPLETED: Success={success}, Msg='{message}'")
 